@@ -5,6 +5,8 @@
 import builtins
 import gettext
 import os
+import shutil
+import tempfile
 
 import gi
 gi.require_version('Gtk', '3.0')
@@ -20,6 +22,7 @@
 
 from src import actions as actions_
 from src import builtin_constraints
+from src import builtin_procedures
 from src.gui import messages as messages_
 
 messages_.set_gui_excepthook(
@@ -32,7 +35,10 @@
 
 from src import core
 from src import exceptions
+from src import incremental
 from src import plugin_settings
+from src import progress as progress_
+from src import sharding
 from src import update
 from src import utils as utils_
 from src.gui import main as gui_main
@@ -44,13 +50,17 @@
 SETTINGS_EXPORT_LAYERS = plugin_settings.create_settings_for_export_layers()
 SETTINGS_EDIT_LAYERS = plugin_settings.create_settings_for_edit_layers()
 
+# Scanning folders in parallel speeds up adding large folder trees to be
+# converted, particularly if located on a network drive.
+_NUM_FOLDER_SCAN_WORKERS = 8
+
 
 def plug_in_batch_convert(_procedure, config, _data):
   _set_procedure_group_and_default_setting_source(CONVERT_GROUP)
 
   run_mode = config.get_property('run-mode')
 
-  image_tree = pg.itemtree.ImageFileTree()
+  image_tree = pg.itemtree.ImageFileTree(num_folder_scan_workers=_NUM_FOLDER_SCAN_WORKERS)
 
   def _fill_image_tree_with_loaded_inputs(settings):
     if run_mode == Gimp.RunMode.NONINTERACTIVE:
@@ -240,11 +250,33 @@ def plug_in_batch_edit_selected_layers(_procedure, run_mode, image, _drawables,
 
 
 def _run_noninteractive(settings, item_tree, config, mode):
+  shard_manifest = None
+  num_workers = 1
+  items_to_stream = None
+
   if pg.config.PROCEDURE_GROUP == CONVERT_GROUP:
-    gimp_status, message = _load_inputs(
-      item_tree, config.get_property('inputs'), config.get_property('max-num-inputs'))
-    if gimp_status != Gimp.PDBStatusType.SUCCESS:
-      return gimp_status, message
+    shard_manifest = _load_shard_manifest(config.get_property('inputs'))
+    num_workers = config.get_property('num-workers')
+
+    inputs_file = config.get_property('inputs')
+    inputs_filepath = inputs_file.get_path() if inputs_file is not None else None
+
+    if shard_manifest is not None:
+      item_tree.add(list(shard_manifest['export_filepaths']))
+    elif num_workers == 1 and config.get_property('stream-inputs'):
+      gimp_status, message = _check_inputs_file(inputs_filepath)
+      if gimp_status != Gimp.PDBStatusType.SUCCESS:
+        return gimp_status, message
+
+      # If more than `max-num-inputs` files are read, the batcher raises an
+      # exception turned into an error status by `_run_batcher()`.
+      items_to_stream = _stream_inputs(
+        item_tree, inputs_filepath, config.get_property('max-num-inputs'))
+    else:
+      gimp_status, message = _load_inputs(
+        item_tree, inputs_filepath, config.get_property('max-num-inputs'))
+      if gimp_status != Gimp.PDBStatusType.SUCCESS:
+        return gimp_status, message
 
   settings_file = config.get_property('settings-file')
 
@@ -255,9 +287,13 @@ def _run_noninteractive(settings, item_tree, config, mode):
   else:
     _set_settings_from_args(settings['main'], config)
 
-  _run_plugin_noninteractive(settings, Gimp.RunMode.NONINTERACTIVE, item_tree, mode)
-
-  return Gimp.PDBStatusType.SUCCESS, ''
+  if shard_manifest is not None:
+    return _run_shard_noninteractive(settings, item_tree, shard_manifest)
+  elif num_workers > 1:
+    return _run_sharded_noninteractive(settings, item_tree, num_workers)
+  else:
+    return _run_plugin_noninteractive(
+      settings, Gimp.RunMode.NONINTERACTIVE, item_tree, mode, items_to_stream=items_to_stream)
 
 
 def _run_with_last_vals(
@@ -304,7 +340,7 @@ def _run_interactive(
   return Gimp.PDBStatusType.SUCCESS, ''
 
 
-def _run_plugin_noninteractive(settings, run_mode, item_tree, mode):
+def _run_plugin_noninteractive(settings, run_mode, item_tree, mode, items_to_stream=None):
   if pg.config.PROCEDURE_GROUP == CONVERT_GROUP:
     batcher_class = core.ImageBatcher
   else:
@@ -317,11 +353,15 @@ def _run_plugin_noninteractive(settings, run_mode, item_tree, mode):
     refresh_item_tree=False,
     initial_export_run_mode=run_mode,
     edit_mode=mode == 'edit',
+    items_to_stream=items_to_stream,
   )
 
+  return _run_batcher(batcher, utils_.get_settings_for_batcher(settings['main']))
+
+
+def _run_batcher(batcher, settings_for_batcher):
   try:
-    batcher.run(
-      **utils_.get_settings_for_batcher(settings['main']))
+    batcher.run(**settings_for_batcher)
   except exceptions.BatcherCancelError:
     return Gimp.PDBStatusType.SUCCESS, 'canceled'
   except Exception as e:
@@ -330,10 +370,194 @@ def _run_plugin_noninteractive(settings, run_mode, item_tree, mode):
   return Gimp.PDBStatusType.SUCCESS, ''
 
 
-def _load_inputs(item_tree, filepath, max_num_inputs):
-  if not os.path.isfile(filepath):
+def _load_shard_manifest(inputs_file):
+  if inputs_file is None or inputs_file.get_path() is None:
+    return None
+
+  return sharding.load_shard_manifest(inputs_file.get_path())
+
+
+def _run_sharded_noninteractive(settings, item_tree, num_workers):
+  gimp_console_command = sharding.get_gimp_console_command()
+  if gimp_console_command is None:
     return (
-      Gimp.PDBStatusType.EXECUTION_ERROR, f'File "{filepath}" does not exist or is not a file')
+      Gimp.PDBStatusType.EXECUTION_ERROR,
+      (f'Could not find the gimp-console executable to run {num_workers} processes.'
+       f' Specify its path via the "{sharding.GIMP_CONSOLE_ENV_VARIABLE}" environment variable'
+       ' or set "num-workers" to 1.'))
+
+  # Items can only be split between processes if each item is exported
+  # separately.
+  if settings['main/export/export_mode'].value != builtin_procedures.ExportModes.EACH_ITEM:
+    return _run_plugin_noninteractive(
+      settings, Gimp.RunMode.NONINTERACTIVE, item_tree, 'export')
+
+  name_batcher = core.ImageBatcher(
+    item_tree=item_tree,
+    procedures=settings['main/procedures'],
+    constraints=settings['main/constraints'],
+    refresh_item_tree=False,
+    initial_export_run_mode=Gimp.RunMode.NONINTERACTIVE,
+  )
+
+  # Output names are processed for all items in this process so that they are
+  # unique and number fields are contiguous across all workers.
+  gimp_status, message = _run_batcher(
+    name_batcher,
+    dict(
+      utils_.get_settings_for_batcher(settings['main']),
+      is_preview=False,
+      names_only=True,
+      process_contents=False,
+      process_names=True,
+      process_export=False,
+    ))
+  if gimp_status != Gimp.PDBStatusType.SUCCESS:
+    return gimp_status, message
+
+  export_filepaths = {
+    item.id: sharding.get_relative_export_filepath(
+      item, builtin_procedures.EXPORT_NAME_ITEM_STATE)
+    for item in name_batcher.matching_items}
+
+  # Unchanged items are skipped here rather than in each worker so that only
+  # this process reads and writes the manifest.
+  conversion_manifest, settings_hash = _get_conversion_manifest(settings)
+  if conversion_manifest is not None:
+    export_filepaths = {
+      input_filepath: export_filepath
+      for input_filepath, export_filepath in export_filepaths.items()
+      if not conversion_manifest.is_unchanged(input_filepath, settings_hash)}
+
+    if not export_filepaths:
+      conversion_manifest.save()
+      return Gimp.PDBStatusType.SUCCESS, ''
+
+  dirpath = tempfile.mkdtemp(prefix='batcher_shards_')
+
+  try:
+    return _run_shards(
+      settings,
+      num_workers,
+      gimp_console_command,
+      dirpath,
+      export_filepaths,
+      name_batcher.matching_items,
+      conversion_manifest,
+      settings_hash)
+  finally:
+    shutil.rmtree(dirpath, ignore_errors=True)
+
+
+def _run_shards(
+      settings,
+      num_workers,
+      gimp_console_command,
+      dirpath,
+      export_filepaths,
+      matching_items,
+      conversion_manifest,
+      settings_hash,
+):
+  settings_filepath = os.path.join(dirpath, 'settings.json')
+
+  save_result = settings.save(
+    {'persistent': pg.setting.JsonFileSource(pg.config.PROCEDURE_GROUP, settings_filepath)})
+  if pg.setting.Persistor.FAIL in save_result.statuses_per_source.values():
+    return (
+      Gimp.PDBStatusType.EXECUTION_ERROR,
+      utils_.format_message_from_persistor_statuses(save_result))
+
+  sharded_result = sharding.run_shards(
+    export_filepaths,
+    num_workers,
+    dirpath,
+    lambda manifest_filepath: sharding.get_worker_command(
+      gimp_console_command,
+      plug_in_batch_convert.__name__.replace('_', '-'),
+      manifest_filepath,
+      settings_filepath),
+    {item.id: item for item in matching_items},
+    progress_updater=_GimpProgressUpdater(None),
+  )
+
+  if conversion_manifest is not None:
+    for item in sharded_result.exported_items:
+      conversion_manifest.update(item.id, settings_hash, export_filepaths[item.id])
+    conversion_manifest.save()
+
+  if sharded_result.failed_shards:
+    return (
+      Gimp.PDBStatusType.EXECUTION_ERROR,
+      '\n'.join(
+        f'Shard {index}: {message}'
+        for index, message in sorted(sharded_result.failed_shards.items())))
+
+  if sharded_result.failed_procedures or sharded_result.failed_constraints:
+    return (
+      Gimp.PDBStatusType.EXECUTION_ERROR,
+      '\n'.join(
+        f'{action_name}: {item.id if item is not None else ""}: {message}'
+        for failed_actions in [
+          sharded_result.failed_procedures, sharded_result.failed_constraints]
+        for action_name, entries in failed_actions.items()
+        for item, message, *_rest in entries))
+
+  return Gimp.PDBStatusType.SUCCESS, ''
+
+
+def _get_conversion_manifest(settings):
+  if not settings['main/skip_unchanged'].value:
+    return None, None
+
+  conversion_manifest = incremental.ConversionManifest(
+    settings['main/output_directory'].value.get_path(),
+    use_content_hash=settings['main/compare_file_contents'].value)
+
+  if not settings['main/rebuild_manifest'].value:
+    conversion_manifest.load()
+
+  return conversion_manifest, utils_.get_settings_for_batcher(settings['main'])['settings_hash']
+
+
+def _run_shard_noninteractive(settings, item_tree, shard_manifest):
+  settings_for_batcher = utils_.get_settings_for_batcher(settings['main'])
+  # The coordinating process takes care of skipping unchanged items.
+  settings_for_batcher['skip_unchanged'] = False
+  settings_for_batcher['more_export_options']['predefined_filepaths'] = {
+    os.path.abspath(input_filepath): export_filepath
+    for input_filepath, export_filepath in shard_manifest['export_filepaths'].items()}
+  settings_for_batcher['progress_updater'] = sharding.ShardProgressUpdater(
+    None, shard_manifest['progress_file'])
+
+  batcher = core.ImageBatcher(
+    item_tree=item_tree,
+    procedures=settings['main/procedures'],
+    constraints=settings['main/constraints'],
+    refresh_item_tree=False,
+    initial_export_run_mode=Gimp.RunMode.NONINTERACTIVE,
+  )
+
+  gimp_status, message = _run_batcher(batcher, settings_for_batcher)
+
+  sharding.write_shard_results(shard_manifest['results_file'], batcher)
+
+  return gimp_status, message
+
+
+class _GimpProgressUpdater(progress_.ProgressUpdater):
+
+  def _fill_progress_bar(self):
+    Gimp.progress_update(self._num_finished_tasks / self.num_total_tasks)
+
+  def _set_text_progress_bar(self, text):
+    Gimp.progress_set_text(text)
+
+
+def _load_inputs(item_tree, filepath, max_num_inputs):
+  gimp_status, message = _check_inputs_file(filepath)
+  if gimp_status != Gimp.PDBStatusType.SUCCESS:
+    return gimp_status, message
 
   try:
     with open(filepath, 'r', encoding=pg.TEXT_FILE_ENCODING) as inputs_file:
@@ -347,14 +571,44 @@ def _load_inputs(item_tree, filepath, max_num_inputs):
   if max_num_inputs != 0 and len(item_tree) > max_num_inputs:
     return (
       Gimp.PDBStatusType.EXECUTION_ERROR,
-      (f'File "{filepath}" contains more than {max_num_inputs} files to process'
-       ' (including files in folders).'
-       ' Check if you specified the files and folders you truly wish to process.'
-       ' To remove this restriction, set "max-num-inputs" to 0.'))
+      _get_max_num_inputs_exceeded_message(filepath, max_num_inputs))
 
   return Gimp.PDBStatusType.SUCCESS, ''
 
 
+def _stream_inputs(item_tree, filepath, max_num_inputs):
+  """Yields items from the inputs file as the file is read, without adding
+  the items to ``item_tree``.
+
+  Since the total number of files is not known in advance, an exception is
+  raised once more than ``max_num_inputs`` files were yielded.
+  """
+  with open(filepath, 'r', encoding=pg.TEXT_FILE_ENCODING) as inputs_file:
+    inputs = (path for path in (line.rstrip('\n') for line in inputs_file) if path)
+
+    for num_inputs, item in enumerate(item_tree.stream(inputs), start=1):
+      if max_num_inputs != 0 and num_inputs > max_num_inputs:
+        raise ValueError(_get_max_num_inputs_exceeded_message(filepath, max_num_inputs))
+
+      yield item
+
+
+def _check_inputs_file(filepath):
+  if filepath is None or not os.path.isfile(filepath):
+    return (
+      Gimp.PDBStatusType.EXECUTION_ERROR, f'File "{filepath}" does not exist or is not a file')
+
+  return Gimp.PDBStatusType.SUCCESS, ''
+
+
+def _get_max_num_inputs_exceeded_message(filepath, max_num_inputs):
+  return (
+    f'File "{filepath}" contains more than {max_num_inputs} files to process'
+    ' (including files in folders).'
+    ' Check if you specified the files and folders you truly wish to process.'
+    ' To remove this restriction, set "max-num-inputs" to 0.')
+
+
 def _set_procedure_group_and_default_setting_source(procedure_group):
   pg.config.PROCEDURE_GROUP = procedure_group
 
@@ -1,6 +1,7 @@
 """Functions to invoke other functions in various ways, e.g. with a timeout."""
 
-from typing import Callable
+import time
+from typing import Callable, Hashable, Iterator
 
 import gi
 gi.require_version('Gimp', '3.0')
@@ -8,6 +9,7 @@
 
 
 _timer_ids = {}
+_sliced_jobs = {}
 
 
 def timeout_add_strict(
@@ -62,3 +64,123 @@ def timeout_remove(callback: Callable):
   if callback in _timer_ids:
     GLib.source_remove(_timer_ids[callback])
     del _timer_ids[callback]
+
+
+def idle_add_sliced(
+      key: Hashable, job: Iterator, time_budget: int, first_slice_immediately: bool = False,
+) -> int:
+  """Advances ``job`` in slices of at most ``time_budget`` milliseconds
+  whenever the GLib main loop is idle, until ``job`` is exhausted.
+
+  ``job`` is usually a generator performing a piece of work between each
+  ``yield``. Between slices, the main loop is able to process pending
+  events, e.g. redraw widgets or respond to user input. A single piece of
+  work can still exceed ``time_budget``.
+
+  If a job with the same ``key`` is still running, that job is canceled (see
+  `idle_remove_sliced()`) before ``job`` is scheduled.
+
+  If ``job`` raises an exception, the job is removed and the exception is
+  propagated.
+
+  Args:
+    key: Key identifying the job, e.g. the function that created ``job``.
+    job: Iterator to advance. ``job`` is advanced at least once per slice.
+    time_budget: Maximum duration of a single slice in milliseconds.
+    first_slice_immediately: If ``True``, the first slice is performed before
+      this function returns. This is useful if the caller relies on the
+      results of the first piece of work, or if ``job`` is expected to finish
+      within a single slice most of the time.
+
+  Returns:
+    ID as returned by `GLib.idle_add()`. If the job finished within the
+    first slice, the ID is no longer valid.
+  """
+  global _sliced_jobs
+
+  def _run_slice_wrapper():
+    try:
+      has_remaining_work = _run_slice(job, time_budget, lambda: _is_job_scheduled(key, job))
+    except Exception:
+      _remove_sliced_job(key, job)
+      raise
+
+    if not _is_job_scheduled(key, job):
+      # The job was canceled while being advanced, hence it could not be
+      # closed at that time.
+      if hasattr(job, 'close'):
+        job.close()
+
+      return False
+
+    if not has_remaining_work:
+      _remove_sliced_job(key, job)
+
+    return has_remaining_work
+
+  idle_remove_sliced(key)
+
+  source_id = GLib.idle_add(_run_slice_wrapper)
+  _sliced_jobs[key] = (source_id, job)
+
+  if first_slice_immediately:
+    try:
+      has_remaining_work = _run_slice_wrapper()
+    except Exception:
+      GLib.source_remove(source_id)
+      raise
+
+    if not has_remaining_work:
+      GLib.source_remove(source_id)
+
+  return source_id
+
+
+def idle_remove_sliced(key: Hashable):
+  """Cancels a job scheduled by `idle_add_sliced()`.
+
+  If the job is a generator, it is closed, allowing the generator to perform
+  cleanup in ``finally`` blocks. If this function is called while the job is
+  being advanced (e.g. from a nested main loop running a dialog), the job is
+  closed once the current piece of work is finished.
+
+  If no such job exists or the job already finished, nothing is performed.
+  """
+  if key in _sliced_jobs:
+    source_id, job = _sliced_jobs.pop(key)
+    GLib.source_remove(source_id)
+
+    if hasattr(job, 'close') and not getattr(job, 'gi_running', False):
+      job.close()
+
+
+def is_sliced_job_running(key: Hashable) -> bool:
+  """Returns ``True`` if a job scheduled by `idle_add_sliced()` under ``key``
+  did not finish yet, ``False`` otherwise.
+  """
+  return key in _sliced_jobs
+
+
+def _run_slice(job, time_budget, should_continue_func=None):
+  end_time = time.perf_counter() + time_budget / 1000
+
+  while True:
+    try:
+      next(job)
+    except StopIteration:
+      return False
+
+    if time.perf_counter() >= end_time:
+      return True
+
+    if should_continue_func is not None and not should_continue_func():
+      return True
+
+
+def _is_job_scheduled(key, job):
+  return key in _sliced_jobs and _sliced_jobs[key][1] is job
+
+
+def _remove_sliced_job(key, job):
+  if _is_job_scheduled(key, job):
+    del _sliced_jobs[key]
@@ -9,10 +9,13 @@
 from __future__ import annotations
 
 import abc
+import collections
 from collections.abc import Iterable, Iterator
+import concurrent.futures
+import itertools
 import pathlib
 import os
-from typing import Any, Dict, Generator, List, Optional, Union
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
 
 import gi
 gi.require_version('Gimp', '3.0')
@@ -29,6 +32,14 @@
 See `ItemTree.__getitem__()` for more information.
 """
 
+GimpItemAttributes = collections.namedtuple(
+  'GimpItemAttributes',
+  ['visible', 'color_tag', 'selected', 'num_children'])
+"""Attributes of a `Gimp.Item` object returned by `GimpItemTree.get_attributes()`.
+
+Only attributes used to filter items (e.g. by constraints) are included.
+"""
+
 
 class Item(metaclass=abc.ABCMeta):
   """Wrapper for an object allowing access to various attributes with a unified
@@ -36,8 +47,32 @@ class Item(metaclass=abc.ABCMeta):
 
   Note that the attributes will not be up-to-date if changes were made to the
   original object.
+
+  To reduce memory usage for a large number of items, instances do not have a
+  ``__dict__``, lists of children and containers of saved states are only
+  created when needed, and the list of parents is shared with items having
+  the same parents (see the `parents` property).
   """
 
+  __slots__ = (
+    'name',
+    '_object',
+    '_type',
+    '_parents',
+    '_children',
+    '_prev_item',
+    '_next_item',
+    '_id',
+    '_key',
+    '_orig_name',
+    '_orig_parents',
+    '_orig_children',
+    '_saved_states',
+    '_saved_named_states',
+  )
+
+  _item_attributes = ('name', '_parents', '_children')
+
   def __init__(
         self,
         object_: Any,
@@ -49,7 +84,8 @@ def __init__(
     self._object = object_
     self._type = item_type
     self._parents = parents if parents is not None else []
-    self._children = children if children is not None else []
+    # An empty list is created only once children are accessed.
+    self._children = children if children else None
     self._prev_item = prev_item
     self._next_item = next_item
 
@@ -67,13 +103,13 @@ def __init__(
       self._key = (self._id, FOLDER_KEY)
 
     self._orig_name = self.name
-    self._orig_parents = list(self._parents)
-    self._orig_children = list(self._children)
-
-    self._item_attributes = ['name', '_parents', '_children']
+    # Lists of parents are never modified in place, hence the list can be
+    # shared rather than copied.
+    self._orig_parents = self._parents
+    self._orig_children = list(self._children) if self._children is not None else None
 
-    self._saved_states = []
-    self._saved_named_states = {}
+    self._saved_states = None
+    self._saved_named_states = None
 
   @property
   @abc.abstractmethod
@@ -133,6 +169,10 @@ def key(self):
   def parents(self) -> List[Item]:
     """List of `Item` parents for this item, sorted from the topmost parent
     to the bottommost (immediate) parent.
+
+    The list may be shared with other items (e.g. items in the same folder).
+    To change the parents, assign a new list rather than modifying the
+    returned list.
     """
     return self._parents
 
@@ -143,6 +183,9 @@ def parents(self, parents: List[Item]):
   @property
   def children(self) -> List[Item]:
     """List of `Item` children for this item."""
+    if self._children is None:
+      self._children = []
+
     return self._children
 
   @children.setter
@@ -210,7 +253,7 @@ def orig_children(self) -> Iterator[Item]:
     Note that this property will not be kept up-to-date if changes to the
     children of the underlying object were made externally.
     """
-    return iter(self._orig_children)
+    return iter(self._orig_children) if self._orig_children is not None else iter(())
 
   def __str__(self) -> str:
     return pgutils.stringify_object(self, self.orig_name)
@@ -230,7 +273,7 @@ def get_all_children(self) -> List[Item]:
 
     all_children = []
 
-    items = list(self._children)
+    items = list(self.children)
     while items:
       item = items.pop(0)
 
@@ -246,6 +289,9 @@ def push_state(self):
 
     To restore the last saved values, call `pop_state()`.
     """
+    if self._saved_states is None:
+      self._saved_states = []
+
     self._saved_states.append({
       attr_name: getattr(self, attr_name) for attr_name in
       self._item_attributes})
@@ -257,11 +303,11 @@ def pop_state(self):
     Calling `pop_state()` without any saved state (e.g. when `push_state()` has
     never been called before) does nothing.
     """
-    try:
-      saved_states = self._saved_states.pop()
-    except IndexError:
+    if not self._saved_states:
       return
 
+    saved_states = self._saved_states.pop()
+
     for attr_name, attr_value in saved_states.items():
       setattr(self, attr_name, attr_value)
 
@@ -274,6 +320,9 @@ def save_state(self, name: str):
     Calling this method with the same ``name`` overrides the previously saved
     attributes.
     """
+    if self._saved_named_states is None:
+      self._saved_named_states = {}
+
     self._saved_named_states[name] = {
       attr_name.lstrip('_'): getattr(self, attr_name) for attr_name in
       self._item_attributes}
@@ -284,6 +333,9 @@ def get_named_state(self, name: str) -> Optional[Dict[str, Any]]:
 
     See `save_state()` for more information.
     """
+    if self._saved_named_states is None:
+      return None
+
     return self._saved_named_states.get(name, None)
 
   def delete_named_state(self, name: str):
@@ -293,13 +345,14 @@ def delete_named_state(self, name: str):
 
     See `save_state()` for more information.
     """
-    self._saved_named_states.pop(name, None)
+    if self._saved_named_states is not None:
+      self._saved_named_states.pop(name, None)
 
   def reset(self):
     """Resets the item's attributes to the values upon its instantiation."""
     self.name = self._orig_name
-    self._parents = list(self._orig_parents)
-    self._children = list(self._orig_children)
+    self._parents = self._orig_parents
+    self._children = list(self._orig_children) if self._orig_children is not None else None
 
   @abc.abstractmethod
   def _list_child_objects(self) -> List:
@@ -323,6 +376,8 @@ class ImageFileItem(Item):
   The `id` property represents the file path to the item.
   """
 
+  __slots__ = ('_raw',)
+
   def __init__(self, *args, **kwargs):
     super().__init__(*args, **kwargs)
 
@@ -354,49 +409,100 @@ def id(self) -> str:
     return self._id
 
   def _list_child_objects(self) -> List[str]:
-    item_path = os.path.abspath(self.id)
+    return [path for path, _is_dir in _scan_folder(os.path.abspath(self.id))]
 
-    try:
-      filenames = os.listdir(item_path)
-    except OSError:
-      return []
-    else:
-      paths = sorted(os.path.join(item_path, filename) for filename in filenames)
+  def _get_name_from_object(self) -> str:
+    return os.path.basename(self._object)
+
+  def _get_id_from_object(self) -> int:
+    return self._object
 
-      filtered_paths = []
-      for path in paths:
-        if os.path.islink(path):
+
+def _scan_folder(dirpath: str) -> List[Tuple[str, bool]]:
+  """Returns a list of (path, is folder) pairs for each entry in the folder
+  given by ``dirpath``, sorted by path.
+
+  The file type is obtained from the folder listing itself if possible, avoiding
+  an additional system call per entry.
+
+  Symbolic links that cannot be resolved or that point to one of the parent
+  folders of ``dirpath`` (which would cause an infinite loop) are excluded.
+  """
+  try:
+    with os.scandir(dirpath) as entries:
+      paths_and_is_dir = []
+
+      for entry in entries:
+        try:
+          is_dir = entry.is_dir()
+          is_symlink = entry.is_symlink()
+        except OSError:
+          is_dir = False
+          is_symlink = False
+
+        if is_symlink:
           try:
             # This detects symbolic link loops.
-            resolved_path_object = pathlib.Path(path).resolve()
+            resolved_path = str(pathlib.Path(entry.path).resolve())
           except (OSError, RuntimeError):
-            pass
-          else:
-            resolved_path = str(resolved_path_object)
-
-            if not os.path.isdir(resolved_path):
-              filtered_paths.append(path)
-            else:
-              # This detects a symbolic link pointing to one of its parent
-              # folders, which could create an infinite loop. We exclude
-              # these links to avoid getting stuck in a loop.
-              if not pathlib.Path(item_path).is_relative_to(resolved_path):
-                filtered_paths.append(path)
-        else:
-          filtered_paths.append(path)
+            continue
 
-      return filtered_paths
+          # This detects a symbolic link pointing to one of its parent
+          # folders, which could create an infinite loop. We exclude these
+          # links to avoid getting stuck in a loop.
+          if is_dir and pathlib.Path(dirpath).is_relative_to(resolved_path):
+            continue
 
-  def _get_name_from_object(self) -> str:
-    return os.path.basename(self._object)
+        paths_and_is_dir.append((entry.path, is_dir))
+  except OSError:
+    return []
 
-  def _get_id_from_object(self) -> int:
-    return self._object
+  paths_and_is_dir.sort()
+
+  return paths_and_is_dir
+
+
+def _scan_folders_in_parallel(
+      dirpaths: Iterable[str],
+      num_workers: int,
+) -> Dict[str, List[Tuple[str, bool]]]:
+  """Scans the specified folders and all their subfolders recursively using
+  ``num_workers`` threads.
+
+  Returns:
+    Dictionary of (folder path, result of `_scan_folder()`) pairs.
+  """
+  scanned_folders = {}
+
+  with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+    futures = {}
+
+    for dirpath in dirpaths:
+      if dirpath not in scanned_folders:
+        scanned_folders[dirpath] = None
+        futures[executor.submit(_scan_folder, dirpath)] = dirpath
+
+    while futures:
+      done, _not_done = concurrent.futures.wait(
+        futures, return_when=concurrent.futures.FIRST_COMPLETED)
+
+      for future in done:
+        dirpath = futures.pop(future)
+        scanned_folders[dirpath] = future.result()
+
+        for path, is_dir in scanned_folders[dirpath]:
+          if is_dir and path not in scanned_folders:
+            scanned_folders[path] = None
+            futures[executor.submit(_scan_folder, path)] = path
+
+  return scanned_folders
 
 
 class GimpItem(Item):
   """`Item` subclass for a `Gimp.Item` object."""
 
+  __slots__ = ()
+
   @property
   def raw(self) -> Gimp.Item:
     """Underlying `Gimp.Item` object wrapped by this instance."""
@@ -423,6 +529,8 @@ def _get_id_from_object(self) -> int:
 class GimpImageItem(Item):
   """`Item` subclass for a `Gimp.Image` object."""
 
+  __slots__ = ()
+
   @property
   def raw(self) -> Gimp.Image:
     """Underlying `Gimp.Image` object wrapped by this instance."""
@@ -469,6 +577,8 @@ class ItemTree(metaclass=abc.ABCMeta):
   modifications, additions or removal outside this class. To refresh the
   contents of the tree, call `refresh()` or create a new instance.
   """
+
+  _version_counter = itertools.count(start=1)
   
   def __init__(
         self,
@@ -493,6 +603,31 @@ def __init__(
     # key: `Item.key`
     # value: `Item` instance
     self._items = {}
+
+    # key: item type
+    # value: number of items of the type in the tree
+    self._num_items_per_type = {TYPE_ITEM: 0, TYPE_GROUP: 0, TYPE_FOLDER: 0}
+
+    # key: `Item.key` of an item of type `TYPE_GROUP`
+    # value: ``True`` if the underlying object has children, ``False`` otherwise
+    self._groups_with_children = {}
+    self._num_non_empty_groups = None
+
+    self._filtered_len_cache_key = None
+    self._filtered_len = 0
+
+    self._version = next(self._version_counter)
+
+  @property
+  def version(self) -> int:
+    """Number identifying the current contents of the tree.
+
+    The version changes each time items are added or removed, the tree is
+    refreshed or `invalidate_cached_counts()` is called. Versions are unique
+    across all trees, hence the version can be used to e.g. skip processing
+    items again if the tree did not change.
+    """
+    return self._version
   
   def __getitem__(self, key) -> Item:
     """Returns an `Item` instance using a key, specifically `Item.key`."""
@@ -512,8 +647,21 @@ def __len__(self) -> int:
     
     The returned number of items depends on whether `is_filtered` is
     ``True`` or ``False``.
+
+    The number of items is cached until items are added or removed, the tree is
+    refreshed or rules in `filter` change. If the filter contains rules
+    depending on attributes that can change otherwise (e.g. item names), call
+    `invalidate_cached_counts()` after modifying the attributes.
     """
-    return len([item for item in self])
+    if self.is_filtered and self.filter:
+      cache_key = (self.filter, self.filter.version)
+      if self._filtered_len_cache_key != cache_key:
+        self._filtered_len = sum(1 for _unused in self)
+        self._filtered_len_cache_key = cache_key
+
+      return self._filtered_len
+    else:
+      return self._num_items_per_type[TYPE_ITEM] + self._get_num_non_empty_groups()
   
   def __iter__(self) -> Generator[Item, None, None]:
     """Iterates over items, excluding folders and empty group items.
@@ -614,30 +762,23 @@ def add(
 
     child_items = []
     for object_ in objects:
-      self._insert_item(object_, child_items, list(parents_for_child_initial), with_folders)
+      self._insert_item(object_, child_items, parents_for_child_initial, with_folders)
 
-    item_tree = child_items
+    # Items are processed depth-first. Children of a folder are placed at the
+    # front of the deque so that they immediately follow the folder.
+    items_to_add = collections.deque(child_items)
     added_items = []
 
-    while item_tree:
-      item = item_tree.pop(0)
+    while items_to_add:
+      item = items_to_add.popleft()
 
-      if item.type == TYPE_FOLDER:
-        item = self._add_item_to_itemtree(item, added_items)
+      item = self._add_item_to_itemtree(item, added_items)
 
-        if expand_folders:
-          parents_for_child = list(item.parents)
-          parents_for_child.append(item)
-          child_items = []
+      if item.type == TYPE_FOLDER and expand_folders:
+        parents_for_child = item.parents + [item]
 
-          # noinspection PyProtectedMember
-          for object_ in item._list_child_objects():
-            self._insert_item(object_, child_items, list(parents_for_child), with_folders)
-
-          for child_item in reversed(child_items):
-            item_tree.insert(0, child_item)
-      else:
-        item = self._add_item_to_itemtree(item, added_items)
+        items_to_add.extendleft(
+          reversed(self._create_child_items(item, parents_for_child, with_folders)))
 
     for i in range(1, len(added_items) - 1):
       # noinspection PyProtectedMember
@@ -669,12 +810,93 @@ def add(
       self._first_item = added_items[0]
       self._last_item = added_items[-1]
 
+    if added_items:
+      self.invalidate_cached_counts()
+
     return added_items
 
+  def stream(
+        self,
+        objects: Iterable,
+        with_folders: bool = True,
+  ) -> Generator[Item, None, None]:
+    """Yields `Item` instances created from the specified objects without
+    adding them to the tree.
+
+    Items are yielded in the same order as they would be inserted by `add()`.
+    Unlike `add()`, ``objects`` is consumed lazily and the contents of folders
+    are obtained only once the folders are reached. This allows processing a
+    large number of objects (e.g. files in large folder trees) without keeping
+    all items in memory.
+
+    Folders are not yielded, but are accessible via `Item.parents` of the
+    yielded items. The `Item.prev`, `Item.next` and `Item.children` properties
+    are not set. Objects whose items were already yielded (e.g. a file
+    specified along with its parent folder) are skipped. For this purpose,
+    keys of the yielded items are kept in memory.
+
+    Args:
+      objects:
+        The objects to create items from. See `add()` for more information.
+      with_folders:
+        If ``True``, objects acting as folders are expanded. If ``False``,
+        such objects are ignored.
+
+    Yields:
+      The current `Item` instance.
+    """
+    visited_keys = set()
+
+    top_level_items = (
+      item
+      for object_ in objects
+      for item in self._create_items_from_object(object_, with_folders))
+
+    items_to_visit = [top_level_items]
+
+    while items_to_visit:
+      item = next(items_to_visit[-1], None)
+
+      if item is None:
+        items_to_visit.pop()
+        continue
+
+      if item.key in visited_keys:
+        continue
+
+      visited_keys.add(item.key)
+
+      if item.type == TYPE_FOLDER:
+        parents_for_child = item.parents + [item]
+
+        items_to_visit.append(self._iter_child_items(item, parents_for_child, with_folders))
+      else:
+        yield item
+
   @abc.abstractmethod
   def _insert_item(self, object_, child_items, parents_for_child=None, with_folders=True):
     pass
 
+  def _create_items_from_object(self, object_, with_folders):
+    child_items = []
+
+    self._insert_item(object_, child_items, [], with_folders)
+
+    return child_items
+
+  def _create_child_items(self, item, parents_for_child, with_folders):
+    child_items = []
+
+    # Child items share the same list of parents to save memory.
+    # noinspection PyProtectedMember
+    for object_ in item._list_child_objects():
+      self._insert_item(object_, child_items, parents_for_child, with_folders)
+
+    return child_items
+
+  def _iter_child_items(self, item, parents_for_child, with_folders):
+    return iter(self._create_child_items(item, parents_for_child, with_folders))
+
   def _add_item_to_itemtree(self, item, added_items):
     # If an item with the same key already exists, return that item and
     # ignore the new item (the `item` parameter). This in particular prevents
@@ -683,10 +905,16 @@ def _add_item_to_itemtree(self, item, added_items):
       return self._items[item.key]
 
     self._items[item.key] = item
+    self._num_items_per_type[item.type] += 1
 
     added_items.append(item)
 
     if item.parent is not None:
+      # noinspection PyProtectedMember
+      if item.parent._orig_children is None:
+        # noinspection PyProtectedMember
+        item.parent._orig_children = []
+
       # noinspection PyProtectedMember
       item.parent._orig_children.append(item)
       item.parent.children.append(item)
@@ -724,8 +952,10 @@ def remove(self, items: Iterable[Item]):
           items_to_remove.extend(self._items[key].get_all_children())
 
       for item_to_remove in items_to_remove:
-        self._items.pop(item_to_remove.id, None)
-        self._items.pop((item_to_remove.id, FOLDER_KEY), None)
+        for key in [item_to_remove.id, (item_to_remove.id, FOLDER_KEY)]:
+          removed_item = self._items.pop(key, None)
+          if removed_item is not None:
+            self._num_items_per_type[removed_item.type] -= 1
 
         next_item = item_to_remove.next
         previous_item = item_to_remove.prev
@@ -744,11 +974,13 @@ def remove(self, items: Iterable[Item]):
           except ValueError:
             pass
 
-          try:
-            # noinspection PyProtectedMember
-            item_to_remove.parent._orig_children.remove(item_to_remove)
-          except ValueError:
-            pass
+          # noinspection PyProtectedMember
+          if item_to_remove.parent._orig_children is not None:
+            try:
+              # noinspection PyProtectedMember
+              item_to_remove.parent._orig_children.remove(item_to_remove)
+            except ValueError:
+              pass
 
         if item_to_remove == self._first_item:
           self._first_item = next_item
@@ -758,6 +990,9 @@ def remove(self, items: Iterable[Item]):
 
       removed_items.extend(items_to_remove)
 
+    if removed_items:
+      self.invalidate_cached_counts()
+
     return removed_items
 
   def iter(
@@ -804,9 +1039,8 @@ def iter(
       if not with_folders and current_item.type == TYPE_FOLDER:
         should_yield_item = False
 
-      # noinspection PyProtectedMember
       if (not with_empty_groups
-          and (current_item.type == TYPE_GROUP and not current_item._list_child_objects())):
+          and (current_item.type == TYPE_GROUP and self._is_empty_group(current_item))):
         should_yield_item = False
 
       if should_yield_item:
@@ -905,12 +1139,10 @@ def _prev_next(self, item, with_folders, with_empty_groups, filtered, adjacent_a
           continue
 
       if with_empty_groups:
-        # noinspection PyProtectedMember
-        if adjacent_item.type == TYPE_GROUP and not adjacent_item._list_child_objects():
+        if adjacent_item.type == TYPE_GROUP and self._is_empty_group(adjacent_item):
           break
       else:
-        # noinspection PyProtectedMember
-        if adjacent_item.type == TYPE_GROUP and not adjacent_item._list_child_objects():
+        if adjacent_item.type == TYPE_GROUP and self._is_empty_group(adjacent_item):
           continue
       
       if filtered and self.is_filtered:
@@ -920,6 +1152,40 @@ def _prev_next(self, item, with_folders, with_empty_groups, filtered, adjacent_a
         break
     
     return adjacent_item
+
+  def _is_empty_group(self, item):
+    try:
+      return not self._groups_with_children[item.key]
+    except KeyError:
+      # noinspection PyProtectedMember
+      has_children = bool(item._list_child_objects())
+      self._groups_with_children[item.key] = has_children
+
+      return not has_children
+
+  def _get_num_non_empty_groups(self):
+    if not self._num_items_per_type[TYPE_GROUP]:
+      return 0
+
+    if self._num_non_empty_groups is None:
+      self._num_non_empty_groups = sum(
+        1 for item in self._items.values()
+        if item.type == TYPE_GROUP and not self._is_empty_group(item))
+
+    return self._num_non_empty_groups
+
+  def invalidate_cached_counts(self):
+    """Discards the cached number of items returned by `__len__()` and the
+    cached information about which group items are empty.
+
+    This method is called automatically when adding or removing items or
+    refreshing the tree. This also changes `version`.
+    """
+    self._groups_with_children = {}
+    self._num_non_empty_groups = None
+    self._filtered_len_cache_key = None
+
+    self._version = next(self._version_counter)
   
   def reset_filter(self):
     """Resets the filter, creating a new empty `objectfilter.ObjectFilter`."""
@@ -950,6 +1216,9 @@ def clear(self, return_removed=False):
     self._last_item = None
 
     self._items = {}
+    self._num_items_per_type = {TYPE_ITEM: 0, TYPE_GROUP: 0, TYPE_FOLDER: 0}
+
+    self.invalidate_cached_counts()
 
     return removed_items
 
@@ -959,8 +1228,50 @@ class ImageFileTree(ItemTree):
 
   Files and non-existent files/folders are treated as regular items. How
   non-existent files are handled depends on the client code.
+
+  If ``num_folder_scan_workers`` is greater than 1, folders passed to `add()`
+  are scanned recursively using the specified number of threads before items
+  are created. This can considerably speed up adding large folder trees located
+  on storage with high latency (e.g. network drives). Folders passed to
+  `stream()` are always scanned one at a time once they are reached.
   """
 
+  def __init__(self, *args, num_folder_scan_workers: int = 1, **kwargs):
+    self.num_folder_scan_workers = num_folder_scan_workers
+    """Number of threads used to scan folders when adding items. See the class
+    description for more information.
+    """
+
+    self._scanned_folders = {}
+
+    super().__init__(*args, **kwargs)
+
+  def add(
+        self,
+        objects: Iterable,
+        parent_item: Optional[Item] = None,
+        insert_after_item: Optional[Item] = None,
+        with_folders: bool = True,
+        expand_folders: bool = True,
+  ) -> List[Item]:
+    objects = list(objects)
+
+    if self.num_folder_scan_workers > 1 and with_folders and expand_folders:
+      self._scanned_folders = _scan_folders_in_parallel(
+        (os.path.abspath(object_) for object_ in objects if os.path.isdir(object_)),
+        self.num_folder_scan_workers)
+
+    try:
+      return super().add(
+        objects,
+        parent_item=parent_item,
+        insert_after_item=insert_after_item,
+        with_folders=with_folders,
+        expand_folders=expand_folders,
+      )
+    finally:
+      self._scanned_folders = {}
+
   def refresh(self):
     """Resets attributes in all items and removes saved states from all items.
 
@@ -969,9 +1280,11 @@ def refresh(self):
     for item in self.iter_all():
       item.reset()
       # noinspection PyProtectedMember
-      item._saved_states.clear()
+      item._saved_states = None
       # noinspection PyProtectedMember
-      item._saved_named_states.clear()
+      item._saved_named_states = None
+
+    self.invalidate_cached_counts()
 
   def _insert_item(self, object_, child_items, parents_for_child=None, with_folders=True):
     if parents_for_child is None:
@@ -985,6 +1298,24 @@ def _insert_item(self, object_, child_items, parents_for_child=None, with_folder
       path = os.path.abspath(object_)
       child_items.append(ImageFileItem(path, TYPE_ITEM, parents_for_child, [], None, None))
 
+  def _create_child_items(self, item, parents_for_child, with_folders):
+    return list(self._iter_child_items(item, parents_for_child, with_folders))
+
+  def _iter_child_items(self, item, parents_for_child, with_folders):
+    paths_and_is_dir = self._scanned_folders.get(item.id)
+    if paths_and_is_dir is None:
+      paths_and_is_dir = _scan_folder(item.id)
+
+    # Paths are already absolute and their type is known, hence we avoid
+    # calling `_insert_item()` for each path. Items are created lazily so that
+    # `stream()` does not create items for all files in a folder at once.
+    for path, is_dir in paths_and_is_dir:
+      if is_dir:
+        if with_folders:
+          yield ImageFileItem(path, TYPE_FOLDER, parents_for_child, [], None, None)
+      else:
+        yield ImageFileItem(path, TYPE_ITEM, parents_for_child, [], None, None)
+
 
 class GimpImageTree(ItemTree):
   """`ItemTree` subclass for images as `Gimp.Image` instances.
@@ -1028,6 +1359,10 @@ class GimpItemTree(ItemTree):
 
   Group items (e.g. group layers) are inserted twice in the tree - as folders
   and as items. Parents of items are always folders.
+
+  Frequently queried attributes of the underlying GIMP objects (visibility,
+  color tag, ...) can be obtained via `get_attributes()` without calling GIMP
+  for each query.
   """
 
   def __init__(
@@ -1037,6 +1372,14 @@ def __init__(
   ):
     self._images = []
 
+    # key: `Item.id`
+    # value: `GimpItemAttributes` instance
+    self._attributes = None
+
+    # key: ID of a `Gimp.Image`
+    # value: set of IDs of objects selected in the image
+    self._selected_ids_per_image = {}
+
     super().__init__(*args, **kwargs)
 
   def add_from_image(self, image: Gimp.Image):
@@ -1061,6 +1404,8 @@ def refresh(self):
     """
     self.clear()
 
+    self.invalidate_attributes()
+
     self._images = [image for image in self._images if image.is_valid()]
 
     for image in self._images:
@@ -1081,11 +1426,75 @@ def _insert_item(self, object_, child_items, parents_for_child=None, with_folder
     if gimp_object.is_group():
       if with_folders:
         child_items.append(GimpItem(gimp_object, TYPE_FOLDER, parents_for_child, [], None, None))
-      # Make sure each item keeps its own list of parents.
-      child_items.append(GimpItem(gimp_object, TYPE_GROUP, list(parents_for_child), [], None, None))
+      child_items.append(GimpItem(gimp_object, TYPE_GROUP, parents_for_child, [], None, None))
     else:
       child_items.append(GimpItem(gimp_object, TYPE_ITEM, parents_for_child, [], None, None))
 
+  def get_attributes(self, item: Item) -> GimpItemAttributes:
+    """Returns attributes of the `Gimp.Item` object of ``item`` as a
+    `GimpItemAttributes` instance.
+
+    On the first call, attributes are obtained for all items in the tree in one
+    pass and then reused until `invalidate_attributes()` or `refresh()` is
+    called. Attributes of items added to the tree afterwards are obtained on
+    demand.
+
+    Call `invalidate_attributes()` after modifying the GIMP objects (e.g.
+    changing visibility or selected layers) to avoid returning outdated
+    attributes.
+    """
+    if self._attributes is None:
+      self._take_attributes_snapshot()
+
+    try:
+      return self._attributes[item.id]
+    except KeyError:
+      attributes = self._get_attributes_from_object(item.raw)
+      self._attributes[item.id] = attributes
+
+      return attributes
+
+  def invalidate_attributes(self):
+    """Discards attributes obtained via `get_attributes()`."""
+    self._attributes = None
+    self._selected_ids_per_image = {}
+
+  def _take_attributes_snapshot(self):
+    self._attributes = {}
+    self._selected_ids_per_image = {}
+
+    for item in self.iter_all():
+      # Group items are present twice in the tree, but share the same object.
+      if item.id not in self._attributes:
+        self._attributes[item.id] = self._get_attributes_from_object(item.raw)
+
+  def _get_attributes_from_object(self, gimp_object):
+    if gimp_object.is_group():
+      num_children = len(gimp_object.get_children())
+    else:
+      num_children = 0
+
+    image = gimp_object.get_image()
+
+    return GimpItemAttributes(
+      visible=gimp_object.get_visible(),
+      color_tag=gimp_object.get_color_tag(),
+      selected=image is not None and gimp_object.get_id() in self._get_selected_ids(image),
+      num_children=num_children,
+    )
+
+  def _get_selected_ids(self, image):
+    image_id = image.get_id()
+
+    if image_id not in self._selected_ids_per_image:
+      if image.is_valid():
+        self._selected_ids_per_image[image_id] = {
+          gimp_object.get_id() for gimp_object in self._get_selected_children_from_image(image)}
+      else:
+        self._selected_ids_per_image[image_id] = set()
+
+    return self._selected_ids_per_image[image_id]
+
   @abc.abstractmethod
   def _get_children_from_image(self, image: Gimp.Image):
     """Returns a list of immediate child items from the specified `Gimp.Image`.
@@ -1094,20 +1503,37 @@ def _get_children_from_image(self, image: Gimp.Image):
     """
     pass
 
+  @abc.abstractmethod
+  def _get_selected_children_from_image(self, image: Gimp.Image):
+    """Returns a list of objects selected in the specified `Gimp.Image`.
+
+    If no objects are selected, an empty list is returned.
+    """
+    pass
+
 
 class LayerTree(GimpItemTree):
   
   def _get_children_from_image(self, image: Gimp.Image) -> List[Gimp.Layer]:
     return image.get_layers()
 
+  def _get_selected_children_from_image(self, image: Gimp.Image) -> List[Gimp.Layer]:
+    return image.get_selected_layers()
+
 
 class ChannelTree(GimpItemTree):
   
   def _get_children_from_image(self, image: Gimp.Image) -> List[Gimp.Channel]:
     return image.get_channels()
 
+  def _get_selected_children_from_image(self, image: Gimp.Image) -> List[Gimp.Channel]:
+    return image.get_selected_channels()
+
 
 class PathTree(GimpItemTree):
   
   def _get_children_from_image(self, image: Gimp.Image) -> List[Gimp.Path]:
     return image.get_paths()
+
+  def _get_selected_children_from_image(self, image: Gimp.Image) -> List[Gimp.Path]:
+    return image.get_selected_paths()
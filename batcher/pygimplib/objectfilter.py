@@ -6,7 +6,8 @@
 from collections.abc import Generator, Iterable
 import contextlib
 import itertools
-from typing import Callable, Dict, List, Optional, Union, Tuple
+import weakref
+from typing import Callable, Dict, Hashable, List, Optional, Union, Tuple
 
 
 _Rule = collections.namedtuple(
@@ -25,6 +26,8 @@ class ObjectFilter:
   
   _rule_id_counter = itertools.count(start=1)
   
+  _version_counter = itertools.count(start=1)
+  
   def __init__(self, match_type: int = MATCH_ALL, name: str = ''):
     self._match_type = match_type
     self._name = name
@@ -32,6 +35,12 @@ def __init__(self, match_type: int = MATCH_ALL, name: str = ''):
     # Key: rule/nested filter ID
     # Value: `_Rule` or `ObjectFilter` instance
     self._rules = {}
+    
+    # Filters containing this filter as a nested filter. Parents are notified
+    # of changes so that `version` does not have to traverse nested filters.
+    self._parents = weakref.WeakSet()
+    
+    self._version = next(self._version_counter)
   
   @property
   def match_type(self) -> int:
@@ -55,6 +64,17 @@ def name(self) -> str:
     """
     return self._name
   
+  @property
+  def version(self) -> int:
+    """Number identifying the current set of rules in this filter, including
+    rules in nested filters.
+
+    The version changes each time a rule is added or removed, here or in any
+    nested filter. Versions are unique across all filters, hence the version
+    can be used to e.g. cache results depending on a particular set of rules.
+    """
+    return self._version
+  
   def __bool__(self) -> bool:
     """Returns ``True`` if the filter is not empty, ``False`` otherwise."""
     return bool(self._rules)
@@ -126,6 +146,8 @@ def add(
     
     if isinstance(func_or_filter, ObjectFilter):
       self._rules[rule_id] = func_or_filter
+      func_or_filter._parents.add(self)
+      self._update_version()
       
       return rule_id
     elif callable(func_or_filter):
@@ -137,6 +159,7 @@ def add(
         self._get_rule_name_for_func(func, name),
         rule_id)
       self._rules[rule_id] = rule
+      self._update_version()
       
       return rule
     else:
@@ -152,6 +175,18 @@ def _get_rule_name_for_func(func, name):
   def _get_rule_id(self):
     return next(self._rule_id_counter)
   
+  def _update_version(self):
+    self._version = next(self._version_counter)
+    
+    for parent in list(self._parents):
+      parent._update_version()
+  
+  def _detach_nested_filters(self, rules):
+    for rule in rules:
+      if (isinstance(rule, ObjectFilter)
+          and not any(value is rule for value in self._rules.values())):
+        rule._parents.discard(self)
+  
   def remove(
         self,
         rule_id: Optional[int] = None,
@@ -189,6 +224,10 @@ def remove(
     
     matching_rules = [self._rules.pop(id_) for id_ in matching_ids]
     
+    if matching_rules:
+      self._detach_nested_filters(matching_rules)
+      self._update_version()
+    
     return matching_rules, matching_ids
 
   @contextlib.contextmanager
@@ -251,6 +290,12 @@ def remove_temp(
     finally:
       for rule_id, rule in zip(matching_ids, matching_rules):
         self._rules[rule_id] = rule
+        
+        if isinstance(rule, ObjectFilter):
+          rule._parents.add(self)
+      
+      if matching_rules:
+        self._update_version()
   
   def is_match(self, obj) -> bool:
     """Returns ``True`` if the specified object matches the rules, ``False``
@@ -274,6 +319,35 @@ def is_match(self, obj) -> bool:
     elif self._match_type == self.MATCH_ANY:
       return self._is_match_any(obj)
   
+  def filter_objects(self, objects: Iterable) -> List:
+    """Returns a list of objects from ``objects`` matching the rules, in the
+    original order.
+
+    This is equivalent to calling `is_match()` for each object, but faster for
+    a large number of objects if ``match_type`` is `MATCH_ALL`, since each rule
+    is applied to all remaining objects at once.
+    """
+    if not self._rules:
+      return list(objects)
+
+    if self._match_type == self.MATCH_ALL:
+      matching_objects = list(objects)
+
+      for value in self._rules.values():
+        if not matching_objects:
+          break
+
+        if isinstance(value, ObjectFilter):
+          matching_objects = value.filter_objects(matching_objects)
+        else:
+          rule = value
+          function, args, kwargs = rule.function, rule.args, rule.kwargs
+          matching_objects = [obj for obj in matching_objects if function(obj, *args, **kwargs)]
+
+      return matching_objects
+    else:
+      return [obj for obj in objects if self.is_match(obj)]
+  
   def _is_match_all(self, obj):
     is_match = True
     
@@ -371,5 +445,117 @@ def reset(self):
 
     The match type is preserved.
     """
+    rules = list(self._rules.values())
     self._rules.clear()
+    self._detach_nested_filters(rules)
+    self._update_version()
+
+
+
+class RuleResultCacheStats:
+  """Statistics of a `RuleResultCache` instance."""
+
+  def __init__(self):
+    self.num_hits = 0
+    """Number of results returned from the cache."""
+
+    self.num_misses = 0
+    """Number of results that had to be computed by calling a rule."""
+
+  @property
+  def hit_rate(self) -> float:
+    """Fraction of requested results returned from the cache."""
+    num_requests = self.num_hits + self.num_misses
+    return self.num_hits / num_requests if num_requests > 0 else 0.0
+
+
+class RuleResultCache:
+  """Class memoizing results of rules (callables) for individual objects.
+
+  This is useful if the same rule is evaluated for the same object multiple
+  times and the evaluation is expensive, e.g. if a rule is also applied to the
+  parents of an object and thus evaluated repeatedly for parents shared by
+  multiple objects.
+
+  Results are stored per (rule ID, object key) pair. The object key is obtained
+  by calling ``key_func`` on the object. The rule ID is assigned by `wrap()`
+  unless specified explicitly. Additional arguments passed to a rule are not
+  part of the key and are assumed to stay the same for the given rule.
+
+  If ``filter_`` is specified, all results are discarded each time rules in
+  the filter change (see `ObjectFilter.version`).
+  """
+
+  _rule_id_counter = itertools.count(start=1)
+
+  def __init__(self, key_func: Callable = id, filter_: Optional[ObjectFilter] = None):
+    self._key_func = key_func
+    self._filter = filter_
+
+    self._filter_version = self._filter.version if self._filter is not None else None
+
+    self._stats = RuleResultCacheStats()
+
+    # key: (rule ID, object key)
+    # value: result of the rule
+    self._results = {}
+
+  @property
+  def stats(self) -> RuleResultCacheStats:
+    """Hit and miss counts of this cache."""
+    return self._stats
+
+  def __len__(self) -> int:
+    """Returns the number of cached results."""
+    return len(self._results)
+
+  def wrap(self, func: Callable, rule_id: Optional[Hashable] = None) -> Callable:
+    """Returns a function calling ``func`` whose results are cached.
+
+    The first argument of the returned function must be the object to match.
+
+    If ``rule_id`` is ``None``, a new unique rule ID is assigned. Otherwise,
+    results are shared by all functions wrapped with the same ``rule_id``. This
+    allows reusing results of equivalent rules created repeatedly, e.g. rules
+    created from the same settings. ``rule_id`` should not be an integer to
+    avoid clashing with assigned rule IDs.
+    """
+    if rule_id is None:
+      rule_id = next(self._rule_id_counter)
+
+    def _get_cached_result(obj, *args, **kwargs):
+      if self._filter is not None and self._filter.version != self._filter_version:
+        self.clear()
+
+      key = (rule_id, self._key_func(obj))
+
+      try:
+        result = self._results[key]
+      except KeyError:
+        self._stats.num_misses += 1
+
+        result = func(obj, *args, **kwargs)
+        self._results[key] = result
+      else:
+        self._stats.num_hits += 1
+
+      return result
+
+    return _get_cached_result
+
+  def retain(self, rule_ids: Iterable[Hashable]):
+    """Discards cached results of rules whose ID is not in ``rule_ids``."""
+    rule_ids = set(rule_ids)
+
+    self._results = {
+      key: result for key, result in self._results.items() if key[0] in rule_ids}
+
+  def clear(self):
+    """Discards all cached results.
+
+    Hit and miss counts are preserved.
+    """
+    self._results = {}
 
+    if self._filter is not None:
+      self._filter_version = self._filter.version
@@ -14,6 +14,7 @@
 
 __all__ = [
   'pdb',
+  'GeglFilterTemplate',
   'GeglProcedure',
   'GimpPDBProcedure',
   'PDBProcedure',
@@ -29,6 +30,14 @@ def __init__(self):
 
     self._proc_cache = {}
 
+    self.reuse_configs = False
+    """If ``True``, `GimpPDBProcedure` instances reuse procedure configs across
+    calls instead of creating a new config for each call.
+
+    Arguments passed to a call are reset to their default values after the
+    call. Calls passing array arguments always create a new config.
+    """
+
   @property
   def last_status(self):
     """Exit status of the last `GimpPDBProcedure` invoked by this class."""
@@ -233,6 +242,17 @@ class GimpPDBProcedure(PDBProcedure):
   def __init__(self, pypdb_instance, name):
     self._proc = Gimp.get_pdb().lookup_procedure(name)
 
+    # key: argument name as defined in the procedure
+    # value: `_ArgumentSchema` instance
+    # Arguments are obtained on the first call to avoid querying GIMP on each call.
+    self._argument_schemas = None
+
+    # key: argument name as passed to `__call__()`
+    # value: `_ArgumentSchema` instance
+    self._argument_schemas_per_name = {}
+
+    self._config_pool = []
+
     super().__init__(pypdb_instance, name)
 
   def __call__(self, **kwargs):
@@ -243,9 +263,12 @@ def __call__(self, **kwargs):
     Return values from the procedure are returned as a tuple of values. If the
     procedure does not define any return value, ``None`` is returned.
     """
-    config = self._create_config_for_call(**kwargs)
+    config, arg_schemas = self._create_config_for_call(**kwargs)
 
-    result = self._proc.run(config)
+    try:
+      result = self._proc.run(config)
+    finally:
+      self._release_config(config, arg_schemas)
 
     if result is None:
       return None
@@ -327,27 +350,57 @@ def create_config(self):
     return self._proc.create_config()
 
   def _create_config_for_call(self, **proc_kwargs):
-    config = self.create_config()
+    arg_schemas = [self._get_argument_schema(arg_name) for arg_name in proc_kwargs]
 
-    args = self.arguments
+    if (self._pypdb_instance is not None
+        and self._pypdb_instance.reuse_configs
+        and self._config_pool
+        and all(arg_schema.is_resettable for arg_schema in arg_schemas)):
+      config = self._config_pool.pop()
+    else:
+      config = self.create_config()
 
-    args_and_names = {arg.name: arg for arg in args}
+    for arg_schema, arg_value in zip(arg_schemas, proc_kwargs.values()):
+      getattr(config, arg_schema.set_property_func_name)(arg_schema.name, arg_value)
 
-    for arg_name, arg_value in proc_kwargs.items():
-      processed_arg_name = self._process_arg_name(arg_name)
+    return config, arg_schemas
 
-      try:
-        arg = args_and_names[processed_arg_name]
-      except KeyError:
-        raise PDBProcedureError(
-          f'argument "{processed_arg_name}" does not exist',
-          Gimp.PDBStatusType.CALLING_ERROR)
+  def _release_config(self, config, arg_schemas):
+    """Resets arguments of a config passed to a call to their default values and
+    stores the config for reuse, if enabled.
+    """
+    if (self._pypdb_instance is None
+        or not self._pypdb_instance.reuse_configs
+        or not all(arg_schema.is_resettable for arg_schema in arg_schemas)):
+      return
+
+    for arg_schema in arg_schemas:
+      config.set_property(arg_schema.name, arg_schema.default_value)
+
+    self._config_pool.append(config)
+
+  def _get_argument_schema(self, arg_name):
+    try:
+      return self._argument_schemas_per_name[arg_name]
+    except KeyError:
+      pass
 
-      arg_type_name = arg.value_type.name
-      config_set_property = _get_set_property_func_for_gimp_pdb_procedure(arg_type_name, config)
-      config_set_property(processed_arg_name, arg_value)
+    if self._argument_schemas is None:
+      self._argument_schemas = {
+        arg.name: _ArgumentSchema.from_param_spec(arg) for arg in self.arguments}
 
-    return config
+    processed_arg_name = self._process_arg_name(arg_name)
+
+    try:
+      arg_schema = self._argument_schemas[processed_arg_name]
+    except KeyError:
+      raise PDBProcedureError(
+        f'argument "{processed_arg_name}" does not exist',
+        Gimp.PDBStatusType.CALLING_ERROR)
+
+    self._argument_schemas_per_name[arg_name] = arg_schema
+
+    return arg_schema
 
 
 class GeglProcedure(PDBProcedure):
@@ -377,6 +430,14 @@ def __init__(self, pypdb_instance, name):
     self._keys = {key: None for key in Gegl.Operation.list_keys(name)}
     self._properties = {prop.name: prop for prop in self._get_properties()}
 
+    # Properties supported by GIMP for this layer effect, obtained from the
+    # first created drawable filter.
+    self._config_property_names = None
+    # key: argument name
+    # value: enum type whose values are converted to `Gimp.Choice` nicks, or
+    #   ``None`` if no conversion is performed
+    self._enum_types_to_transform_to_choice = {}
+
     super().__init__(pypdb_instance, name)
 
   def __call__(self, *args, **kwargs):
@@ -402,6 +463,9 @@ def __call__(self, *args, **kwargs):
     All arguments must be specified as keyword arguments, except the
     ``drawable_`` argument, which may be specified as the first and the only
     positional argument.
+
+    To apply the same layer effect to multiple drawables, consider using
+    `create_filter_template()` instead.
     """
     processed_kwargs = {self._process_arg_name(name): value for name, value in kwargs.items()}
 
@@ -416,63 +480,92 @@ def __call__(self, *args, **kwargs):
 
       drawable = args[0]
 
+    return self._create_filter_template(processed_kwargs).apply(drawable)
+
+  def create_filter_template(self, **kwargs) -> 'GeglFilterTemplate':
+    """Returns a `GeglFilterTemplate` instance allowing to apply this layer
+    effect with the specified arguments to any number of drawables.
+
+    Arguments are the same as in `__call__()`, except ``drawable_``, which is
+    specified when applying the template.
+
+    Raises:
+      PDBProcedureError: An argument does not exist.
+    """
+    return self._create_filter_template(
+      {self._process_arg_name(name): value for name, value in kwargs.items()})
+
+  def _create_filter_template(self, processed_kwargs):
+    for arg_name in processed_kwargs:
+      if arg_name not in self._properties or arg_name == self._drawable_param.name:
+        raise PDBProcedureError(
+          f'argument "{arg_name}" does not exist or is not supported',
+          Gimp.PDBStatusType.CALLING_ERROR)
+
     blend_mode = processed_kwargs.pop('blend-mode-', self._blend_mode_param.default_value)
     opacity = processed_kwargs.pop('opacity-', self._opacity_param.default_value)
     merge_filter = processed_kwargs.pop('merge-filter-', self._merge_filter_param.default_value)
     visible = processed_kwargs.pop('visible-', self._visible_param.default_value)
-    name = processed_kwargs.pop('name-', self._filter_name_param.default_value)
+    filter_name = processed_kwargs.pop('name-', self._filter_name_param.default_value)
 
-    drawable_filter = Gimp.DrawableFilter.new(drawable, self.name, name)
-    drawable_filter.set_blend_mode(blend_mode)
-    drawable_filter.set_opacity(opacity)
-    drawable_filter.set_visible(visible)
+    return GeglFilterTemplate(
+      self, processed_kwargs, blend_mode, opacity, merge_filter, visible, filter_name)
 
-    config = drawable_filter.get_config()
+  def _get_filter_property_values(self, filter_args, config):
+    """Returns a list of (property name, value) pairs to be set in drawable
+    filter configs, converted to the types expected by GIMP.
 
-    properties_from_config = {prop.name: prop for prop in config.list_properties()}
+    ``config`` is used to obtain properties supported by GIMP for this layer
+    effect on the first call of this method.
+    """
+    if self._config_property_names is None:
+      properties_from_config = {prop.name: prop for prop in config.list_properties()}
 
-    for arg_name, arg_value in processed_kwargs.items():
-      if arg_name not in self._properties:
-        raise PDBProcedureError(
-          f'argument "{arg_name}" does not exist or is not supported',
-          Gimp.PDBStatusType.CALLING_ERROR)
+      self._config_property_names = set(properties_from_config)
+      self._enum_types_to_transform_to_choice = {
+        arg_name: self._get_enum_type_to_transform_to_choice(arg_name, properties_from_config)
+        for arg_name in properties_from_config
+        if arg_name in self._properties
+      }
 
+    property_values = []
+
+    for arg_name, arg_value in filter_args.items():
       # Silently skip properties not supported in GIMP as the procedure
       # may still finish successfully.
-      if arg_name not in properties_from_config:
+      if arg_name not in self._config_property_names:
         continue
 
-      should_transform_enum_to_choice = (
-        (self._properties[arg_name].__gtype__ == Gegl.ParamEnum.__gtype__
-         or self._properties[arg_name].__gtype__ == GObject.ParamSpecEnum.__gtype__.parent)
-        and properties_from_config[arg_name].__gtype__ == Gimp.ParamChoice.__gtype__)
-
-      # GIMP internally transforms GEGL enum values to `Gimp.Choice` values:
-      #  https://gitlab.gnome.org/GNOME/gimp/-/merge_requests/2008
-      if should_transform_enum_to_choice:
-        # For PyGObject >= 3.50.0, `default_value` returns an int rather than
-        # an enum value. `get_default_value()` is not available in < 3.50.0.
-        if hasattr(self._properties[arg_name], 'get_default_value'):
-          enum_default_value = self._properties[arg_name].get_default_value()
-        else:
-          enum_default_value = self._properties[arg_name].default_value
-
-        processed_value = type(enum_default_value)(arg_value).value_nick
+      enum_type = self._enum_types_to_transform_to_choice.get(arg_name)
+
+      if enum_type is not None:
+        processed_value = enum_type(arg_value).value_nick
       else:
         processed_value = arg_value
 
-      config.set_property(arg_name, processed_value)
+      property_values.append((arg_name, processed_value))
 
-    drawable_filter.update()
+    return property_values
 
-    if merge_filter:
-      drawable.merge_filter(drawable_filter)
+  def _get_enum_type_to_transform_to_choice(self, arg_name, properties_from_config):
+    should_transform_enum_to_choice = (
+      (self._properties[arg_name].__gtype__ == Gegl.ParamEnum.__gtype__
+       or self._properties[arg_name].__gtype__ == GObject.ParamSpecEnum.__gtype__.parent)
+      and properties_from_config[arg_name].__gtype__ == Gimp.ParamChoice.__gtype__)
 
-      return None
-    else:
-      drawable.append_filter(drawable_filter)
+    # GIMP internally transforms GEGL enum values to `Gimp.Choice` values:
+    #  https://gitlab.gnome.org/GNOME/gimp/-/merge_requests/2008
+    if should_transform_enum_to_choice:
+      # For PyGObject >= 3.50.0, `default_value` returns an int rather than
+      # an enum value. `get_default_value()` is not available in < 3.50.0.
+      if hasattr(self._properties[arg_name], 'get_default_value'):
+        enum_default_value = self._properties[arg_name].get_default_value()
+      else:
+        enum_default_value = self._properties[arg_name].default_value
 
-      return drawable_filter
+      return type(enum_default_value)
+    else:
+      return None
 
   @property
   def arguments(self):
@@ -538,13 +631,123 @@ def _get_properties(self):
     ]
 
 
-def _get_set_property_func_for_gimp_pdb_procedure(arg_type_name, config):
-  if arg_type_name == 'GimpCoreObjectArray':
-    return config.set_core_object_array
-  elif arg_type_name == 'GimpColorArray':
-    return config.set_color_array
-  else:
-    return config.set_property
+class GeglFilterTemplate:
+  """Layer effect (drawable filter, GEGL operation) with arguments prepared for
+  being applied to any number of drawables.
+
+  Arguments are validated when the template is created. Values are converted
+  to the types expected by GIMP once, on the first application. Applying the
+  template to a drawable then only creates a drawable filter and sets the
+  prepared values.
+
+  Instances should be created via `GeglProcedure.create_filter_template()`.
+  """
+
+  def __init__(
+        self,
+        procedure: GeglProcedure,
+        filter_args,
+        blend_mode,
+        opacity: float,
+        merge_filter: bool,
+        visible: bool,
+        filter_name: str,
+  ):
+    self._procedure = procedure
+    self._filter_args = filter_args
+
+    self.blend_mode = blend_mode
+    self.opacity = opacity
+    self.merge_filter = merge_filter
+    self.visible = visible
+    self.filter_name = filter_name
+
+    self._property_values = None
+
+  @property
+  def procedure(self) -> GeglProcedure:
+    """The `GeglProcedure` instance this template was created from."""
+    return self._procedure
+
+  def apply(
+        self,
+        drawable: Gimp.Drawable,
+        merge_filter: Optional[bool] = None,
+  ) -> Optional[Gimp.DrawableFilter]:
+    """Applies the layer effect on the specified drawable.
+
+    If ``merge_filter`` is ``None``, the ``merge_filter_`` argument passed when
+    creating this template is used.
+
+    If the layer effect is merged into the drawable, ``None`` is returned.
+    Otherwise, the filter is returned.
+    """
+    if merge_filter is None:
+      merge_filter = self.merge_filter
+
+    drawable_filter = Gimp.DrawableFilter.new(
+      drawable, self._procedure.name, self.filter_name)
+    drawable_filter.set_blend_mode(self.blend_mode)
+    drawable_filter.set_opacity(self.opacity)
+    drawable_filter.set_visible(self.visible)
+
+    config = drawable_filter.get_config()
+
+    if self._property_values is None:
+      self._property_values = self._procedure._get_filter_property_values(
+        self._filter_args, config)
+
+    for arg_name, value in self._property_values:
+      config.set_property(arg_name, value)
+
+    drawable_filter.update()
+
+    if merge_filter:
+      drawable.merge_filter(drawable_filter)
+
+      return None
+    else:
+      drawable.append_filter(drawable_filter)
+
+      return drawable_filter
+
+
+class _ArgumentSchema:
+  """Information about a `GimpPDBProcedure` argument needed to set its value in
+  a procedure config, obtained once per procedure.
+  """
+
+  _SET_PROPERTY_FUNC_NAMES_PER_TYPE = {
+    'GimpCoreObjectArray': 'set_core_object_array',
+    'GimpColorArray': 'set_color_array',
+  }
+
+  def __init__(self, name, set_property_func_name, default_value):
+    self.name = name
+    self.set_property_func_name = set_property_func_name
+    self.default_value = default_value
+
+  @property
+  def is_resettable(self):
+    """``True`` if the argument can be reset to its default value via
+    ``set_property()``, ``False`` otherwise.
+    """
+    return self.set_property_func_name == 'set_property'
+
+  @classmethod
+  def from_param_spec(cls, param_spec):
+    # For PyGObject >= 3.50.0, `default_value` may return an int rather than an
+    # enum value. `get_default_value()` is not available in < 3.50.0.
+    if hasattr(param_spec, 'get_default_value'):
+      default_value = param_spec.get_default_value()
+    else:
+      default_value = param_spec.default_value
+
+    return cls(
+      param_spec.name,
+      cls._SET_PROPERTY_FUNC_NAMES_PER_TYPE.get(param_spec.value_type.name, 'set_property'),
+      default_value,
+    )
 
 
 class PDBProcedureError(Exception):
@@ -154,7 +154,21 @@ def create_config():
 
 
 class ProcedureConfig:
-  pass
+
+  def __init__(self):
+    self.properties = {}
+
+  def get_property(self, name):
+    return self.properties.get(name)
+
+  def set_property(self, name, value):
+    self.properties[name] = value
+
+  def set_core_object_array(self, name, value):
+    self.properties[name] = value
+
+  def set_color_array(self, name, value):
+    self.properties[name] = value
 
 
 class Choice:
@@ -258,6 +272,7 @@ def __init__(self, name=None, id_=None, filepath=None, width=0, height=0, base_t
     self.height = height
     self.base_type = base_type
     self.layers = []
+    self.selected_layers = []
 
     if filepath is not None:
       self._file = Gio.file_new_for_path(filepath)
@@ -295,6 +310,9 @@ def get_base_type(self):
   def get_layers(self):
     return self.layers
 
+  def get_selected_layers(self):
+    return self.selected_layers
+
   def get_file(self):
     return self._file
 
@@ -330,6 +348,7 @@ def __init__(self, name=None, id_=None, visible=True, image=None, parent=None):
     self.width = 0
     self.height = 0
     self.visible = visible
+    self.color_tag = Gimp.ColorTag.NONE
     self.offsets = (0, 0)
     self.image = image
     self.children = []
@@ -386,6 +405,9 @@ def get_height(self):
   def get_visible(self):
     return self.visible
 
+  def get_color_tag(self):
+    return self.color_tag
+
   def get_offsets(self):
     return (True, *self.offsets)
 
@@ -0,0 +1,129 @@
+import unittest
+import unittest.mock as mock
+
+from .. import invocation as pginvocation
+from .. import utils as pgutils
+
+
+class _GLibStub:
+
+  def __init__(self):
+    self.callbacks = {}
+    self._next_source_id = 1
+
+  def idle_add(self, callback, *args):
+    source_id = self._next_source_id
+    self._next_source_id += 1
+
+    self.callbacks[source_id] = (callback, args)
+
+    return source_id
+
+  def source_remove(self, source_id):
+    self.callbacks.pop(source_id, None)
+
+  def run_pending(self):
+    for source_id, (callback, args) in list(self.callbacks.items()):
+      if source_id in self.callbacks and not callback(*args):
+        self.callbacks.pop(source_id, None)
+
+
+class TestIdleAddSliced(unittest.TestCase):
+
+  def setUp(self):
+    self.glib_stub = _GLibStub()
+
+    patcher = mock.patch(
+      f'{pgutils.get_pygimplib_module_path()}.invocation.GLib', new=self.glib_stub)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+    self.steps = []
+    self.closed_jobs = []
+
+  def _job(self, name, num_steps):
+    try:
+      for step in range(num_steps):
+        self.steps.append((name, step))
+        yield
+    finally:
+      self.closed_jobs.append(name)
+
+  @mock.patch(f'{pgutils.get_pygimplib_module_path()}.invocation.time.perf_counter')
+  def test_job_is_advanced_in_slices(self, mock_perf_counter):
+    # Each step takes 10 milliseconds.
+    mock_perf_counter.side_effect = [step * 0.01 for step in range(100)]
+
+    pginvocation.idle_add_sliced('job', self._job('job', 5), 25)
+
+    self.assertFalse(self.steps)
+
+    self.glib_stub.run_pending()
+
+    self.assertListEqual(self.steps, [('job', 0), ('job', 1), ('job', 2)])
+    self.assertTrue(pginvocation.is_sliced_job_running('job'))
+
+    self.glib_stub.run_pending()
+
+    self.assertEqual(len(self.steps), 5)
+    self.assertFalse(pginvocation.is_sliced_job_running('job'))
+    self.assertFalse(self.glib_stub.callbacks)
+
+  def test_first_slice_immediately(self):
+    pginvocation.idle_add_sliced('job', self._job('job', 2), 1000, first_slice_immediately=True)
+
+    self.assertEqual(len(self.steps), 2)
+    self.assertFalse(pginvocation.is_sliced_job_running('job'))
+    self.assertFalse(self.glib_stub.callbacks)
+
+  def test_job_with_the_same_key_is_canceled(self):
+    pginvocation.idle_add_sliced('job', self._job('first', 5), 0, first_slice_immediately=True)
+    pginvocation.idle_add_sliced('job', self._job('second', 2), 0)
+
+    self.assertListEqual(self.closed_jobs, ['first'])
+
+    for _unused in range(3):
+      self.glib_stub.run_pending()
+
+    self.assertListEqual(self.steps, [('first', 0), ('second', 0), ('second', 1)])
+    self.assertListEqual(self.closed_jobs, ['first', 'second'])
+
+  def test_idle_remove_sliced(self):
+    pginvocation.idle_add_sliced('job', self._job('job', 5), 0, first_slice_immediately=True)
+
+    pginvocation.idle_remove_sliced('job')
+    pginvocation.idle_remove_sliced('nonexistent_job')
+
+    self.glib_stub.run_pending()
+
+    self.assertListEqual(self.steps, [('job', 0)])
+    self.assertListEqual(self.closed_jobs, ['job'])
+    self.assertFalse(pginvocation.is_sliced_job_running('job'))
+
+  def test_job_canceled_while_being_advanced_is_closed_afterwards(self):
+    def _job():
+      try:
+        self.steps.append(0)
+        pginvocation.idle_remove_sliced('job')
+        yield
+        self.steps.append(1)
+        yield
+      finally:
+        self.closed_jobs.append('job')
+
+    pginvocation.idle_add_sliced('job', _job(), 1000, first_slice_immediately=True)
+
+    self.assertListEqual(self.steps, [0])
+    self.assertListEqual(self.closed_jobs, ['job'])
+    self.assertFalse(self.glib_stub.callbacks)
+
+  def test_job_raising_exception_is_removed(self):
+    def _job():
+      yield
+      raise ValueError('error')
+
+    with self.assertRaises(ValueError):
+      pginvocation.idle_add_sliced('job', _job(), 1000, first_slice_immediately=True)
+
+    self.assertFalse(pginvocation.is_sliced_job_running('job'))
+    self.assertFalse(self.glib_stub.callbacks)
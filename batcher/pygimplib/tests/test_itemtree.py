@@ -29,19 +29,43 @@
 from .. import utils as pgutils
 
 
+class _DirEntryStub:
+
+  def __init__(self, path, is_folder):
+    self.path = path
+    self.name = os.path.basename(path)
+    self._is_folder = is_folder
+
+  def is_dir(self):
+    return self._is_folder
+
+  def is_symlink(self):
+    return False
+
+
+class _ScandirIteratorStub:
+
+  def __init__(self, entries):
+    self._entries = entries
+
+  def __iter__(self):
+    return iter(self._entries)
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    pass
+
+
 @mock.patch(f'{pgutils.get_pygimplib_module_path()}.itemtree.os.path.isdir')
-@mock.patch(f'{pgutils.get_pygimplib_module_path()}.itemtree.os.listdir')
+@mock.patch(f'{pgutils.get_pygimplib_module_path()}.itemtree.os.scandir')
 @mock.patch(f'{pgutils.get_pygimplib_module_path()}.itemtree.os.path.abspath')
 class TestImageFileTree(unittest.TestCase):
 
   def setUp(self):
     self.paths = [
       ['Corners', 'Frames', 'main-background.jpg', 'Overlay'],
-      ['Corners', ['top-left.png', 'top-right.png', 'top-left2', 'top-left3']],
-      ['top-left2', []],
-      ['top-left3', ['bottom-right.png', 'bottom-left.png']],
-      ['Frames', ['top.png']],
-      ['Overlay', []],
     ]
 
     self.expected_keys_and_paths = {
@@ -60,8 +84,7 @@ def setUp(self):
       ('Overlay',): (['Overlay'], True),
     }
 
-    self.mock_isdir_return_values = [
-      True, True, False, True, False, True, True, False, False, False, False]
+    self.mock_isdir_return_values = [True, True, False, True]
 
     self.root_path = 'some_path'
 
@@ -69,8 +92,8 @@ def setUp(self):
 
     self.tree = pgitemtree.ImageFileTree()
 
-  def test_add(self, mock_abspath, mock_listdir, mock_isdir):
-    self._set_up_tree_before_add(mock_abspath, mock_listdir, mock_isdir)
+  def test_add(self, mock_abspath, mock_scandir, mock_isdir):
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
 
     added_items = self.tree.add(self.paths[0])
 
@@ -97,8 +120,21 @@ def test_add(self, mock_abspath, mock_listdir, mock_isdir):
           self.tree[os.path.join(self.root_path, *key)].id,
           added_item.id)
 
-  def test_add_without_folders(self, mock_abspath, mock_listdir, mock_isdir):
-    self._set_up_tree_before_add(mock_abspath, mock_listdir, mock_isdir)
+  def test_add_with_parallel_folder_scan(self, mock_abspath, mock_scandir, mock_isdir):
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
+    mock_isdir.side_effect = lambda path_: mock_abspath(path_) in self.folder_contents
+
+    tree = pgitemtree.ImageFileTree(num_folder_scan_workers=4)
+
+    added_items = tree.add(self.paths[0])
+
+    self.assertListEqual(
+      [item.key for item in added_items], self._get_keys_from_expected_paths())
+    self.assertListEqual(
+      [item.key for item in tree.iter_all()], self._get_keys_from_expected_paths())
+
+  def test_add_without_folders(self, mock_abspath, mock_scandir, mock_isdir):
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
 
     self.tree.add(self.paths[0], with_folders=False)
 
@@ -110,8 +146,8 @@ def test_add_without_folders(self, mock_abspath, mock_listdir, mock_isdir):
       os.path.join(self.root_path, 'main-background.jpg'))
 
   def test_add_with_folders_but_without_expand_folders(
-        self, mock_abspath, mock_listdir, mock_isdir):
-    self._set_up_tree_before_add(mock_abspath, mock_listdir, mock_isdir)
+        self, mock_abspath, mock_scandir, mock_isdir):
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
 
     self.tree.add(self.paths[0], with_folders=True, expand_folders=False)
 
@@ -166,7 +202,7 @@ def test_add_with_folders_but_without_expand_folders(
   def test_add_additional_time(
         self,
         mock_abspath,
-        mock_listdir,
+        mock_scandir,
         mock_isdir,
         _test_case_name_suffix,
         insert_after_path_and_is_folder_indicator,
@@ -175,7 +211,7 @@ def test_add_additional_time(
         next_item_path_and_is_folder_indicator,
         parent_item_path_and_is_folder_indicator=None,
   ):
-    self._set_up_tree_before_add(mock_abspath, mock_listdir, mock_isdir)
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
 
     self.tree.add(self.paths[0])
 
@@ -248,16 +284,17 @@ def test_add_additional_time(
       [self.tree[key] for key in expected_keys])
 
   def test_add_additional_time_under_parent_with_subfolders(
-        self, mock_abspath, mock_listdir, mock_isdir):
-    self._set_up_tree_before_add(mock_abspath, mock_listdir, mock_isdir)
+        self, mock_abspath, mock_scandir, mock_isdir):
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
 
     self.tree.add(self.paths[0])
 
     parent_item = self.tree[(os.path.join(self.root_path, 'Corners'), self.FOLDER_KEY)]
 
-    mock_isdir.side_effect = [False, True, False, False]
-    mock_listdir.side_effect = [
-      ['bottom-right2.png', 'bottom-right3.png']
+    mock_isdir.side_effect = [False, True]
+    self.folder_contents[os.path.join(self.root_path, 'Corners', 'bottom-right2')] = [
+      ('bottom-right2.png', False),
+      ('bottom-right3.png', False),
     ]
     objects_to_add = [
       os.path.join(self.root_path, *path)
@@ -304,7 +341,7 @@ def test_add_additional_time_under_parent_with_subfolders(
       [self.tree[key] for key in expected_keys])
 
   def test_add_does_not_add_same_item_multiple_times(
-        self, _mock_abspath, _mock_listdir, _mock_isdir):
+        self, _mock_abspath, _mock_scandir, _mock_isdir):
     added_items = self.tree.add(['main-background.jpg'])
     added_items_2 = self.tree.add(['main-background.jpg'])
 
@@ -312,9 +349,45 @@ def test_add_does_not_add_same_item_multiple_times(
     self.assertEqual(len(added_items), 1)
     self.assertFalse(added_items_2)
 
+  def test_stream(self, mock_abspath, mock_scandir, mock_isdir):
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
+
+    streamed_items = list(self.tree.stream(self.paths[0]))
+
+    self.assertListEqual(
+      [item.key for item in streamed_items],
+      [key for key in self._get_keys_from_expected_paths()
+       if not isinstance(key, tuple)])
+    self.assertListEqual(
+      [parent.key for parent in streamed_items[2].parents],
+      [(os.path.join(self.root_path, 'Corners'), self.FOLDER_KEY),
+       (os.path.join(self.root_path, 'Corners', 'top-left3'), self.FOLDER_KEY)])
+
+    self.assertFalse(list(self.tree.iter_all()))
+
+  def test_stream_consumes_objects_lazily(self, mock_abspath, mock_scandir, mock_isdir):
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
+    objects = iter(self.paths[0])
+
+    streamed_items = self.tree.stream(objects)
+
+    self.assertEqual(
+      next(streamed_items).key, os.path.join(self.root_path, 'Corners', 'top-left.png'))
+    self.assertListEqual(list(objects), ['Frames', 'main-background.jpg', 'Overlay'])
+
+  def test_stream_does_not_yield_same_item_multiple_times(
+        self, mock_abspath, mock_scandir, mock_isdir):
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
+    mock_isdir.side_effect = lambda path_: mock_abspath(path_) in self.folder_contents
+
+    streamed_items = list(self.tree.stream(['Frames', 'Frames/top.png', 'Frames']))
+
+    self.assertListEqual(
+      [item.key for item in streamed_items], [os.path.join(self.root_path, 'Frames', 'top.png')])
+
   def test_add_with_parent_item_when_insert_after_is_not_under_parent_or_is_not_parent_raises_error(
-        self, mock_abspath, mock_listdir, mock_isdir):
-    self._set_up_tree_before_add(mock_abspath, mock_listdir, mock_isdir)
+        self, mock_abspath, mock_scandir, mock_isdir):
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
 
     self.tree.add(self.paths[0])
 
@@ -336,8 +409,8 @@ def test_add_with_parent_item_when_insert_after_is_not_under_parent_or_is_not_pa
       )
 
   def test_add_parent_item_is_not_in_tree_raises_error(
-        self, mock_abspath, mock_listdir, mock_isdir):
-    self._set_up_tree_before_add(mock_abspath, mock_listdir, mock_isdir)
+        self, mock_abspath, mock_scandir, mock_isdir):
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
 
     self.tree.add(self.paths[0])
 
@@ -360,8 +433,8 @@ def test_add_parent_item_is_not_in_tree_raises_error(
       )
 
   def test_add_insert_after_item_is_not_in_tree_raises_error(
-        self, mock_abspath, mock_listdir, mock_isdir):
-    self._set_up_tree_before_add(mock_abspath, mock_listdir, mock_isdir)
+        self, mock_abspath, mock_scandir, mock_isdir):
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
 
     self.tree.add(self.paths[0])
 
@@ -416,13 +489,13 @@ def test_add_insert_after_item_is_not_in_tree_raises_error(
   def test_remove(
         self,
         mock_abspath,
-        mock_listdir,
+        mock_scandir,
         mock_isdir,
         _test_case_name_suffix,
         paths_to_remove,
         removed_paths=None,
   ):
-    self._set_up_tree_before_add(mock_abspath, mock_listdir, mock_isdir)
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
 
     self.tree.add(self.paths[0])
 
@@ -474,8 +547,8 @@ def test_remove(
 
     self.assertListEqual([item.key for item in removed_items], expected_removed_keys)
 
-  def test_remove_all_but_one_item(self, mock_abspath, mock_listdir, mock_isdir):
-    self._set_up_tree_before_add(mock_abspath, mock_listdir, mock_isdir)
+  def test_remove_all_but_one_item(self, mock_abspath, mock_scandir, mock_isdir):
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
 
     self.tree.add(self.paths[0])
 
@@ -495,8 +568,8 @@ def test_remove_all_but_one_item(self, mock_abspath, mock_listdir, mock_isdir):
     # noinspection PyProtectedMember
     self.assertEqual(self.tree._last_item, self.tree[key_to_keep])
 
-  def test_remove_all_items(self, mock_abspath, mock_listdir, mock_isdir):
-    self._set_up_tree_before_add(mock_abspath, mock_listdir, mock_isdir)
+  def test_remove_all_items(self, mock_abspath, mock_scandir, mock_isdir):
+    self._set_up_tree_before_add(mock_abspath, mock_scandir, mock_isdir)
 
     self.tree.add(self.paths[0])
 
@@ -509,14 +582,32 @@ def test_remove_all_items(self, mock_abspath, mock_listdir, mock_isdir):
     # noinspection PyProtectedMember
     self.assertIsNone(self.tree._last_item)
 
-  def _set_up_tree_before_add(self, mock_abspath, mock_listdir, mock_isdir):
+  def _set_up_tree_before_add(self, mock_abspath, mock_scandir, mock_isdir):
     mock_abspath.side_effect = (
       lambda path_: (
         os.path.join(self.root_path, path_)
         if not path_.startswith(self.root_path) else path_))
-    mock_listdir.side_effect = [item[1] for item in self.paths[1:]]
     mock_isdir.side_effect = self.mock_isdir_return_values
 
+    self.folder_contents = {}
+    for key, (_path, is_folder) in self.expected_keys_and_paths.items():
+      if is_folder:
+        self.folder_contents.setdefault(os.path.join(self.root_path, *key), [])
+
+      if len(key) > 1:
+        self.folder_contents.setdefault(os.path.join(self.root_path, *key[:-1]), []).append(
+          (key[-1], is_folder))
+
+    mock_scandir.side_effect = self._scandir
+
+  def _scandir(self, dirpath):
+    if dirpath not in self.folder_contents:
+      raise FileNotFoundError(dirpath)
+
+    return _ScandirIteratorStub([
+      _DirEntryStub(os.path.join(dirpath, name), is_folder)
+      for name, is_folder in self.folder_contents[dirpath]])
+
   def _get_keys_from_expected_paths(self):
     return [
       (os.path.join(self.root_path, *path[0]), self.FOLDER_KEY)
@@ -730,6 +821,97 @@ def test_len(self):
     
     self.assertEqual(len(self.tree), 6)
   
+  def test_len_after_changing_filter(self):
+    rule = self.tree.filter.add(lambda item: item.type == self.ITEM)
+    
+    self.assertEqual(len(self.tree), 6)
+    
+    self.tree.filter.remove(rule.id)
+    
+    self.assertEqual(len(self.tree), 9)
+    
+    self.tree.filter.add(lambda item: item.orig_name.startswith('top-'))
+    
+    self.assertEqual(len(self.tree), 4)
+    
+    self.tree.is_filtered = False
+    
+    self.assertEqual(len(self.tree), 9)
+  
+  def test_len_after_adding_and_removing_items(self):
+    self.tree.filter.add(lambda item: item.type == self.ITEM)
+    
+    self.assertEqual(len(self.tree), 6)
+    
+    self.tree.remove([self.tree[self.path_to_id[('Frames',)], self.FOLDER_KEY]])
+    
+    self.assertEqual(len(self.tree), 5)
+    
+    self.tree.is_filtered = False
+    
+    self.assertEqual(len(self.tree), 7)
+    
+    self.tree.clear()
+    
+    self.assertEqual(len(self.tree), 0)
+    
+    self.tree.add_from_image(self.image)
+    
+    self.assertEqual(len(self.tree), 9)
+  
+  def test_empty_groups_are_checked_once_until_invalidated(self):
+    with mock.patch.object(
+          pgitemtree.GimpItem,
+          '_list_child_objects',
+          autospec=True,
+          side_effect=lambda item: item.raw.get_children()) as mock_list_child_objects:
+      list(self.tree)
+      list(self.tree)
+      
+      self.assertEqual(mock_list_child_objects.call_count, 5)
+      
+      self.tree.invalidate_cached_counts()
+      list(self.tree)
+      
+      self.assertEqual(mock_list_child_objects.call_count, 10)
+  
+  def test_get_attributes(self):
+    layer = self.tree[self.path_to_id[('Corners', 'top-left-corner')]].raw
+    layer.image = self.image
+    self.image.selected_layers = [layer]
+
+    group_layer = self.tree[self.path_to_id[('Corners', 'top-left-corner::')]].raw
+    group_layer.image = self.image
+    group_layer.visible = False
+
+    attributes = self.tree.get_attributes(self.tree[layer.get_id()])
+
+    self.assertTrue(attributes.visible)
+    self.assertTrue(attributes.selected)
+    self.assertEqual(attributes.num_children, 0)
+
+    group_attributes = self.tree.get_attributes(self.tree[group_layer.get_id()])
+
+    self.assertFalse(group_attributes.visible)
+    self.assertFalse(group_attributes.selected)
+    self.assertEqual(group_attributes.num_children, 2)
+    self.assertEqual(
+      self.tree.get_attributes(self.tree[group_layer.get_id(), self.FOLDER_KEY]),
+      group_attributes)
+
+  def test_get_attributes_returns_snapshot_until_invalidated(self):
+    layer = self.tree[self.path_to_id[('Frames', 'top-frame')]].raw
+
+    self.assertTrue(self.tree.get_attributes(self.tree[layer.get_id()]).visible)
+
+    layer.visible = False
+
+    self.assertTrue(self.tree.get_attributes(self.tree[layer.get_id()]).visible)
+
+    self.tree.invalidate_attributes()
+
+    self.assertFalse(self.tree.get_attributes(self.tree[layer.get_id()]).visible)
+
   def test_prev(self):
     self.assertEqual(
       self.tree.prev(self.tree[self.path_to_id[('Frames', 'top-frame')]]),
@@ -928,6 +1110,23 @@ def test_refresh(self, mock_gimp_module):
     self.assertEqual(self.tree[images[1].get_id()].raw, images[1])
     self.assertEqual(images[1].get_name(), 'some_image_3')
 
+  def test_version_changes_when_items_are_added_or_removed(self, _mock_gimp_module):
+    image = stubs_gimp.Image(name='some_image')
+
+    initial_version = self.tree.version
+
+    self.tree.add([image])
+    version_after_add = self.tree.version
+
+    self.tree.remove([self.tree[image.get_id()]])
+    version_after_remove = self.tree.version
+
+    self.tree.remove([])
+
+    self.assertNotEqual(initial_version, version_after_add)
+    self.assertNotEqual(version_after_add, version_after_remove)
+    self.assertEqual(self.tree.version, version_after_remove)
+
 
 class TestImageFileItem(unittest.TestCase):
 
@@ -1040,3 +1239,26 @@ def test_get_named_state_for_no_saved_state(self):
     self.item.children = ['three', 'four']
 
     self.assertIsNone(self.item.get_named_state('export'))
+
+  def test_children_and_saved_states_are_created_when_needed(self):
+    # noinspection PyProtectedMember
+    self.assertIsNone(self.item._children)
+    # noinspection PyProtectedMember
+    self.assertIsNone(self.item._saved_states)
+    # noinspection PyProtectedMember
+    self.assertIsNone(self.item._saved_named_states)
+
+    self.assertEqual(self.item.children, [])
+    self.assertEqual(list(self.item.orig_children), [])
+
+    self.item.pop_state()
+    self.item.delete_named_state('export')
+
+    # noinspection PyProtectedMember
+    self.assertIsNone(self.item._saved_states)
+    # noinspection PyProtectedMember
+    self.assertIsNone(self.item._saved_named_states)
+
+  def test_item_has_no_instance_dict(self):
+    with self.assertRaises(AttributeError):
+      self.item.nonexistent_attribute = 1
@@ -84,6 +84,63 @@ def test_len(self):
     self.assertEqual(len(self.filter), 2)
     self.assertEqual(len(nested_filter), 3)
   
+  def test_version_changes_when_rules_change(self):
+    versions = [self.filter.version]
+    
+    rule = self.filter.add(FilterRules.has_uppercase_letters)
+    versions.append(self.filter.version)
+    
+    nested_filter = pgobjectfilter.ObjectFilter()
+    self.filter.add(nested_filter)
+    versions.append(self.filter.version)
+    
+    nested_filter.add(FilterRules.is_empty)
+    versions.append(self.filter.version)
+    
+    with self.filter.remove_temp(rule.id):
+      versions.append(self.filter.version)
+    versions.append(self.filter.version)
+    
+    self.filter.reset()
+    versions.append(self.filter.version)
+    
+    self.assertEqual(len(set(versions)), len(versions))
+  
+  def test_version_changes_when_rules_in_deeply_nested_filter_change(self):
+    nested_filter = pgobjectfilter.ObjectFilter()
+    nested_nested_filter = pgobjectfilter.ObjectFilter()
+    nested_filter.add(nested_nested_filter)
+    self.filter.add(nested_filter)
+    
+    versions = [self.filter.version, nested_filter.version]
+    
+    nested_nested_filter.add(FilterRules.is_empty)
+    
+    self.assertNotEqual(self.filter.version, versions[0])
+    self.assertNotEqual(nested_filter.version, versions[1])
+  
+  def test_version_does_not_change_when_rules_in_removed_nested_filter_change(self):
+    nested_filter = pgobjectfilter.ObjectFilter()
+    nested_filter_id = self.filter.add(nested_filter)
+    
+    with self.filter.remove_temp(nested_filter_id):
+      pass
+    
+    self.filter.remove(nested_filter_id)
+    version = self.filter.version
+    
+    nested_filter.add(FilterRules.is_empty)
+    
+    self.assertEqual(self.filter.version, version)
+  
+  def test_version_does_not_change_if_no_rule_is_removed(self):
+    self.filter.add(FilterRules.has_uppercase_letters)
+    version = self.filter.version
+    
+    self.filter.remove(42)
+    
+    self.assertEqual(self.filter.version, version)
+  
   def test_add_with_the_same_callable(self):
     rule = self.filter.add(FilterRules.has_uppercase_letters)
     rule_2 = self.filter.add(FilterRules.has_uppercase_letters)
@@ -413,6 +470,33 @@ def test_find_no_match(self):
     rule_ids = self.filter.find(name='no_matching_name')
     self.assertEqual(len(rule_ids), 0)
   
+  def test_filter_objects(self):
+    objects = [
+      FilterableObject(1, 'Foo'),
+      FilterableObject(2, 'bar', colors={'red'}),
+      FilterableObject(4, 'Baz', colors={'green'}),
+      FilterableObject(6, 'Qux', colors={'red'}),
+    ]
+    
+    self.filter.add(FilterRules.is_object_id_even)
+    
+    nested_filter = pgobjectfilter.ObjectFilter(pgobjectfilter.ObjectFilter.MATCH_ANY)
+    nested_filter.add(FilterRules.has_uppercase_letters)
+    nested_filter.add(FilterRules.has_red_color)
+    self.filter.add(nested_filter)
+    
+    expected_objects = [obj for obj in objects if self.filter.is_match(obj)]
+    
+    self.assertListEqual(self.filter.filter_objects(objects), expected_objects)
+    self.assertListEqual(
+      [obj.object_id for obj in self.filter.filter_objects(objects)], [2, 4, 6])
+    self.assertListEqual(nested_filter.filter_objects(objects), objects)
+  
+  def test_filter_objects_empty_filter(self):
+    objects = [FilterableObject(1, 'Foo'), FilterableObject(2, 'bar')]
+    
+    self.assertListEqual(self.filter.filter_objects(iter(objects)), objects)
+  
   def test_find_limit_count_first_matches(self):
     rule = self.filter.add(FilterRules.has_uppercase_letters, name='custom_name')
     self.filter.add(FilterRules.has_uppercase_letters, name='custom_name')
@@ -444,3 +528,87 @@ def test_reset(self):
     self.filter.add(FilterRules.has_uppercase_letters)
     self.filter.reset()
     self.assertFalse(bool(self.filter))
+
+
+class TestRuleResultCache(unittest.TestCase):
+  
+  def setUp(self):
+    self.filter = pgobjectfilter.ObjectFilter()
+    self.cache = pgobjectfilter.RuleResultCache(
+      key_func=lambda obj: obj.object_id, filter_=self.filter)
+    
+    self.objects = [FilterableObject(1, 'Foo'), FilterableObject(2, 'bar')]
+    
+    self.num_calls = 0
+  
+  def _is_object_id_even(self, obj):
+    self.num_calls += 1
+    return FilterRules.is_object_id_even(obj)
+  
+  def test_results_are_cached_per_object(self):
+    cached_func = self.cache.wrap(self._is_object_id_even)
+    
+    for _i in range(3):
+      self.assertFalse(cached_func(self.objects[0]))
+      self.assertTrue(cached_func(self.objects[1]))
+    
+    self.assertEqual(self.num_calls, 2)
+    self.assertEqual(len(self.cache), 2)
+    self.assertEqual(self.cache.stats.num_hits, 4)
+    self.assertEqual(self.cache.stats.num_misses, 2)
+    self.assertAlmostEqual(self.cache.stats.hit_rate, 4 / 6)
+  
+  def test_results_are_cached_per_rule(self):
+    cached_func = self.cache.wrap(self._is_object_id_even)
+    cached_func_2 = self.cache.wrap(FilterRules.has_uppercase_letters)
+    
+    self.assertFalse(cached_func(self.objects[0]))
+    self.assertTrue(cached_func_2(self.objects[0]))
+    
+    self.assertEqual(len(self.cache), 2)
+    self.assertEqual(self.cache.stats.num_hits, 0)
+  
+  def test_results_are_discarded_when_filter_changes(self):
+    cached_func = self.cache.wrap(self._is_object_id_even)
+    
+    cached_func(self.objects[0])
+    self.filter.add(cached_func)
+    cached_func(self.objects[0])
+    cached_func(self.objects[0])
+    
+    self.assertEqual(self.num_calls, 2)
+    self.assertEqual(self.cache.stats.num_hits, 1)
+  
+  def test_results_are_shared_by_rules_with_the_same_id(self):
+    cached_func = self.cache.wrap(self._is_object_id_even, rule_id='even')
+    cached_func_2 = self.cache.wrap(self._is_object_id_even, rule_id='even')
+
+    cached_func(self.objects[0])
+    cached_func_2(self.objects[0])
+
+    self.assertEqual(self.num_calls, 1)
+    self.assertEqual(self.cache.stats.num_hits, 1)
+
+  def test_retain(self):
+    cached_func = self.cache.wrap(self._is_object_id_even, rule_id='even')
+    cached_func_2 = self.cache.wrap(FilterRules.has_uppercase_letters, rule_id='uppercase')
+
+    cached_func(self.objects[0])
+    cached_func_2(self.objects[0])
+
+    self.cache.retain(['even'])
+
+    cached_func(self.objects[0])
+
+    self.assertEqual(len(self.cache), 1)
+    self.assertEqual(self.num_calls, 1)
+
+  def test_clear(self):
+    cached_func = self.cache.wrap(self._is_object_id_even)
+    
+    cached_func(self.objects[0])
+    self.cache.clear()
+    cached_func(self.objects[0])
+    
+    self.assertEqual(self.num_calls, 2)
+    self.assertEqual(self.cache.stats.num_misses, 2)
@@ -0,0 +1,175 @@
+import types
+import unittest
+import unittest.mock as mock
+
+from . import stubs_gimp
+from .. import pypdb
+from .. import utils as pgutils
+
+
+_INT_TYPE = types.SimpleNamespace(name='gint')
+_CORE_OBJECT_ARRAY_TYPE = types.SimpleNamespace(name='GimpCoreObjectArray')
+
+
+@mock.patch(
+  f'{pgutils.get_pygimplib_module_path()}.pypdb.Gimp.get_pdb', return_value=stubs_gimp.PdbStub)
+class TestGimpPDBProcedure(unittest.TestCase):
+
+  def setUp(self):
+    self.proc = stubs_gimp.Procedure(
+      'file-png-export',
+      arguments_spec=[
+        dict(value_type=_INT_TYPE, name='run-mode', default_value=0),
+        dict(value_type=_INT_TYPE, name='compression', default_value=9),
+        dict(value_type=_CORE_OBJECT_ARRAY_TYPE, name='drawables', default_value=None),
+      ])
+
+    stubs_gimp.PdbStub.add_procedure(self.proc)
+
+    self.pdb = pypdb._PyPDB()
+
+    self.configs_passed_to_run = []
+    self.proc.run = self._run
+
+  def tearDown(self):
+    stubs_gimp.PdbStub.clear_procedures()
+
+  def _run(self, config):
+    self.configs_passed_to_run.append((config, dict(config.properties)))
+
+  def test_call_sets_arguments(self, *_mocks):
+    procedure = pypdb.GimpPDBProcedure(self.pdb, 'file-png-export')
+
+    procedure(run_mode=1, compression=5, drawables=['drawable'])
+
+    self.assertDictEqual(
+      self.configs_passed_to_run[0][1],
+      {'run-mode': 1, 'compression': 5, 'drawables': ['drawable']})
+
+  def test_call_with_nonexistent_argument_raises_error(self, *_mocks):
+    procedure = pypdb.GimpPDBProcedure(self.pdb, 'file-png-export')
+
+    with self.assertRaises(pypdb.PDBProcedureError):
+      procedure(nonexistent_argument=1)
+
+  def test_arguments_are_obtained_once(self, *_mocks):
+    procedure = pypdb.GimpPDBProcedure(self.pdb, 'file-png-export')
+
+    with mock.patch.object(
+          self.proc, 'get_arguments', wraps=self.proc.get_arguments) as get_arguments_mock:
+      procedure(run_mode=1, compression=5)
+      procedure(run_mode=1, compression=6)
+      procedure(compression=7)
+
+    self.assertEqual(get_arguments_mock.call_count, 1)
+
+  def test_configs_are_not_reused_by_default(self, *_mocks):
+    procedure = pypdb.GimpPDBProcedure(self.pdb, 'file-png-export')
+
+    procedure(compression=5)
+    procedure(run_mode=1)
+
+    self.assertIsNot(self.configs_passed_to_run[0][0], self.configs_passed_to_run[1][0])
+
+  def test_reused_config_is_reset_to_default_values(self, *_mocks):
+    self.pdb.reuse_configs = True
+    procedure = pypdb.GimpPDBProcedure(self.pdb, 'file-png-export')
+
+    procedure(compression=5)
+    procedure(run_mode=1)
+
+    self.assertIs(self.configs_passed_to_run[0][0], self.configs_passed_to_run[1][0])
+    self.assertDictEqual(self.configs_passed_to_run[0][1], {'compression': 5})
+    self.assertDictEqual(self.configs_passed_to_run[1][1], {'run-mode': 1, 'compression': 9})
+    self.assertDictEqual(
+      self.configs_passed_to_run[1][0].properties, {'run-mode': 0, 'compression': 9})
+
+  def test_config_is_not_reused_for_array_arguments(self, *_mocks):
+    self.pdb.reuse_configs = True
+    procedure = pypdb.GimpPDBProcedure(self.pdb, 'file-png-export')
+
+    procedure(compression=5)
+    procedure(drawables=['drawable'])
+    procedure(compression=6)
+
+    self.assertIsNot(self.configs_passed_to_run[0][0], self.configs_passed_to_run[1][0])
+    self.assertIs(self.configs_passed_to_run[0][0], self.configs_passed_to_run[2][0])
+
+
+class _GeglPropertyStub:
+
+  def __init__(self, name):
+    self.name = name
+    self.__gtype__ = object()
+
+
+class _DrawableFilterConfigStub:
+
+  def __init__(self, property_names):
+    self.property_names = property_names
+    self.properties = {}
+
+  def list_properties(self):
+    return [_GeglPropertyStub(name) for name in self.property_names]
+
+  def set_property(self, name, value):
+    self.properties[name] = value
+
+
+@mock.patch(f'{pgutils.get_pygimplib_module_path()}.pypdb.Gimp.DrawableFilter.new')
+@mock.patch(f'{pgutils.get_pygimplib_module_path()}.pypdb.Gegl.Operation.list_keys')
+@mock.patch(f'{pgutils.get_pygimplib_module_path()}.pypdb.Gegl.Operation.list_properties')
+class TestGeglFilterTemplate(unittest.TestCase):
+
+  def setUp(self):
+    self.configs = []
+
+  def _set_up_mocks(self, mock_list_properties, mock_list_keys, mock_drawable_filter_new):
+    mock_list_properties.return_value = [
+      _GeglPropertyStub('radius'), _GeglPropertyStub('unsupported-in-gimp')]
+    mock_list_keys.return_value = []
+    mock_drawable_filter_new.side_effect = self._create_drawable_filter
+
+  def _create_drawable_filter(self, *_args, **_kwargs):
+    config = _DrawableFilterConfigStub(['radius'])
+    config.list_properties = mock.Mock(wraps=config.list_properties)
+    self.configs.append(config)
+
+    drawable_filter = mock.Mock()
+    drawable_filter.get_config.return_value = config
+
+    return drawable_filter
+
+  def test_apply_to_multiple_drawables(self, *mocks):
+    self._set_up_mocks(*mocks)
+    procedure = pypdb.GeglProcedure(pypdb._PyPDB(), 'gegl:gaussian-blur')
+    drawables = [mock.Mock(), mock.Mock()]
+
+    template = procedure.create_filter_template(radius=5.0, unsupported_in_gimp=1)
+
+    drawable_filters = [template.apply(drawable, merge_filter=False) for drawable in drawables]
+
+    for drawable, drawable_filter, config in zip(drawables, drawable_filters, self.configs):
+      self.assertDictEqual(config.properties, {'radius': 5.0})
+      drawable.append_filter.assert_called_once_with(drawable_filter)
+
+    self.assertEqual(self.configs[0].list_properties.call_count, 1)
+    self.assertEqual(self.configs[1].list_properties.call_count, 0)
+
+  def test_apply_with_merge_filter(self, *mocks):
+    self._set_up_mocks(*mocks)
+    procedure = pypdb.GeglProcedure(pypdb._PyPDB(), 'gegl:gaussian-blur')
+    drawable = mock.Mock()
+
+    template = procedure.create_filter_template(radius=5.0)
+
+    self.assertIsNone(template.apply(drawable, merge_filter=True))
+    drawable.merge_filter.assert_called_once()
+    drawable.append_filter.assert_not_called()
+
+  def test_create_with_nonexistent_argument_raises_error(self, *mocks):
+    self._set_up_mocks(*mocks)
+    procedure = pypdb.GeglProcedure(pypdb._PyPDB(), 'gegl:gaussian-blur')
+
+    with self.assertRaises(pypdb.PDBProcedureError):
+      procedure.create_filter_template(nonexistent_argument=1)
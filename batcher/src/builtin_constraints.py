@@ -17,8 +17,10 @@ def is_layer(item, _layer_batcher):
   return item.type == pg.itemtree.TYPE_ITEM
 
 
-def is_nonempty_group(item, _layer_batcher):
-  return item.type == pg.itemtree.TYPE_GROUP and item.raw.get_children()
+def is_nonempty_group(item, layer_batcher):
+  return (
+    item.type == pg.itemtree.TYPE_GROUP
+    and layer_batcher.item_tree.get_attributes(item).num_children > 0)
 
 
 def is_imported(item, _image_batcher):
@@ -79,25 +81,24 @@ def is_not_saved_or_exported(item, _image_batcher):
   return not is_saved_or_exported(item, _image_batcher)
 
 
-def is_item_in_items_selected_in_gimp(item, _layer_batcher):
-  image = item.raw.get_image()
-  return image.is_valid() and item.raw in image.get_selected_layers()
+def is_item_in_items_selected_in_gimp(item, layer_batcher):
+  return layer_batcher.item_tree.get_attributes(item).selected
 
 
 def is_top_level(item, _batcher):
   return item.depth == 0
 
 
-def is_visible(item, _layer_batcher):
-  return item.raw.get_visible()
+def is_visible(item, layer_batcher):
+  return layer_batcher.item_tree.get_attributes(item).visible
 
 
-def has_color_tag(item, _layer_batcher, color_tag, *_args, **_kwargs):
-  return item.raw.get_color_tag() == color_tag
+def has_color_tag(item, layer_batcher, color_tag, *_args, **_kwargs):
+  return layer_batcher.item_tree.get_attributes(item).color_tag == color_tag
 
 
-def has_color_tags(item, _layer_batcher, color_tags=None):
-  item_color_tag = item.raw.get_color_tag()
+def has_color_tags(item, layer_batcher, color_tags=None):
+  item_color_tag = layer_batcher.item_tree.get_attributes(item).color_tag
 
   if item_color_tag == Gimp.ColorTag.NONE:
     return False
@@ -108,12 +109,12 @@ def has_color_tags(item, _layer_batcher, color_tags=None):
       return item_color_tag != Gimp.ColorTag.NONE
 
 
-def has_no_color_tag(item, _layer_batcher, color_tag, *_args, **_kwargs):
-  return not has_color_tag(item, _layer_batcher, color_tag)
+def has_no_color_tag(item, layer_batcher, color_tag, *_args, **_kwargs):
+  return not has_color_tag(item, layer_batcher, color_tag)
 
 
-def has_no_color_tags(item, _layer_batcher, color_tags=None):
-  return not has_color_tags(item, _layer_batcher, color_tags)
+def has_no_color_tags(item, layer_batcher, color_tags=None):
+  return not has_color_tags(item, layer_batcher, color_tags)
 
 
 def has_unsaved_changes(item, _image_batcher):
@@ -124,6 +125,108 @@ def has_no_unsaved_changes(item, _image_batcher):
   return not has_unsaved_changes(item, _image_batcher)
 
 
+def compile_constraint(function, args, kwargs):
+  """Returns a function accepting an item as its only argument and returning
+  the result of the constraint ``function`` with the given arguments.
+
+  For some built-in constraints, a specialized function is returned that
+  prepares the arguments (e.g. compiles a regular expression) only once instead
+  of each time an item is matched.
+  """
+  compiler = _CONSTRAINT_COMPILERS.get(function)
+
+  if compiler is not None:
+    return compiler(*args, **kwargs)
+
+  def _constraint(item):
+    return function(item, *args, **kwargs)
+
+  return _constraint
+
+
+def is_cheap_constraint(function):
+  """Returns ``True`` if the constraint ``function`` only accesses item
+  attributes such as name or type rather than calling GIMP, ``False``
+  otherwise.
+
+  Cheap constraints can be evaluated before other constraints to avoid calling
+  GIMP for items that would not match anyway.
+  """
+  return function in _CHEAP_CONSTRAINTS
+
+
+def _compile_has_matching_file_extension(batcher):
+  file_extension = batcher.file_extension.lower()
+
+  def _has_matching_file_extension(item):
+    return fileext.get_file_extension(item.name).lower() == file_extension
+
+  return _has_matching_file_extension
+
+
+def _compile_is_matching_text(_batcher, match_mode, text, ignore_case_sensitivity):
+  if not text:
+    return _match_always
+
+  if match_mode not in MatchModes.MATCH_MODES:
+    raise ValueError(
+      f'unrecognized match mode; must be one of: {", ".join(MatchModes.MATCH_MODES)}')
+
+  if ignore_case_sensitivity:
+    text = text.lower()
+
+  if match_mode == MatchModes.REGEX:
+    try:
+      pattern = re.compile(text)
+    except re.error:
+      return _match_never
+
+  if ignore_case_sensitivity:
+    def _get_name(item):
+      return item.name.lower()
+  else:
+    def _get_name(item):
+      return item.name
+
+  if match_mode == MatchModes.STARTS_WITH:
+    def _is_matching_text(item):
+      return _get_name(item).startswith(text)
+  elif match_mode == MatchModes.CONTAINS:
+    def _is_matching_text(item):
+      return text in _get_name(item)
+  elif match_mode == MatchModes.ENDS_WITH:
+    def _is_matching_text(item):
+      return _get_name(item).endswith(text)
+  else:
+    # noinspection PyUnboundLocalVariable
+    def _is_matching_text(item):
+      return pattern.search(_get_name(item)) is not None
+
+  return _is_matching_text
+
+
+def _match_always(_item):
+  return True
+
+
+def _match_never(_item):
+  return False
+
+
+_CONSTRAINT_COMPILERS = {
+  has_matching_file_extension: _compile_has_matching_file_extension,
+  is_matching_text: _compile_is_matching_text,
+}
+
+_CHEAP_CONSTRAINTS = {
+  is_layer,
+  has_matching_file_extension,
+  is_matching_text,
+  has_recognized_file_format,
+  is_top_level,
+}
+
+
 class MatchModes:
   MATCH_MODES = (
     STARTS_WITH,
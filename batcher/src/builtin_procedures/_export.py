@@ -14,11 +14,13 @@
 
 from src import builtin_actions_common
 from src import exceptions
+from src import export_writer
 from src import file_formats as file_formats_
 from src import overwrite
 from src import renamer as renamer_
 from src import uniquifier
 from src import utils
+from src.path import dirindex
 from src.path import fileext
 from src.path import validators as validators_
 from src.procedure_groups import *
@@ -32,6 +34,7 @@
   'ExportModes',
   'ExportStatuses',
   'export',
+  'get_export_filepath',
   'get_export_function',
   'on_after_add_export_procedure',
   'set_sensitive_for_image_name_pattern_in_export_for_default_export_procedure',
@@ -86,11 +89,39 @@ def export(
       use_file_extension_in_item_name: bool = False,
       convert_file_extension_to_lowercase: bool = False,
       use_original_modification_date: bool = False,
+      predefined_filepaths: Optional[Dict[str, str]] = None,
+      write_in_background: bool = False,
+      max_pending_writes: int = 8,
+      revalidate_existing_files: bool = False,
 ) -> Generator[None, None, None]:
+  """Exports the current item.
+
+  ``predefined_filepaths`` is an optional dictionary of (item ID, file path
+  relative to ``output_directory``) pairs. Items present in the dictionary are
+  exported to the specified file path without further processing of their
+  names. This is used by workers processing a shard of items, whose names were
+  already processed by the coordinating process (see `src.sharding`).
+
+  If ``write_in_background`` is ``True``, images are exported to a local
+  temporary folder and then moved to ``output_directory`` in a background
+  thread while the next item is being processed. At most
+  ``max_pending_writes`` files may wait to be moved at a time. Errors
+  occurring while moving files are raised as `exceptions.ExportError` when
+  processing a subsequent item or after all items are processed.
+
+  Existing files in output folders are determined by scanning each folder once
+  (see `src.path.dirindex.DirectoryIndex`). If ``revalidate_existing_files``
+  is ``True``, a folder is scanned again whenever it was modified since the
+  last scan, e.g. by another process exporting to the same folder.
+  """
   if file_format_export_options is None:
     file_format_export_options = {}
 
+  if predefined_filepaths is None:
+    predefined_filepaths = {}
+
   item_uniquifier = uniquifier.ItemUniquifier()
+  directory_index = dirindex.DirectoryIndex(revalidate=revalidate_existing_files)
   file_extension_properties = _FileExtensionProperties('export')
   processed_parents = set()
   default_file_extension = file_extension
@@ -105,7 +136,23 @@ def export(
   batcher.invoker.add(_delete_images_on_cleanup, ['cleanup_contents'], [multi_layer_images])
   batcher.invoker.add(_delete_images_on_cleanup, ['cleanup_contents'], [image_copies])
 
+  file_writer = None
+
   while True:
+    # The writer is started on the first exported item rather than right away
+    # as `process_export` may be ``False`` for items whose names are only
+    # processed (e.g. items unchanged since the last conversion).
+    if write_in_background and batcher.process_export and file_writer is None:
+      file_writer = export_writer.BackgroundFileWriter(max_pending_files=max_pending_writes)
+      file_writer.start()
+
+      batcher.invoker.add(_finish_background_writes, ['after_process_items'], [file_writer])
+      batcher.invoker.add(
+        _finish_background_writes_on_cleanup, ['cleanup_contents'], [file_writer])
+
+    if file_writer is not None:
+      _raise_background_write_errors(file_writer.pop_errors())
+
     item = batcher.current_item
     current_file_extension = default_file_extension
 
@@ -167,7 +214,12 @@ def export(
       else:
         item_to_process = current_top_level_item
 
-    if batcher.process_names:
+    predefined_filepath = predefined_filepaths.get(item_to_process.id)
+
+    if batcher.process_names and predefined_filepath is not None:
+      item_to_process.save_state(EXPORT_NAME_ITEM_STATE)
+      _set_item_export_name(item_to_process, os.path.basename(predefined_filepath))
+    elif batcher.process_names:
       item_to_process.save_state(EXPORT_NAME_ITEM_STATE)
 
       if use_file_extension_in_item_name:
@@ -206,10 +258,17 @@ def export(
         file_extension_properties,
         overwrite_chooser,
         use_original_modification_date,
+        predefined_filepath,
+        file_writer,
+        directory_index,
       )
       
       if export_status == ExportStatuses.USE_DEFAULT_FILE_EXTENSION:
-        if batcher.process_names:
+        if predefined_filepath is not None:
+          predefined_filepath = fileext.get_filename_with_new_file_extension(
+            predefined_filepath, default_file_extension, keep_extra_trailing_periods=True)
+          _set_item_export_name(item_to_process, os.path.basename(predefined_filepath))
+        elif batcher.process_names:
           _process_item_name(
             item_to_process,
             item_uniquifier,
@@ -230,6 +289,9 @@ def export(
             file_extension_properties,
             overwrite_chooser,
             use_original_modification_date,
+            predefined_filepath,
+            file_writer,
+            directory_index,
           )
       
       if chosen_overwrite_mode != overwrite.OverwriteModes.SKIP:
@@ -253,6 +315,22 @@ def _delete_images_on_cleanup(batcher, images):
       pg.pdbutils.try_delete_image(image)
 
 
+def _finish_background_writes(_batcher, file_writer):
+  _raise_background_write_errors(file_writer.finish())
+
+
+def _finish_background_writes_on_cleanup(_batcher, file_writer):
+  # Errors are ignored here as processing already finished or was interrupted
+  # by another error.
+  file_writer.finish()
+
+
+def _raise_background_write_errors(errors):
+  if errors:
+    (item_name, file_extension), exception = errors[0]
+    raise exceptions.ExportError(str(exception), item_name, file_extension)
+
+
 def _get_top_level_item(item):
   if item is not None and item.parents:
     return item.parents[0]
@@ -376,6 +454,12 @@ def _set_item_export_name(item, name):
   item.get_named_state(EXPORT_NAME_ITEM_STATE)['name'] = name
 
 
+def _set_item_export_filepath(item, filepath):
+  item_state = item.get_named_state(EXPORT_NAME_ITEM_STATE)
+  if item_state is not None:
+    item_state['filepath'] = filepath
+
+
 def _get_unique_substring_position(str_, file_extension):
   return len(str_) - len(f'.{file_extension}')
 
@@ -392,8 +476,17 @@ def _export_item(
       file_extension_properties,
       overwrite_chooser,
       use_original_modification_date,
+      predefined_filepath=None,
+      file_writer=None,
+      directory_index=None,
 ):
-  output_filepath = _get_item_filepath(item, output_directory)
+  if directory_index is None:
+    directory_index = dirindex.DirectoryIndex()
+
+  if predefined_filepath is None:
+    output_filepath = _get_item_filepath(item, output_directory)
+  else:
+    output_filepath = os.path.join(_get_dirpath(output_directory), predefined_filepath)
   file_extension = fileext.get_file_extension(_get_item_export_name(item))
   export_status = ExportStatuses.NOT_EXPORTED_YET
 
@@ -401,7 +494,8 @@ def _export_item(
     chosen_overwrite_mode, output_filepath = overwrite.handle_overwrite(
       output_filepath,
       overwrite_chooser,
-      _get_unique_substring_position(output_filepath, file_extension))
+      _get_unique_substring_position(output_filepath, file_extension),
+      directory_index)
   except OSError as e:
     raise exceptions.ExportError(str(e), _get_item_export_name(item), file_extension)
 
@@ -411,7 +505,12 @@ def _export_item(
     raise exceptions.BatcherCancelError('cancelled')
   
   if chosen_overwrite_mode != overwrite.OverwriteModes.SKIP:
-    _make_dirs(item, os.path.dirname(output_filepath), default_file_extension)
+    _make_dirs(item, os.path.dirname(output_filepath), default_file_extension, directory_index)
+
+    if file_writer is not None:
+      export_filepath = file_writer.get_temp_filepath(output_filepath)
+    else:
+      export_filepath = output_filepath
     
     export_status = _export_item_once_wrapper(
       batcher,
@@ -420,6 +519,7 @@ def _export_item(
       image,
       layer,
       output_filepath,
+      export_filepath,
       file_extension,
       file_format_mode,
       file_format_export_options,
@@ -436,6 +536,7 @@ def _export_item(
         image,
         layer,
         output_filepath,
+        export_filepath,
         file_extension,
         file_format_mode,
         file_format_export_options,
@@ -443,6 +544,19 @@ def _export_item(
         file_extension_properties,
         use_original_modification_date,
       )
+
+    if file_writer is not None and export_status == ExportStatuses.EXPORT_SUCCESSFUL:
+      file_writer.submit(
+        export_filepath, output_filepath, (_get_item_export_name(item), file_extension))
+
+    if export_status == ExportStatuses.EXPORT_SUCCESSFUL:
+      _set_item_export_filepath(item, output_filepath)
+      # With background writes, the file is recorded before it is moved to
+      # `output_filepath` so that subsequent files do not claim the same path.
+      directory_index.add(output_filepath)
+    else:
+      # A partially written file may exist after a failed export.
+      directory_index.invalidate(os.path.dirname(output_filepath))
   
   return chosen_overwrite_mode, export_status
 
@@ -461,12 +575,7 @@ def _get_item_filepath(item, directory: Gio.File):
   Item path components consist of parents' item names, starting with the
   topmost parent.
   """
-  if directory is None or directory.get_path() is None:
-    dirpath = ''
-  else:
-    dirpath = directory.get_path()
-  
-  dirpath = os.path.abspath(dirpath)
+  dirpath = _get_dirpath(directory)
   
   path_components = [_get_item_export_name(parent) for parent in item.parents]
   if path_components:
@@ -475,7 +584,19 @@ def _get_item_filepath(item, directory: Gio.File):
   return os.path.join(dirpath, _get_item_export_name(item))
 
 
-def _make_dirs(item, dirpath, default_file_extension):
+def _get_dirpath(directory: Gio.File):
+  if directory is None or directory.get_path() is None:
+    dirpath = ''
+  else:
+    dirpath = directory.get_path()
+
+  return os.path.abspath(dirpath)
+
+
+def _make_dirs(item, dirpath, default_file_extension, directory_index):
+  if directory_index.is_dir(dirpath):
+    return
+
   try:
     os.makedirs(dirpath, exist_ok=True)
   except OSError as e:
@@ -489,6 +610,8 @@ def _make_dirs(item, dirpath, default_file_extension):
     raise exceptions.InvalidOutputDirectoryError(
       message, _get_item_export_name(item), default_file_extension)
 
+  directory_index.add(dirpath, is_dir=True)
+
 
 def _export_item_once_wrapper(
       batcher,
@@ -497,6 +620,7 @@ def _export_item_once_wrapper(
       image,
       layer,
       output_filepath,
+      export_filepath,
       file_extension,
       file_format_mode,
       file_format_export_options,
@@ -511,7 +635,7 @@ def _export_item_once_wrapper(
       run_mode,
       item,
       image,
-      output_filepath,
+      export_filepath,
       file_extension,
       file_format_mode,
       file_format_export_options,
@@ -618,6 +742,14 @@ def _set_original_modification_date(item, filepath):
     os.utime(filepath, times=(orig_filepath_stat.st_atime, orig_filepath_stat.st_mtime))
 
 
+def get_export_filepath(item: pg.itemtree.Item) -> Optional[str]:
+  """Returns the file path ``item`` was exported to during the last export, or
+  ``None`` if the item was not exported.
+  """
+  item_state = item.get_named_state(EXPORT_NAME_ITEM_STATE)
+  return item_state.get('filepath') if item_state is not None else None
+
+
 def get_export_function(
       file_extension: str,
       file_format_mode: str,
@@ -706,6 +838,8 @@ def __getitem__(self, key):
 class _NameOnlyItem(pg.itemtree.Item):
   """`pygimplib.itemtree.Item` subclass used to store the item name only."""
 
+  __slots__ = ()
+
   @property
   def raw(self):
     return None
@@ -40,6 +40,10 @@ def unit_to_pixels(batcher, dimension, resolution_axis):
   convert units other than pixels or percentages (e.g. inches) to pixels. The
   image to obtain resolution from is the currently processed image
   (`batcher.current_image`).
+
+  Values in units other than percentages are multiplied by
+  `batcher.proxy_scale` so that they match the size of the current image if
+  it is a scaled-down proxy of the original image.
   """
   if dimension['unit'] == Gimp.Unit.percent():
     placeholder_object = placeholders_.PLACEHOLDERS[dimension['percent_object']]
@@ -67,7 +71,7 @@ def unit_to_pixels(batcher, dimension, resolution_axis):
 
     pixels = (dimension['percent_value'] / 100) * gimp_object_dimension
   elif dimension['unit'] == Gimp.Unit.pixel():
-    pixels = dimension['pixel_value']
+    pixels = dimension['pixel_value'] * batcher.proxy_scale
   else:
     image_resolution = batcher.current_image.get_resolution()
     if resolution_axis == 'x':
@@ -79,7 +83,8 @@ def unit_to_pixels(batcher, dimension, resolution_axis):
         f'unrecognized value for resolution_dimension: {resolution_axis}')
 
     pixels = (
-      dimension['other_value'] / dimension['unit'].get_factor() * image_resolution_for_dimension)
+      dimension['other_value'] / dimension['unit'].get_factor() * image_resolution_for_dimension
+      * batcher.proxy_scale)
 
   int_pixels = round(pixels)
 
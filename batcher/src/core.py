@@ -6,12 +6,13 @@
 import contextlib
 import os
 import traceback
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
 
 import gi
 gi.require_version('Gimp', '3.0')
 from gi.repository import Gimp
 from gi.repository import Gio
+from gi.repository import GLib
 
 import pygimplib as pg
 from pygimplib import pdb
@@ -21,16 +22,49 @@
 from src import builtin_constraints
 from src import builtin_procedures
 from src import exceptions
+from src import file_formats as file_formats_
+from src import incremental
 from src import invoker as invoker_
 from src import overwrite
 from src import placeholders
+from src import prefetch
+from src import preview_cache
 from src import progress as progress_
+from src import renamer as renamer_
+from src import scratch_images
 from src import utils
+from src.path import fileext
 
 
 _BATCHER_ARG_POSITION_IN_ACTIONS = 0
 _NAME_ONLY_ACTION_GROUP = 'name'
 
+# Results of constraints are discarded once their number exceeds this value if
+# items are streamed, so that the memory usage does not grow with the number of
+# processed items.
+_MAX_NUM_CACHED_CONSTRAINT_RESULTS = 10000
+
+_EXPORT_OPTIONS_NOT_AFFECTING_OUTPUT = [
+  'overwrite_mode',
+  'predefined_filepaths',
+  'write_in_background',
+  'max_pending_writes',
+  'revalidate_existing_files',
+]
+
+
+def _get_item_key(item):
+  return item.key
+
+
+def _append_item(items, last_item, item):
+  if last_item is not None:
+    items[last_item] = item
+
+  items[item] = None
+
+  return item
+
 
 class Batcher(metaclass=abc.ABCMeta):
   """Abstract class for batch-processing items with a sequence of actions
@@ -56,10 +90,14 @@ def __init__(
         process_contents: bool = True,
         process_names: bool = True,
         process_export: bool = True,
+        names_only: bool = False,
         export_context_manager: Optional[contextlib.AbstractContextManager] = None,
         export_context_manager_args: Optional[Union[List, Tuple]] = None,
         export_context_manager_kwargs: Optional[Dict] = None,
         keep_image_copies: bool = False,
+        items_to_stream: Optional[Iterable[pg.itemtree.Item]] = None,
+        preview_snapshots: Optional[preview_cache.PreviewCache] = None,
+        reuse_constraint_results: bool = False,
   ):
     self._item_tree = item_tree
     self._procedures = procedures
@@ -78,10 +116,14 @@ def __init__(
     self._process_contents = process_contents
     self._process_names = process_names
     self._process_export = process_export
+    self._names_only = names_only
     self._export_context_manager = export_context_manager
     self._export_context_manager_args = export_context_manager_args
     self._export_context_manager_kwargs = export_context_manager_kwargs
     self._keep_image_copies = keep_image_copies
+    self._items_to_stream = items_to_stream
+    self._preview_snapshots = preview_snapshots
+    self._reuse_constraint_results = reuse_constraint_results
 
     self._current_item = None
     self._current_image = None
@@ -101,6 +143,24 @@ def __init__(
     self._failed_procedures = collections.defaultdict(list)
     self._failed_constraints = collections.defaultdict(list)
 
+    self._constraint_results_cache = None
+    self._compiled_constraints = None
+    self._constraint_rule_ids = set()
+
+    # key: action name
+    # value: (`pygimplib.pypdb.GeglFilterTemplate` instance, setting
+    #   specifying the drawable to apply the template to)
+    self._gegl_filter_templates = {}
+
+    # key: procedure
+    # value: hash of the settings of the procedure and all preceding procedures
+    self._preview_snapshot_keys = {}
+    self._preview_snapshot_item_key = None
+    self._resumed_procedures = set()
+    self._num_resumed_procedures = 0
+
+    self._proxy_scale = 1.0
+
     self._should_stop = False
 
     self._invoker = None
@@ -239,8 +299,8 @@ def process_names(self) -> bool:
     """If ``True``, item names are processed before export to be suitable to
     save to disk (in particular to remove characters invalid for a file system).
 
-    If `is_preview` is ``True`` and `process_names` is ``True``, built-in
-    procedures modifying item names only are also invoked (particularly those
+    If `is_preview` or `names_only` is ``True`` and `process_names` is
+    ``True``, built-in procedures modifying item names only are also invoked (particularly those
     with the `builtin_actions_common.NAME_ONLY_TAG` tag).
     """
     return self._process_names
@@ -254,6 +314,22 @@ def process_export(self) -> bool:
     """
     return self._process_export
 
+  @property
+  def names_only(self) -> bool:
+    """If ``True``, item names are processed the same way as in a real run
+    (with `is_preview` set to ``False``), without processing the contents of
+    items.
+
+    Procedures modifying names only are invoked (see `process_names`), and
+    procedures and constraints are applied regardless of whether they are
+    enabled for previews. `process_contents` and `process_export` should be
+    set to ``False``.
+
+    This is useful to obtain the final names of items up front, e.g. to
+    split items between multiple processes.
+    """
+    return self._names_only
+
   @property
   def export_context_manager(self) -> contextlib.AbstractContextManager:
     """Context manager that wraps exporting a single item.
@@ -282,6 +358,85 @@ def keep_image_copies(self) -> bool:
     """
     return self._keep_image_copies
 
+  @property
+  def items_to_stream(self) -> Optional[Iterable[pg.itemtree.Item]]:
+    """Items to process instead of the items in `item_tree`, or ``None`` to
+    process the items in `item_tree`.
+
+    The items (e.g. a generator returned by
+    `pygimplib.itemtree.ItemTree.stream()`) are processed as they are obtained,
+    without keeping all items in memory. Constraints are still added to the
+    filter of `item_tree` and applied to each obtained item. During processing,
+    `matching_items` and `matching_items_and_parents` only contain the current
+    item and a few following items.
+
+    If processing requires knowing all items in advance (number fields with
+    descending numbers starting from the number of items, or exporting each
+    top-level item or folder separately), all items are obtained first and then
+    processed as if they were in `item_tree`.
+
+    As the items can usually be obtained only once, pass the items to `run()`
+    on each call.
+    """
+    return self._items_to_stream
+
+  @property
+  def preview_snapshots(self) -> Optional[preview_cache.PreviewCache]:
+    """Cache of image copies ("snapshots") taken after applying each procedure
+    to an item, or ``None`` if snapshots are not taken.
+
+    Snapshots are only taken if `is_preview` and `process_contents` are
+    ``True``. When the same item is processed again, procedures whose
+    snapshot exists are not applied as long as the settings of the procedures
+    and of all preceding procedures are unchanged. Processing instead resumes
+    from a copy of the last such snapshot. For example, if only the last of
+    several procedures changed, only the last procedure is applied.
+
+    Snapshots are stored as (`Gimp.Image` instance, `proxy_scale`) tuples. The
+    cache should therefore delete images removed from the cache by passing
+    `delete_preview_snapshot()` as the ``remove_func`` parameter to
+    `preview_cache.PreviewCache`. The cache must be cleared if the original
+    images or layers may have been modified.
+    """
+    return self._preview_snapshots
+
+  @property
+  def num_resumed_procedures(self) -> int:
+    """Number of procedures not applied during the last call to `run()` as
+    their results were restored from `preview_snapshots`.
+    """
+    return self._num_resumed_procedures
+
+  @property
+  def proxy_scale(self) -> float:
+    """Factor by which the currently processed image is scaled down relative to
+    the original image.
+
+    The factor is less than 1.0 if the current image is a scaled-down proxy of
+    the original image (see `ImageBatcher.proxy_size`), and 1.0 otherwise.
+    Procedures should multiply arguments expressed in pixels or in physical
+    units (e.g. inches) by this factor so that a proxy is processed the same
+    way as the original image.
+    """
+    return self._proxy_scale
+
+  @property
+  def reuse_constraint_results(self) -> bool:
+    """If ``True``, results of constraints are kept after `run()` finishes and
+    reused in subsequent runs.
+
+    Results of a constraint are reused as long as the settings of the
+    constraint are unchanged. Changing one constraint thus only causes that
+    constraint to be evaluated again, and changing procedures or e.g. the name
+    pattern does not cause any constraint to be evaluated again.
+
+    Results are discarded if `refresh_item_tree` is ``True`` or if
+    `clear_constraint_results()` is called. Use this option only if the
+    attributes of items, e.g. their visibility in GIMP, cannot change between
+    runs otherwise.
+    """
+    return self._reuse_constraint_results
+
   @property
   def current_item(self) -> pg.itemtree.Item:
     """A `pygimplib.itemtree.Item` instance currently being processed."""
@@ -329,6 +484,9 @@ def matching_items(self) -> Optional[Dict[pg.itemtree.Item, Optional[pg.itemtree
     This is useful if you need to work with items matching constraints at the
     start of processing as some items may no longer match these constraints
     at the end of processing.
+
+    If `items_to_stream` is not ``None``, only the item currently being
+    processed and a few following items may be present.
     """
     return self._matching_items
 
@@ -399,6 +557,23 @@ def failed_constraints(self) -> Dict[str, List]:
     """
     return dict(self._failed_constraints)
 
+  @property
+  def constraint_cache_stats(self) -> Optional[pg.objectfilter.RuleResultCacheStats]:
+    """`pygimplib.objectfilter.RuleResultCacheStats` instance describing how
+    many constraint results were reused rather than evaluated again during the
+    last call to `run()`, or ``None`` if `run()` was not called yet.
+
+    Results of a constraint are reused for an item (e.g. a parent folder shared
+    by multiple items if ``also_apply_to_parent_folders`` is enabled) until
+    constraints are added or removed. If `reuse_constraint_results` is
+    ``True``, results are also reused across runs and the statistics cover all
+    runs since the results were last discarded.
+    """
+    if self._constraint_results_cache is not None:
+      return self._constraint_results_cache.stats
+    else:
+      return None
+
   @property
   def invoker(self) -> invoker_.Invoker:
     """`pygimplib.invoker.Invoker` instance to manage procedures and constraints
@@ -484,6 +659,16 @@ def reorder_action(self, *args, **kwargs):
     """
     self._initial_invoker.reorder(*args, **kwargs)
 
+  def clear_constraint_results(self):
+    """Discards results of constraints kept if `reuse_constraint_results` is
+    ``True``.
+
+    Call this method if the attributes of items may have changed outside
+    `run()`.
+    """
+    if self._constraint_results_cache is not None:
+      self._constraint_results_cache.clear()
+
   def run(self, **kwargs):
     """Batch-processes and exports items.
 
@@ -491,6 +676,31 @@ def run(self, **kwargs):
     `Batcher.__init__()`. Arguments in ``**kwargs`` overwrite the
     corresponding `Batcher` properties. See the properties for details.
     """
+    for _unused in self.run_in_steps(**kwargs):
+      pass
+
+  def run_in_steps(
+        self,
+        yield_after_procedures: bool = False,
+        **kwargs,
+  ) -> Generator[Optional[pg.itemtree.Item], None, None]:
+    """Same as `run()`, but returns a generator processing one item at a time.
+
+    Each item is yielded after it is processed. Preparations (e.g. obtaining
+    items matching constraints) are performed when the first item is
+    requested.
+
+    If ``yield_after_procedures`` is ``True``, ``None`` is also yielded after
+    each procedure (or another action, e.g. export) applied to an item. This
+    allows interleaving the processing of even a single item with other work.
+
+    This allows interleaving batch processing with other work, e.g. handling
+    GUI events. The batcher must not be run again until the generator is
+    exhausted or closed.
+
+    Closing the generator prematurely stops the processing as if
+    `queue_stop()` was called, except that no exception is raised.
+    """
     self._set_attributes(**kwargs)
     self._set_up_item_tree()
     self._prepare_for_processing()
@@ -500,8 +710,8 @@ def run(self, **kwargs):
     if self._process_contents:
       self._setup_contents()
     try:
-      self._process_items()
-    except Exception:
+      yield from self._process_items(yield_after_procedures)
+    except (Exception, GeneratorExit):
       exception_occurred = True
       raise
     finally:
@@ -564,6 +774,25 @@ def _prepare_for_processing(self):
     self._failed_procedures = collections.defaultdict(list)
     self._failed_constraints = collections.defaultdict(list)
 
+    if not self._reuse_constraint_results:
+      self._constraint_results_cache = pg.objectfilter.RuleResultCache(
+        key_func=_get_item_key, filter_=self._item_tree.filter)
+    elif self._constraint_results_cache is None or self._refresh_item_tree:
+      # Rule IDs identify the settings of constraints, hence results do not
+      # need to be discarded if the filter changes.
+      self._constraint_results_cache = pg.objectfilter.RuleResultCache(key_func=_get_item_key)
+
+    self._constraint_rule_ids = set()
+
+    self._gegl_filter_templates = {}
+
+    self._preview_snapshot_keys = self._get_preview_snapshot_keys()
+    self._preview_snapshot_item_key = None
+    self._resumed_procedures = set()
+    self._num_resumed_procedures = 0
+
+    self._proxy_scale = 1.0
+
     self._invoker = invoker_.Invoker()
 
     self._add_actions()
@@ -573,9 +802,39 @@ def _prepare_for_processing(self):
 
     self._progress_updater.reset()
 
+  def _get_preview_snapshot_keys(self):
+    snapshot_keys = {}
+
+    if self._preview_snapshots is None or not self._is_preview or not self._process_contents:
+      return snapshot_keys
+
+    procedures_hash = incremental.get_settings_hash(self._get_preview_snapshot_keys_seed())
+
+    for procedure in self._procedures:
+      if not self._is_enabled(procedure):
+        continue
+
+      procedures_hash = incremental.get_settings_hash(
+        [procedures_hash]
+        + [[setting.get_path(self._procedures), setting.to_dict().get('value')]
+           for setting in procedure.walk()])
+
+      snapshot_keys[procedure] = procedures_hash
+
+    return snapshot_keys
+
+  def _get_preview_snapshot_keys_seed(self):
+    return [type(self).__name__, self._edit_mode]
+
   def _add_actions(self):
     self._add_actions_before_initial_invoker()
 
+    if self._preview_snapshot_keys:
+      self._invoker.add(
+        self._save_preview_snapshot_after_procedure,
+        [actions.DEFAULT_PROCEDURES_GROUP],
+        foreach=True)
+
     self._invoker.add(
       self._initial_invoker,
       self._initial_invoker.list_groups(include_empty_groups=True))
@@ -697,27 +956,90 @@ def _add_action_from_settings(
     self._invoker.add(processed_function, action_groups, invoker_args)
 
   def _get_processed_function(self, action):
+    # Settings of an action do not change during a run. The enabled state and
+    # tags are therefore obtained once and argument values are bound on the
+    # first invocation, leaving only placeholders to be replaced for each item.
+    is_enabled = self._is_enabled(action)
+    is_procedure = 'procedure' in action.tags
+    is_constraint = 'constraint' in action.tags
+    is_function_pdb_procedure = action['origin'].value in ['gimp_pdb', 'gegl']
+
+    bound_args = None
 
     def _function_wrapper(*action_args_and_function):
-      action_args, function = action_args_and_function[:-1], action_args_and_function[-1]
+      nonlocal bound_args
+
+      if not is_enabled:
+        return False
 
-      if not self._is_enabled(action):
+      if is_procedure and action in self._resumed_procedures:
         return False
 
-      self._set_current_procedure_and_constraint(action)
+      if is_procedure:
+        self._current_procedure = action
+
+      if is_constraint:
+        self._last_constraint = action
+
+      action_args, function = action_args_and_function[:-1], action_args_and_function[-1]
+
+      if bound_args is None:
+        bound_args = self._bind_args(action_args, is_function_pdb_procedure)
+
+        if is_function_pdb_procedure:
+          bound_args[0].pop(_BATCHER_ARG_POSITION_IN_ACTIONS)
+
+      if isinstance(function, pg.pypdb.GeglProcedure) and not is_constraint:
+        return self._apply_gegl_filter_template(function, action, action_args, bound_args)
 
-      args, kwargs = self._get_action_args_and_kwargs(action, action_args)
+      args, kwargs = self._get_bound_args_and_kwargs(action_args, bound_args)
 
-      if 'constraint' in action.tags:
-        function = self._set_apply_constraint_to_folders(function, action)
-        function = self._get_constraint_func(function, action['orig_name'].value)
+      if is_constraint:
+        self._add_compiled_constraint(function, args, kwargs, action)
+        return
 
       return function(*args, **kwargs)
 
     return _function_wrapper
 
+  def _apply_gegl_filter_template(self, procedure, action, action_args, bound_args):
+    """Applies a GEGL operation to the drawable specified in the action
+    arguments.
+
+    Arguments other than the drawable are resolved once per action per run
+    into a filter template, which is then applied to each item.
+    """
+    _positional_arg_indexes, fixed_kwargs, placeholder_replacements = bound_args
+
+    if action.name not in self._gegl_filter_templates:
+      can_use_template = (
+        all(name == 'drawable-' for name, _func, _is_array in placeholder_replacements)
+        and (placeholder_replacements or 'drawable-' in fixed_kwargs))
+
+      if can_use_template:
+        kwargs = dict(fixed_kwargs)
+        drawable = kwargs.pop('drawable-', None)
+
+        self._gegl_filter_templates[action.name] = (
+          procedure.create_filter_template(**kwargs), drawable)
+      else:
+        self._gegl_filter_templates[action.name] = None
+
+    template_and_drawable = self._gegl_filter_templates[action.name]
+
+    if template_and_drawable is None:
+      args, kwargs = self._get_bound_args_and_kwargs(action_args, bound_args)
+      return procedure(*args, **kwargs)
+
+    template, drawable = template_and_drawable
+
+    if placeholder_replacements:
+      drawable = placeholder_replacements[0][1](self)
+
+    return template.apply(drawable)
+
   def _is_enabled(self, action):
-    if self._is_preview:
+    if self._is_preview and not self._names_only:
       if not (action['enabled'].value and action['more_options/enabled_for_previews'].value):
         return False
     else:
@@ -726,19 +1048,57 @@ def _is_enabled(self, action):
 
     return True
 
-  def _set_current_procedure_and_constraint(self, action):
-    if 'procedure' in action.tags:
-      self._current_procedure = action
+  def _bind_args(self, action_args, is_function_pdb_procedure):
+    """Splits action arguments into arguments whose values are fixed during a
+    run and placeholders whose values must be replaced for each item.
 
-    if 'constraint' in action.tags:
-      self._last_constraint = action
+    A tuple of the following is returned:
+    * indexes of positional arguments (arguments inserted within `Batcher`),
+    * keyword arguments with fixed values,
+    * a list of (argument name, replacement function, whether the value is an
+      array to be converted to a PDB-compatible type) tuples for placeholders.
+    """
+    positional_arg_indexes = []
+    fixed_kwargs = {}
+    placeholder_replacements = []
+
+    for index, argument in enumerate(action_args):
+      if isinstance(argument, placeholders.PlaceholderUnsupportedParameterSetting):
+        # The replaced value does not depend on the item being processed.
+        fixed_kwargs[argument.name] = placeholders.get_replaced_value(argument, self)
+      elif isinstance(argument, placeholders.PlaceholderSetting):
+        placeholder_replacements.append((
+          argument.name,
+          placeholders.get_replacement_func(argument),
+          (is_function_pdb_procedure
+           and isinstance(argument, placeholders.PlaceholderArraySetting)),
+        ))
+      elif isinstance(argument, pg.setting.Setting):
+        if is_function_pdb_procedure:
+          fixed_kwargs[argument.name] = argument.value_for_pdb
+        else:
+          fixed_kwargs[argument.name] = argument.value
+      else:
+        # Other arguments inserted within `Batcher`
+        positional_arg_indexes.append(index)
+
+    return positional_arg_indexes, fixed_kwargs, placeholder_replacements
+
+  def _get_bound_args_and_kwargs(self, action_args, bound_args):
+    positional_arg_indexes, fixed_kwargs, placeholder_replacements = bound_args
+
+    args = [action_args[index] for index in positional_arg_indexes]
 
-  def _get_action_args_and_kwargs(self, action, action_args):
-    args, kwargs = self._get_replaced_args(
-      action_args, action['origin'].value in ['gimp_pdb', 'gegl'])
+    if not placeholder_replacements:
+      return args, fixed_kwargs
 
-    if action['origin'].value in ['gimp_pdb', 'gegl']:
-      args.pop(_BATCHER_ARG_POSITION_IN_ACTIONS)
+    kwargs = dict(fixed_kwargs)
+
+    for name, replacement_func, is_array_for_pdb in placeholder_replacements:
+      if is_array_for_pdb:
+        kwargs[name] = pg.setting.array_as_pdb_compatible_type(replacement_func(self))
+      else:
+        kwargs[name] = replacement_func(self)
 
     return args, kwargs
 
@@ -746,28 +1106,8 @@ def _get_replaced_args(self, action_arguments, is_function_pdb_procedure):
     """Returns positional and keyword arguments for an action, replacing any
     placeholder values with real values.
     """
-    replaced_args = []
-    replaced_kwargs = {}
-
-    for argument in action_arguments:
-      if isinstance(argument, placeholders.PlaceholderArraySetting):
-        replaced_arg = placeholders.get_replaced_value(argument, self)
-        if is_function_pdb_procedure:
-          replaced_kwargs[argument.name] = pg.setting.array_as_pdb_compatible_type(replaced_arg)
-        else:
-          replaced_kwargs[argument.name] = replaced_arg
-      elif isinstance(argument, placeholders.PlaceholderSetting):
-        replaced_kwargs[argument.name] = placeholders.get_replaced_value(argument, self)
-      elif isinstance(argument, pg.setting.Setting):
-        if is_function_pdb_procedure:
-          replaced_kwargs[argument.name] = argument.value_for_pdb
-        else:
-          replaced_kwargs[argument.name] = argument.value
-      else:
-        # Other arguments inserted within `Batcher`
-        replaced_args.append(argument)
-
-    return replaced_args, replaced_kwargs
+    return self._get_bound_args_and_kwargs(
+      action_arguments, self._bind_args(action_arguments, is_function_pdb_procedure))
 
   @staticmethod
   def _set_apply_constraint_to_folders(function, action):
@@ -787,6 +1127,33 @@ def _function_wrapper(*action_args, **action_kwargs):
     else:
       return function
 
+  def _add_compiled_constraint(self, function, args, kwargs, action):
+    is_cheap = builtin_constraints.is_cheap_constraint(function)
+
+    compiled_function = builtin_constraints.compile_constraint(function, args, kwargs)
+
+    if not is_cheap:
+      if self._reuse_constraint_results:
+        rule_id = self._get_constraint_rule_id(action)
+        self._constraint_rule_ids.add(rule_id)
+      else:
+        rule_id = None
+
+      compiled_function = self._constraint_results_cache.wrap(compiled_function, rule_id=rule_id)
+
+    compiled_function = self._set_apply_constraint_to_folders(compiled_function, action)
+
+    if self._compiled_constraints is not None:
+      self._compiled_constraints.append((is_cheap, action['orig_name'].value, compiled_function))
+    else:
+      self._item_tree.filter.add(compiled_function, name=action['orig_name'].value)
+
+  def _get_constraint_rule_id(self, action):
+    return incremental.get_settings_hash(
+      [type(self).__name__, self._edit_mode, self._is_preview]
+      + [[setting.get_path(self._constraints), setting.to_dict().get('value')]
+         for setting in action.walk()])
+
   def _get_constraint_func(self, func, name=''):
 
     def _function_wrapper(*args, **kwargs):
@@ -838,18 +1205,50 @@ def _set_failed_actions(self, action, error_message, trace=None):
       self._failed_constraints[action.name].append((self._current_item, error_message, trace))
 
   def _set_constraints(self):
-    self._invoker.invoke(
-      [actions.DEFAULT_CONSTRAINTS_GROUP],
-      [self],
-      additional_args_position=_BATCHER_ARG_POSITION_IN_ACTIONS)
+    """Adds constraints as rules to the item tree filter.
+
+    Constraints are first compiled to functions accepting only an item (see
+    `builtin_constraints.compile_constraint()`). Cheap constraints (e.g.
+    matching item names) are then added before constraints calling GIMP so
+    that the latter are evaluated for fewer items.
+    """
+    self._compiled_constraints = []
+
+    try:
+      self._invoker.invoke(
+        [actions.DEFAULT_CONSTRAINTS_GROUP],
+        [self],
+        additional_args_position=_BATCHER_ARG_POSITION_IN_ACTIONS)
+    finally:
+      compiled_constraints = self._compiled_constraints
+      self._compiled_constraints = None
+
+    # The sort is stable, preserving the order within cheap and other constraints.
+    compiled_constraints.sort(key=lambda constraint: not constraint[0])
+
+    for _is_cheap, name, compiled_function in compiled_constraints:
+      self._item_tree.filter.add(compiled_function, name=name)
+
+    if self._reuse_constraint_results:
+      # Results of removed or modified constraints would never be reused.
+      self._constraint_results_cache.retain(self._constraint_rule_ids)
 
   def _setup_contents(self):
     Gimp.context_push()
 
-  def _process_items(self):
-    self._matching_items, self._matching_items_and_parents = self._get_items_matching_constraints()
+  def _process_items(self, yield_after_procedures=False):
+    if self._items_to_stream is not None and not self._requires_all_items():
+      self._matching_items = {}
+      self._matching_items_and_parents = {}
+      self._progress_updater.num_total_tasks = 0
 
-    self._progress_updater.num_total_tasks = len(self._matching_items)
+      matching_items = self._iter_streamed_items_matching_constraints()
+    else:
+      self._matching_items, self._matching_items_and_parents = (
+        self._get_items_matching_constraints())
+      self._progress_updater.num_total_tasks = len(self._matching_items)
+
+      matching_items = self._matching_items
 
     self._invoker.invoke(
       ['before_process_items'],
@@ -862,14 +1261,18 @@ def _process_items(self):
         [self],
         additional_args_position=_BATCHER_ARG_POSITION_IN_ACTIONS)
 
-    for item in self._matching_items:
+    for item in matching_items:
       if self._should_stop:
         raise exceptions.BatcherCancelError('stopped by user')
 
       if self._edit_mode:
         self._progress_updater.update_text(_('Processing "{}"').format(item.orig_name))
 
-      self._process_item(item)
+      for _unused in self._process_item(item):
+        if yield_after_procedures:
+          yield None
+
+      yield item
 
     if self._process_contents:
       self._invoker.invoke(
@@ -900,7 +1303,16 @@ def _get_matching_items_and_next_items(matching_items_list_):
     matching_items_and_parents_list = []
     matching_items_list = []
 
-    for item in self._item_tree:
+    # Constraints are applied to all items at once rather than item by item.
+    if self._items_to_stream is not None:
+      items = list(self._items_to_stream)
+    else:
+      items = list(self._item_tree.iter(with_folders=False, filtered=False))
+
+    if self._item_tree.is_filtered:
+      items = self._item_tree.filter.filter_objects(items)
+
+    for item in items:
       for parent in item.parents:
         if parent not in visited_parents:
           matching_items_and_parents_list.append(parent)
@@ -914,16 +1326,95 @@ def _get_matching_items_and_next_items(matching_items_list_):
 
     return matching_items, matching_items_and_parents
 
+  def _iter_streamed_items_matching_constraints(self):
+    """Yields items from `items_to_stream` matching constraints.
+
+    Before an item is yielded, following matching items are obtained so that
+    `matching_items` and `matching_items_and_parents` contain the item along
+    with up to `_get_num_items_to_look_ahead()` following items. Once the
+    processing of the yielded item is finished, the item and its parents are
+    removed from `matching_items` and `matching_items_and_parents`.
+    """
+    num_items_to_look_ahead = max(self._get_num_items_to_look_ahead(), 1)
+
+    last_item = None
+    last_item_or_parent = None
+
+    for item in self._items_to_stream:
+      if len(self._constraint_results_cache) > _MAX_NUM_CACHED_CONSTRAINT_RESULTS:
+        self._constraint_results_cache.clear()
+
+      if self._item_tree.is_filtered and not self._item_tree.filter.is_match(item):
+        continue
+
+      last_parents = last_item.parents if last_item is not None else []
+
+      # Items are streamed depth-first, hence parents shared with the previous
+      # item are always the leading parents of the previous item.
+      for parent in item.parents:
+        if parent not in last_parents:
+          last_item_or_parent = _append_item(
+            self._matching_items_and_parents, last_item_or_parent, parent)
+
+      last_item_or_parent = _append_item(
+        self._matching_items_and_parents, last_item_or_parent, item)
+      last_item = _append_item(self._matching_items, last_item, item)
+
+      self._progress_updater.num_total_tasks += 1
+
+      if len(self._matching_items) > num_items_to_look_ahead:
+        yield from self._yield_first_streamed_item()
+
+    while self._matching_items:
+      yield from self._yield_first_streamed_item()
+
+  def _yield_first_streamed_item(self):
+    item = next(iter(self._matching_items))
+
+    yield item
+
+    del self._matching_items[item]
+
+    for item_or_parent in list(self._matching_items_and_parents):
+      del self._matching_items_and_parents[item_or_parent]
+
+      if item_or_parent == item:
+        break
+
+  def _get_num_items_to_look_ahead(self):
+    return 1
+
+  def _requires_all_items(self):
+    export_modes = [self._more_export_options.get('export_mode')]
+    name_patterns = [self._name_pattern]
+
+    for procedure in self._procedures:
+      if not self._is_enabled(procedure):
+        continue
+
+      for argument in procedure['arguments'].walk():
+        if argument.name == 'export_mode':
+          export_modes.append(argument.value)
+        elif isinstance(argument, pg.setting.StringSetting):
+          name_patterns.append(argument.value)
+
+    return (
+      builtin_procedures.ExportModes.EACH_TOP_LEVEL_ITEM_OR_FOLDER in export_modes
+      or any(
+        renamer_.uses_number_of_items(name_pattern)
+        for name_pattern in name_patterns if name_pattern))
+
   def _process_item(self, item):
     self._current_item = item
     self._current_image = self._get_initial_current_image()
     self._current_layer = self._get_initial_current_layer()
+    self._resumed_procedures = set()
 
-    if self._is_preview and self._process_names:
+    if (self._is_preview or self._names_only) and self._process_names:
       self._process_item_with_name_only_actions()
 
     if self._process_contents:
-      self._process_item_with_actions()
+      yield from self._process_item_with_actions()
 
     self._progress_updater.update_tasks()
 
@@ -957,7 +1448,7 @@ def _process_item_with_actions(self):
         [self],
         additional_args_position=_BATCHER_ARG_POSITION_IN_ACTIONS)
 
-    self._invoker.invoke(
+    yield from self._invoker.invoke_in_steps(
       [actions.DEFAULT_PROCEDURES_GROUP],
       [self],
       additional_args_position=_BATCHER_ARG_POSITION_IN_ACTIONS)
@@ -976,6 +1467,75 @@ def _process_item_with_actions(self):
     if not self._edit_mode and not self._keep_image_copies:
       self._remove_image_copies()
 
+  def _restore_preview_snapshot(self) -> Optional[Gimp.Image]:
+    """Returns a copy of the snapshot taken after the last procedure that
+    does not need to be applied again to the current item, or ``None`` if
+    there is no such snapshot.
+    """
+    self._resumed_procedures = set()
+
+    if not self._preview_snapshot_keys:
+      return None
+
+    self._preview_snapshot_item_key = self._get_preview_snapshot_item_key()
+    if self._preview_snapshot_item_key is None:
+      return None
+
+    procedures = list(self._preview_snapshot_keys)
+
+    for index in range(len(procedures) - 1, -1, -1):
+      snapshot_key = (
+        self._preview_snapshot_item_key, self._preview_snapshot_keys[procedures[index]])
+      snapshot = self._preview_snapshots.get(snapshot_key)
+
+      if snapshot is None:
+        continue
+
+      snapshot_image, proxy_scale = snapshot
+
+      if not snapshot_image.is_valid():
+        self._preview_snapshots.remove(snapshot_key)
+        continue
+
+      self._resumed_procedures = set(procedures[:index + 1])
+      self._num_resumed_procedures += len(self._resumed_procedures)
+      self._proxy_scale = proxy_scale
+
+      return snapshot_image.duplicate()
+
+    return None
+
+  def _get_preview_snapshot_item_key(self):
+    return self._current_item.key
+
+  def _save_preview_snapshot_after_procedure(self, _batcher):
+    procedure_before_action = self._current_procedure
+
+    action_applied = yield
+
+    procedure = self._current_procedure
+
+    if (action_applied is False
+        or procedure is None
+        or procedure is procedure_before_action
+        or procedure not in self._preview_snapshot_keys
+        or self._preview_snapshot_item_key is None
+        or self._current_image is None
+        or not self._current_image.is_valid()):
+      return
+
+    snapshot_key = (self._preview_snapshot_item_key, self._preview_snapshot_keys[procedure])
+
+    if snapshot_key in self._preview_snapshots:
+      return
+
+    snapshot_image = self._current_image.duplicate()
+
+    self._preview_snapshots.add(
+      snapshot_key,
+      (snapshot_image, self._proxy_scale),
+      _get_image_size_in_bytes(snapshot_image))
+
   @abc.abstractmethod
   def _get_initial_current_image(self):
     pass
@@ -1054,11 +1614,236 @@ class ImageBatcher(Batcher):
   actions (resize, rename, export, ...).
   """
 
-  def __init__(self, *args, **kwargs):
+  def __init__(
+        self,
+        *args,
+        num_images_to_prefetch: int = 4,
+        max_prefetch_bytes: int = 512 * 1024 * 1024,
+        skip_unchanged: bool = False,
+        rebuild_manifest: bool = False,
+        compare_file_contents: bool = False,
+        settings_hash: Optional[str] = None,
+        proxy_size: Optional[Tuple[int, int]] = None,
+        **kwargs,
+  ):
+    self._num_images_to_prefetch = num_images_to_prefetch
+    self._max_prefetch_bytes = max_prefetch_bytes
+    self._skip_unchanged = skip_unchanged
+    self._rebuild_manifest = rebuild_manifest
+    self._compare_file_contents = compare_file_contents
+    self._settings_hash = settings_hash
+    self._proxy_size = proxy_size
+
     self._should_load_image = False
+    self._prefetcher = None
+    self._manifest = None
+    self._current_settings_hash = None
+    self._unchanged_items = []
+    self._are_items_unchanged = {}
+    self._is_current_item_unchanged = False
 
     super().__init__(*args, **kwargs)
 
+  @property
+  def num_images_to_prefetch(self) -> int:
+    """Number of image files to read ahead in a background thread while the
+    current image is being processed.
+
+    Reading files ahead allows loading images from slow storage (e.g. network
+    drives) to overlap with processing. Set this to 0 to disable reading ahead.
+    Image files are never read ahead for previews.
+    """
+    return self._num_images_to_prefetch
+
+  @property
+  def max_prefetch_bytes(self) -> int:
+    """Maximum number of bytes of image files read ahead and not yet loaded.
+
+    See `num_images_to_prefetch` for more information.
+    """
+    return self._max_prefetch_bytes
+
+  @property
+  def prefetch_stats(self) -> Optional[prefetch.PrefetchStats]:
+    """`prefetch.PrefetchStats` instance describing how many image files were
+    read ahead before being loaded, or ``None`` if no image files were read ahead
+    during the last call to `run()`.
+    """
+    return self._prefetcher.stats if self._prefetcher is not None else None
+
+  @property
+  def skip_unchanged(self) -> bool:
+    """If ``True``, image files converted to `output_directory` in a previous
+    run are skipped (without being loaded) if neither the files nor the
+    settings changed since then and the output files still exist.
+
+    Information about converted files is stored in a manifest file in
+    `output_directory` (see `incremental.ConversionManifest`). Files are only
+    skipped if each image is exported to a separate file and if `is_preview`
+    and `edit_mode` are ``False``.
+    """
+    return self._skip_unchanged
+
+  @property
+  def rebuild_manifest(self) -> bool:
+    """If ``True`` and `skip_unchanged` is ``True``, the manifest of converted
+    files is discarded, causing all image files to be converted again.
+    """
+    return self._rebuild_manifest
+
+  @property
+  def compare_file_contents(self) -> bool:
+    """If ``True`` and `skip_unchanged` is ``True``, image files are also
+    considered unchanged if their modification time changed, but their contents
+    did not.
+
+    This requires computing a hash of the contents of each image file.
+    """
+    return self._compare_file_contents
+
+  @property
+  def settings_hash(self) -> Optional[str]:
+    """Hash of the settings affecting the conversion, used to detect changes
+    in settings if `skip_unchanged` is ``True``.
+
+    If ``None``, the hash is computed from `procedures`, `constraints`,
+    `name_pattern`, `file_extension` and `more_export_options`.
+    """
+    return self._settings_hash
+
+  @property
+  def unchanged_items(self) -> List[pg.itemtree.Item]:
+    """List of items skipped during the last call to `run()` as they were
+    unchanged since the last conversion.
+
+    Names of unchanged items are still processed so that the names of other
+    items (e.g. numbers in names or names made unique) are the same as if all
+    items were converted. Unchanged items are not loaded, processed by
+    procedures not affecting names, or exported.
+
+    See `skip_unchanged` for more information.
+    """
+    return list(self._unchanged_items)
+
+  @property
+  def proxy_size(self) -> Optional[Tuple[int, int]]:
+    """Maximum width and height of a scaled-down version ("proxy") of each
+    image to process instead of the original image, or ``None`` to process the
+    original images.
+
+    Proxies are only used if `is_preview` is ``True``, allowing previews to be
+    rendered faster for large images. Images larger than ``proxy_size`` are
+    scaled down right after loading while preserving their aspect ratio. For
+    image files, a thumbnail loader for the file format (e.g.
+    ``file-jpeg-load-thumb``) is used instead of loading the full image if the
+    loader exists and provides a large enough image, and if the resolution of
+    the original image can be read from the file metadata.
+
+    Procedures are expected to scale their pixel-valued arguments by
+    `proxy_scale`. This is done for built-in procedures. Other procedures,
+    e.g. GIMP procedures or GEGL filters, process proxies with unscaled
+    arguments, hence the results may differ from processing the original
+    images.
+    """
+    return self._proxy_size
+
+  def _prepare_for_processing(self):
+    super()._prepare_for_processing()
+
+    self._unchanged_items = []
+    self._are_items_unchanged = {}
+    self._is_current_item_unchanged = False
+
+  def _setup_contents(self):
+    super()._setup_contents()
+
+    if self._num_images_to_prefetch > 0 and not self._is_preview:
+      self._prefetcher = prefetch.FilePrefetcher(self._max_prefetch_bytes)
+      self._prefetcher.start()
+    else:
+      self._prefetcher = None
+
+    self._setup_manifest()
+
+  def _setup_manifest(self):
+    export_mode = self._more_export_options.get(
+      'export_mode', builtin_procedures.ExportModes.EACH_ITEM)
+
+    if (not self._skip_unchanged
+        or self._is_preview
+        or self._edit_mode
+        or not self._process_export
+        or export_mode != builtin_procedures.ExportModes.EACH_ITEM
+        or self._output_directory is None
+        or self._output_directory.get_path() is None):
+      self._manifest = None
+      return
+
+    self._manifest = incremental.ConversionManifest(
+      self._output_directory.get_path(), use_content_hash=self._compare_file_contents)
+
+    if not self._rebuild_manifest:
+      self._manifest.load()
+
+    if self._settings_hash is not None:
+      self._current_settings_hash = self._settings_hash
+    else:
+      self._current_settings_hash = incremental.get_settings_hash([
+        utils.get_settings_hash(self._procedures),
+        utils.get_settings_hash(self._constraints),
+        self._name_pattern,
+        self._file_extension,
+        {key: value for key, value in self._more_export_options.items()
+         if key not in _EXPORT_OPTIONS_NOT_AFFECTING_OUTPUT},
+      ])
+
+  def _is_item_unchanged(self, item):
+    if self._manifest is None or not isinstance(item.id, str):
+      return False
+
+    # The result is stored as items are also checked when reading image files
+    # ahead and computing the result may require hashing the file contents.
+    if item.id not in self._are_items_unchanged:
+      self._are_items_unchanged[item.id] = self._manifest.is_unchanged(
+        item.id, self._current_settings_hash)
+
+    return self._are_items_unchanged[item.id]
+
+  def _get_num_items_to_look_ahead(self):
+    # Following items must be known to read their image files ahead.
+    return max(super()._get_num_items_to_look_ahead(), self._num_images_to_prefetch)
+
+  def _get_processed_function(self, action):
+    processed_function = super()._get_processed_function(action)
+
+    if ('procedure' not in action.tags
+        or builtin_actions_common.NAME_ONLY_TAG in action.tags):
+      return processed_function
+
+    def _skip_for_unchanged_item(*action_args_and_function):
+      if self._is_current_item_unchanged:
+        return False
+
+      return processed_function(*action_args_and_function)
+
+    return _skip_for_unchanged_item
+
+  def _process_item(self, item):
+    self._is_current_item_unchanged = self._is_item_unchanged(item)
+    self._are_items_unchanged.pop(item.id, None)
+
+    if self._is_current_item_unchanged:
+      self._unchanged_items.append(item)
+
+    yield from super()._process_item(item)
+
+    if (self._manifest is not None
+        and isinstance(item.id, str)
+        and not self._is_current_item_unchanged):
+      export_filepath = builtin_procedures.get_export_filepath(item)
+      if export_filepath is not None:
+        self._manifest.update(item.id, self._current_settings_hash, export_filepath)
+
   def _get_initial_current_image(self):
     return self._current_item.raw
 
@@ -1114,10 +1899,25 @@ def _add_default_export_procedure(self, action_groups):
       )
 
   def _process_item_with_actions(self):
+    if self._is_current_item_unchanged:
+      self._process_unchanged_item_names()
+      return
+
     self._should_load_image = self._current_image is None
+    self._proxy_scale = 1.0
 
     if not self._edit_mode or self._is_preview:
-      if self._should_load_image:
+      image_copy = self._restore_preview_snapshot()
+
+      if image_copy is not None:
+        self._current_image = image_copy
+        self._image_copies.append(image_copy)
+
+        if self._should_load_image:
+          self._current_item.raw = image_copy
+      elif self._should_load_image:
+        self._prefetch_next_images()
+
         loaded_image = self._load_image(self._current_item.id)
         if loaded_image is not None:
           self._current_image = loaded_image
@@ -1126,6 +1926,9 @@ def _process_item_with_actions(self):
       else:
         image_copy, _not_applicable = self.create_copy(self._current_image, None)
 
+        if self._should_use_proxy():
+          self._scale_image_to_proxy_size(image_copy, image_copy.get_width())
+
         self._current_image = image_copy
         self._image_copies.append(image_copy)
     else:
@@ -1134,7 +1937,7 @@ def _process_item_with_actions(self):
     self._current_layer = self._get_current_layer(self._current_image)
 
     if self._current_image is not None:
-      super()._process_item_with_actions()
+      yield from super()._process_item_with_actions()
 
     if self._should_load_image:
       self._current_item.raw = None
@@ -1142,14 +1945,128 @@ def _process_item_with_actions(self):
     self._current_image = None
     self._current_layer = None
 
-  def _load_image(self, image_filepath):
-    if os.path.isfile(image_filepath):
-      return pdb.gimp_file_load(
-        run_mode=Gimp.RunMode.NONINTERACTIVE,
-        file=Gio.file_new_for_path(image_filepath))
+  def _process_unchanged_item_names(self):
+    # Procedures not affecting names are skipped for unchanged items (see
+    # `_get_processed_function()`), and export procedures only process names
+    # if `process_export` is ``False``.
+    orig_process_export = self._process_export
+    self._process_export = False
+
+    try:
+      self._invoker.invoke(
+        [actions.DEFAULT_PROCEDURES_GROUP],
+        [self],
+        additional_args_position=_BATCHER_ARG_POSITION_IN_ACTIONS)
+    finally:
+      self._process_export = orig_process_export
+
+  def _get_preview_snapshot_item_key(self):
+    if self._current_item.raw is None:
+      # Snapshots of image files become outdated once the files are modified.
+      try:
+        return self._current_item.key, os.path.getmtime(self._current_item.id)
+      except OSError:
+        return None
     else:
+      return super()._get_preview_snapshot_item_key()
+
+  def _get_preview_snapshot_keys_seed(self):
+    seed = super()._get_preview_snapshot_keys_seed()
+
+    if self._should_use_proxy():
+      seed.append(list(self._proxy_size))
+
+    return seed
+
+  def _prefetch_next_images(self):
+    if self._prefetcher is None:
+      return
+
+    self._prefetcher.consume(self._current_item.id)
+
+    next_items = []
+    next_item = self._matching_items.get(self._current_item)
+
+    while next_item is not None and len(next_items) < self._num_images_to_prefetch:
+      if next_item.raw is None and not self._is_item_unchanged(next_item):
+        next_items.append(next_item.id)
+      next_item = self._matching_items.get(next_item)
+
+    self._prefetcher.schedule(next_items)
+
+  def _load_image(self, image_filepath):
+    if not os.path.isfile(image_filepath):
       raise exceptions.BatcherFileLoadError(_('File not found'), self._current_item)
 
+    if self._should_use_proxy():
+      image = self._load_proxy_image_from_thumbnail(image_filepath)
+      if image is not None:
+        return image
+
+    image = pdb.gimp_file_load(
+      run_mode=Gimp.RunMode.NONINTERACTIVE,
+      file=Gio.file_new_for_path(image_filepath))
+
+    if image is not None and self._should_use_proxy():
+      self._scale_image_to_proxy_size(image, image.get_width())
+
+    return image
+
+  def _should_use_proxy(self):
+    return self._is_preview and self._proxy_size is not None
+
+  def _load_proxy_image_from_thumbnail(self, image_filepath):
+    file_format = file_formats_.FILE_FORMATS_DICT.get(
+      fileext.get_file_extension(image_filepath).lower())
+
+    if file_format is None or not file_format.has_thumbnail_import_proc():
+      return None
+
+    # Thumbnail loaders do not provide the resolution of the original image.
+    # Without it, procedures using physical units (e.g. inches) would give
+    # different results for the proxy than for the original image.
+    resolution_and_unit = _get_resolution_and_unit_from_metadata(image_filepath)
+    if resolution_and_unit is None:
+      return None
+
+    try:
+      result = pdb[file_format.get_thumbnail_import_procedure_name()](
+        file=Gio.file_new_for_path(image_filepath),
+        thumb_size=max(self._proxy_size))
+    except pg.PDBProcedureError:
+      return None
+
+    # Thumbnail loaders return the thumbnail and the size of the original image,
+    # followed by other values.
+    if not isinstance(result, list) or len(result) < 3 or result[0] is None:
+      return None
+
+    thumbnail_image, orig_width, orig_height = result[:3]
+
+    if not _is_thumbnail_usable_as_proxy(
+          thumbnail_image, orig_width, orig_height, self._proxy_size):
+      pg.pdbutils.try_delete_image(thumbnail_image)
+      return None
+
+    x_resolution, y_resolution, unit = resolution_and_unit
+    thumbnail_image.set_resolution(x_resolution, y_resolution)
+    thumbnail_image.set_unit(unit)
+
+    self._scale_image_to_proxy_size(thumbnail_image, orig_width)
+
+    return thumbnail_image
+
+  def _scale_image_to_proxy_size(self, image, orig_width):
+    width = image.get_width()
+    height = image.get_height()
+
+    scale_factor = _get_proxy_scale_factor(width, height, self._proxy_size)
+
+    if scale_factor < 1.0:
+      image.scale(max(round(width * scale_factor), 1), max(round(height * scale_factor), 1))
+
+    self._proxy_scale = image.get_width() / orig_width if orig_width > 0 else 1.0
+
   @staticmethod
   def _get_current_layer(image):
     if image is None or not image.is_valid():
@@ -1180,6 +2097,15 @@ def create_copy(self, image, layer):
     return image.duplicate(), None
 
   def _do_cleanup_contents(self, exception_occurred):
+    if self._prefetcher is not None:
+      self._prefetcher.stop()
+
+    if self._manifest is not None:
+      try:
+        self._manifest.save()
+      finally:
+        self._manifest = None
+
     super()._do_cleanup_contents(exception_occurred)
 
     if self._should_load_image:
@@ -1197,11 +2123,69 @@ class LayerBatcher(Batcher):
   within a copy of the original image. Each copy is automatically destroyed
   once the processing of the layer is done. To keep the image and layer
   copies, pass ``keep_image_copies=True`` to `__init__()` or `run()`.
+
+  Constraints read layer attributes (visibility, color tags, ...) from a
+  snapshot taken by the item tree (see
+  `pygimplib.itemtree.GimpItemTree.get_attributes()`). The snapshot is
+  discarded at the start of each run and, if ``edit_mode`` is ``True``, after
+  processing each layer.
   """
 
+  def __init__(self, *args, reuse_image_copies: bool = False, **kwargs):
+    self._reuse_image_copies = reuse_image_copies
+
+    self._scratch_image_pool = None
+
+    super().__init__(*args, **kwargs)
+
+  @property
+  def reuse_image_copies(self) -> bool:
+    """If ``True``, one copy of the original image is created and reused for
+    processing each layer instead of creating a new copy for each layer.
+
+    The copy is emptied after processing each layer. If procedures changed
+    image-level attributes of the copy (e.g. the image size), a new copy is
+    created for the next layer. See `scratch_images.ScratchImagePool` for
+    details.
+
+    Image copies are never reused if `edit_mode` or `keep_image_copies` is
+    ``True``.
+    """
+    return self._reuse_image_copies
+
+  @property
+  def scratch_image_stats(self) -> Optional[scratch_images.ScratchImageStats]:
+    """`scratch_images.ScratchImageStats` instance describing how many image
+    copies were avoided during the last call to `run()`, or ``None`` if image
+    copies were not reused.
+    """
+    if self._scratch_image_pool is not None:
+      return self._scratch_image_pool.stats
+    else:
+      return None
+
+  def _setup_contents(self):
+    super()._setup_contents()
+
+    if self._reuse_image_copies and not self._edit_mode and not self._keep_image_copies:
+      self._scratch_image_pool = scratch_images.ScratchImagePool()
+    else:
+      self._scratch_image_pool = None
+
+  def _do_cleanup_contents(self, exception_occurred):
+    if self._scratch_image_pool is not None:
+      self._scratch_image_pool.clear()
+
+    super()._do_cleanup_contents(exception_occurred)
+
   def _get_initial_current_image(self):
     return self._current_item.raw.get_image()
 
+  def _set_up_item_tree(self):
+    super()._set_up_item_tree()
+
+    self._item_tree.invalidate_attributes()
+
   def _get_initial_current_layer(self):
     return self._current_item.raw
 
@@ -1265,8 +2249,20 @@ def _add_default_export_procedure(self, action_groups):
       )
   
   def _process_item_with_actions(self):
-    if not self._edit_mode or self._is_preview:
-      image_copy, layer_copy = self.create_copy(self._current_image, self._current_layer)
+    scratch_image = None
+
+    if self._scratch_image_pool is not None:
+      scratch_image = self._scratch_image_pool.acquire(self._current_image)
+
+      self._current_layer = _copy_layer_to_image(self._current_layer, scratch_image)
+      self._current_image = scratch_image
+    elif not self._edit_mode or self._is_preview:
+      image_copy = self._restore_preview_snapshot()
+
+      if image_copy is not None:
+        layer_copy = _get_current_layer_in_snapshot(image_copy)
+      else:
+        image_copy, layer_copy = self.create_copy(self._current_image, self._current_layer)
 
       self._current_image = image_copy
       self._current_layer = layer_copy
@@ -1289,7 +2285,19 @@ def _process_item_with_actions(self):
       # This eliminates the " copy" suffix appended by GIMP after creating a copy.
       self._current_layer.set_name(orig_layer_name)
 
-    super()._process_item_with_actions()
+    try:
+      yield from super()._process_item_with_actions()
+    finally:
+      # The scratch image must be released even if processing the item was
+      # interrupted, otherwise a new image copy would be created for the next
+      # item.
+      if scratch_image is not None:
+        self._scratch_image_pool.release(scratch_image)
+
+    if self._edit_mode and not self._is_preview:
+      # Procedures may have modified the original layers or selected other
+      # layers.
+      self._item_tree.invalidate_attributes()
 
     self._current_image = None
     self._current_layer = None
@@ -1297,19 +2305,94 @@ def _process_item_with_actions(self):
   def create_copy(self, image, layer):
     image_copy = utils.create_empty_image_copy(image)
 
-    layer_copy = pg.pdbutils.copy_and_paste_layer(
-      layer,
-      image_copy,
-      None,
-      0,
-      True,
-      True,
-      True)
+    return image_copy, _copy_layer_to_image(layer, image_copy)
+
+
+def delete_preview_snapshot(snapshot: Tuple[Gimp.Image, float]):
+  """Deletes the image of a snapshot removed from `Batcher.preview_snapshots`.
+  """
+  pg.pdbutils.try_delete_image(snapshot[0])
+
+
+def _get_proxy_scale_factor(width, height, proxy_size):
+  if width <= 0 or height <= 0:
+    return 1.0
+
+  return min(proxy_size[0] / width, proxy_size[1] / height, 1.0)
+
+
+def _is_thumbnail_usable_as_proxy(thumbnail_image, orig_width, orig_height, proxy_size):
+  if orig_width <= 0 or orig_height <= 0:
+    return False
+
+  thumbnail_width = thumbnail_image.get_width()
+  thumbnail_height = thumbnail_image.get_height()
+
+  if thumbnail_width <= 0 or thumbnail_height <= 0:
+    return False
+
+  # Embedded thumbnails may be smaller than the proxy size or may not reflect
+  # the orientation of the image.
+  expected_width = orig_width * _get_proxy_scale_factor(orig_width, orig_height, proxy_size)
+  if thumbnail_width < round(expected_width):
+    return False
+
+  return abs(thumbnail_width / thumbnail_height - orig_width / orig_height) < 0.01
+
+
+def _get_resolution_and_unit_from_metadata(image_filepath):
+  try:
+    metadata = Gimp.Metadata.load_from_file(Gio.file_new_for_path(image_filepath))
+  except GLib.Error:
+    return None
+
+  if metadata is None:
+    return None
+
+  success, x_resolution, y_resolution, unit = metadata.get_resolution()
+
+  if not success or x_resolution <= 0 or y_resolution <= 0:
+    return None
+
+  return x_resolution, y_resolution, unit
+
+
+def _get_image_size_in_bytes(image):
+  # This is an estimate as the size of layers within group layers, channels or
+  # paths is not considered.
+  return sum(
+    layer.get_width() * layer.get_height() * layer.get_bpp() for layer in image.get_layers())
+
+
+def _get_current_layer_in_snapshot(image):
+  # The current layer is always selected after each procedure (see
+  # `_set_selected_and_current_layer()`), and image copies preserve selected
+  # layers.
+  selected_layers = image.get_selected_layers()
+  if selected_layers:
+    return selected_layers[0]
+
+  layers = image.get_layers()
+  if layers:
+    return layers[0]
+
+  return None
+
+
+def _copy_layer_to_image(layer, image):
+  layer_copy = pg.pdbutils.copy_and_paste_layer(
+    layer,
+    image,
+    None,
+    0,
+    True,
+    True,
+    True)
 
-    # This eliminates the " copy" suffix appended by GIMP after creating a layer copy.
-    layer_copy.set_name(layer.get_name())
+  # This eliminates the " copy" suffix appended by GIMP after creating a layer copy.
+  layer_copy.set_name(layer.get_name())
 
-    return image_copy, layer_copy
+  return layer_copy
 
 
 def _set_selected_and_current_layer(batcher):
@@ -0,0 +1,170 @@
+"""Moving exported files to their destination in a background thread."""
+
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from typing import Any, List, Tuple
+
+
+class BackgroundFileWriter:
+  """Class moving files from a local temporary folder to their final
+  destination in a background thread.
+
+  This allows exporting an image to a fast local disk and continuing with the
+  next image while the file is being written to (potentially slow) storage.
+
+  At most ``max_pending_files`` files may wait to be moved. If the limit is
+  reached, `submit()` blocks until a file is moved, limiting the disk space
+  occupied by temporary files.
+
+  Moved files (and their parent folders) are flushed to disk via ``fsync`` in
+  batches of ``fsync_batch_size`` files, or whenever there are no more files
+  waiting to be moved.
+
+  Errors are not raised immediately. Instead, they are collected along with
+  the context passed to `submit()` (e.g. the item name) and can be obtained
+  via `pop_errors()` or `finish()`.
+  """
+
+  _STOP = object()
+
+  def __init__(self, max_pending_files: int = 8, fsync_batch_size: int = 16):
+    self.max_pending_files = max_pending_files
+    self.fsync_batch_size = fsync_batch_size
+
+    self._queue = None
+    self._thread = None
+    self._temp_dirpath = None
+    self._temp_file_counter = 0
+
+    self._errors = []
+    self._errors_lock = threading.Lock()
+
+    self._files_to_sync = []
+
+  def start(self):
+    """Starts the background thread and creates a temporary folder to hold
+    files before moving them.
+
+    Calling this method if the thread is already running has no effect.
+    """
+    if self._thread is not None:
+      return
+
+    self._temp_dirpath = tempfile.mkdtemp(prefix='batcher_export_')
+    self._queue = queue.Queue(maxsize=max(self.max_pending_files, 1))
+
+    self._thread = threading.Thread(target=self._move_files, daemon=True)
+    self._thread.start()
+
+  def get_temp_filepath(self, filepath: str) -> str:
+    """Returns a unique file path in the temporary folder for the specified
+    destination file path.
+
+    The returned file path has the same file extension as ``filepath`` so
+    that the file format can be determined from it.
+    """
+    self._temp_file_counter += 1
+
+    return os.path.join(
+      self._temp_dirpath, f'{self._temp_file_counter}_{os.path.basename(filepath)}')
+
+  def submit(self, temp_filepath: str, filepath: str, context: Any = None):
+    """Schedules moving ``temp_filepath`` to ``filepath``.
+
+    If the maximum number of files waiting to be moved is reached, this method
+    blocks until a file is moved.
+
+    ``context`` is an arbitrary object returned along with the error if
+    moving the file fails.
+    """
+    self._queue.put((temp_filepath, filepath, context))
+
+  def pop_errors(self) -> List[Tuple[Any, Exception]]:
+    """Returns errors that occurred so far as a list of (context, exception)
+    pairs and clears them.
+    """
+    with self._errors_lock:
+      errors = self._errors
+      self._errors = []
+
+    return errors
+
+  def finish(self) -> List[Tuple[Any, Exception]]:
+    """Waits until all submitted files are moved and flushed to disk, stops the
+    background thread and removes the temporary folder.
+
+    Returns:
+      Errors that were not obtained via `pop_errors()` so far. See
+      `pop_errors()` for the format.
+    """
+    if self._thread is not None:
+      self._queue.put(self._STOP)
+      self._thread.join()
+      self._thread = None
+
+    if self._temp_dirpath is not None:
+      shutil.rmtree(self._temp_dirpath, ignore_errors=True)
+      self._temp_dirpath = None
+
+    return self.pop_errors()
+
+  def _move_files(self):
+    while True:
+      try:
+        entry = self._queue.get(block=not self._files_to_sync)
+      except queue.Empty:
+        # No more files are waiting, so this is a good time to flush the
+        # files moved so far.
+        self._sync_files()
+        continue
+
+      if entry is self._STOP:
+        self._sync_files()
+        return
+
+      temp_filepath, filepath, context = entry
+
+      try:
+        shutil.move(temp_filepath, filepath)
+      except Exception as e:
+        self._add_error(context, e)
+      else:
+        self._files_to_sync.append((filepath, context))
+
+      if len(self._files_to_sync) >= self.fsync_batch_size:
+        self._sync_files()
+
+  def _sync_files(self):
+    dirpaths = set()
+
+    for filepath, context in self._files_to_sync:
+      try:
+        _fsync(filepath, os.O_RDWR)
+      except Exception as e:
+        self._add_error(context, e)
+
+      dirpaths.add(os.path.dirname(filepath))
+
+    for dirpath in dirpaths:
+      try:
+        _fsync(dirpath, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+      except OSError:
+        # Some platforms (e.g. Windows) do not support syncing folders.
+        pass
+
+    self._files_to_sync = []
+
+  def _add_error(self, context, exception):
+    with self._errors_lock:
+      self._errors.append((context, exception))
+
+
+def _fsync(path: str, flags: int):
+  fd = os.open(path, flags)
+  try:
+    os.fsync(fd)
+  finally:
+    os.close(fd)
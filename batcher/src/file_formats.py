@@ -160,6 +160,23 @@ def get_description(self, import_or_export, max_char_length_for_inferred_descrip
   def has_import_proc(self):
     return self.import_procedure_name in pdb
 
+  def get_thumbnail_import_procedure_name(self):
+    """Returns the name of the procedure loading a scaled-down version of an
+    image, or ``None`` if the file format has no import procedure.
+
+    The procedure does not necessarily exist even if this method returns a
+    name.
+    """
+    if self.import_procedure_name is None:
+      return None
+
+    return f'{self.import_procedure_name}-thumb'
+
+  def has_thumbnail_import_proc(self):
+    thumbnail_import_procedure_name = self.get_thumbnail_import_procedure_name()
+
+    return thumbnail_import_procedure_name is not None and thumbnail_import_procedure_name in pdb
+
   def get_import_func(self):
     if self._import_func is None:
       return pdb[self.import_procedure_name]
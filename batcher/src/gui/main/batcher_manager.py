@@ -73,7 +73,11 @@ def run_batcher(
     finally:
       previews.unlock(self._PREVIEWS_BATCHER_RUN_KEY, update=False)
 
+      # The batcher modifies items shared with the name preview.
+      previews.name_preview.invalidate_processed_items()
+
       if mode == 'edit':
+        previews.image_preview.clear_cache()
         previews.image_preview.update()
         previews.name_preview.update()
 
@@ -229,6 +229,12 @@ class ExportOptionsDialog:
   _GRID_ROW_SPACING = 3
   _GRID_COLUMN_SPACING = 8
 
+  _INCREMENTAL_CONVERSION_SETTING_NAMES = [
+    'skip_unchanged',
+    'compare_file_contents',
+    'rebuild_manifest',
+  ]
+
   def __init__(self, settings, parent=None):
     self._settings = settings
     self._parent = parent
@@ -258,7 +264,7 @@ def _init_gui(self):
 
     self._settings['main/export'].initialize_gui(only_null=True)
 
-    for row_index, setting in enumerate(self._settings['main/export']):
+    for row_index, setting in enumerate(self._get_export_option_settings()):
       gui_utils_.attach_label_to_grid(
         self._grid_export_options, setting, row_index, set_name_as_tooltip=False)
       gui_utils_.attach_widget_to_grid(
@@ -289,6 +295,15 @@ def _init_gui(self):
   def widget(self):
     return self._dialog
 
+  def _get_export_option_settings(self):
+    settings = list(self._settings['main/export'])
+
+    for setting_name in self._INCREMENTAL_CONVERSION_SETTING_NAMES:
+      if setting_name in self._settings['main']:
+        settings.append(self._settings['main'][setting_name])
+
+    return settings
+
   def _on_export_options_dialog_close(self, _dialog):
     self._dialog.hide()
 
@@ -302,7 +317,8 @@ def _on_export_options_dialog_realize(self, _dialog):
       self._dialog.set_attached_to(pg.gui.get_toplevel_window(self._parent))
 
   def _on_export_options_dialog_button_reset_clicked(self, _button):
-    self._settings['main/export'].reset()
+    for setting in self._get_export_option_settings():
+      setting.reset()
 
 
 def apply_file_extension_gui_to_setting_if_valid(setting):
@@ -70,6 +70,8 @@ def __init__(
     else:
       run_gui_func(self, self._dialog, self._settings)
 
+    self._previews.image_preview.clear_cache()
+
   @property
   def name_preview(self):
     return self._previews.name_preview
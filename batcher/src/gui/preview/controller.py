@@ -182,6 +182,8 @@ def _update_previews_on_setting_change(self, setting, action):
         and setting.name != 'enabled_for_previews'):
       return
 
+    self._image_preview.invalidate_preview_settings()
+
     self.unlock_previews(self._PREVIEW_ERROR_KEY)
 
   def _connect_setting_show_original_item_names_changed_in_name_preview(self):
@@ -346,6 +348,12 @@ def _perform_full_preview_update(self):
     pg.invocation.timeout_remove(self._update_image_preview)
     pg.invocation.timeout_remove(self._image_preview.update)
 
+    # Images could have been modified in GIMP while the plug-in window was not
+    # focused. Previews of image files are kept as their cache keys account for
+    # file modifications.
+    if not isinstance(self._name_preview.batcher.item_tree, pg.itemtree.ImageFileTree):
+      self._image_preview.clear_cache()
+
     self._name_preview.update(full_update=True)
 
     self._update_tagged_items()
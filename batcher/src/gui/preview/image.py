@@ -1,7 +1,9 @@
 """Preview widget displaying a scaled-down image to be processed."""
 
+import os
 import time
 import traceback
+from typing import Optional
 
 import gi
 gi.require_version('Gdk', '3.0')
@@ -24,7 +26,9 @@
 from . import base as preview_base_
 
 from src import builtin_procedures
+from src import core
 from src import exceptions
+from src import preview_cache as preview_cache_
 from src import utils as utils_
 from src.gui import messages as messages_
 
@@ -32,6 +36,25 @@
 class ImagePreview(preview_base_.Preview):
   """Widget displaying a preview of an image to be processed, including its
   name.
+
+  Rendered previews are cached so that displaying an item again (e.g. when
+  switching between items) does not require processing the item again as
+  long as the procedures and constraints applied to previews remain
+  unchanged. Call `invalidate_preview_settings()` when procedures or
+  constraints change and `clear_cache()` when the previewed images may have
+  been modified.
+
+  Additionally, copies of the previewed image are kept after applying each
+  procedure (see `core.Batcher.preview_snapshots`). If a procedure changes,
+  only that procedure and the procedures following it are applied again.
+
+  For image files and GIMP images (see `core.ImageBatcher`), a scaled-down
+  version of the image no larger than the preview widget is processed first
+  (see `core.ImageBatcher.proxy_size`). Once the user stops interacting with
+  the preview for a moment, the image is processed again at full resolution
+  ("refined") and the preview is replaced. Refining runs when the GTK main
+  loop is idle and is canceled if the preview is updated again before the
+  refined preview is displayed.
   
   Signals:
   
@@ -46,6 +69,8 @@ class ImagePreview(preview_base_.Preview):
     * update_duration_seconds: Duration of the update in seconds as a float.
       The duration only considers the update of the image contents (i.e. does
       not consider the duration of updating the label of the image name).
+
+    The signal is not emitted when the preview is refined at full resolution.
   """
   
   __gsignals__ = {
@@ -58,8 +83,15 @@ class ImagePreview(preview_base_.Preview):
   _WIDGET_SPACING = 5
   _HBOX_SPACING = 4
   _ARROW_ICON_PIXEL_SIZE = 12
+
+  _MAX_PREVIEW_CACHE_SIZE_BYTES = 64 * 1024 * 1024
+  _MAX_PREVIEW_SNAPSHOTS_SIZE_BYTES = 512 * 1024 * 1024
+
+  _REFINE_DELAY_MILLISECONDS = 750
+  _REFINE_TIME_BUDGET_MILLISECONDS = 25
+  _PROXY_PREVIEW_CACHE_KEY = 'proxy'
   
-  def __init__(self, batcher, settings):
+  def __init__(self, batcher, settings, max_preview_snapshots_size_bytes=None):
     super().__init__()
     
     self._batcher = batcher
@@ -77,6 +109,15 @@ def __init__(self, batcher, settings):
 
     self._set_update_duration_action_id = None
     self._update_duration_seconds = 0.0
+
+    self._preview_cache = preview_cache_.PreviewCache(self._MAX_PREVIEW_CACHE_SIZE_BYTES)
+    self._preview_settings_hash = None
+
+    if max_preview_snapshots_size_bytes is None:
+      max_preview_snapshots_size_bytes = self._MAX_PREVIEW_SNAPSHOTS_SIZE_BYTES
+
+    self._preview_snapshots = preview_cache_.PreviewCache(
+      max_preview_snapshots_size_bytes, remove_func=core.delete_preview_snapshot)
     
     self._init_gui()
 
@@ -105,6 +146,29 @@ def item(self, value):
   @property
   def menu_item_update_automatically(self):
     return self._menu_item_update_automatically
+
+  def invalidate_preview_settings(self):
+    """Indicates that procedures or constraints applied to previews changed.
+
+    Cached previews rendered with the previous procedures and constraints are
+    not displayed until the same procedures and constraints are applied
+    again.
+    """
+    self._cancel_refine()
+
+    self._preview_settings_hash = None
+
+  def clear_cache(self):
+    """Removes all cached previews and deletes image copies kept after applying
+    each procedure.
+
+    This should be called if the previewed images may have been modified
+    outside the preview, e.g. in GIMP, and before the plug-in terminates.
+    """
+    self._cancel_refine()
+
+    self._preview_cache.clear()
+    self._preview_snapshots.clear()
   
   def update(self):
     update_locked = super().update()
@@ -130,6 +194,8 @@ def update(self):
       self.set_item_name_label(self.item)
   
   def clear(self, use_item_name=False, error=None):
+    self._cancel_refine()
+
     self.item = None
 
     self._set_pixbuf(self._no_selection_icon)
@@ -182,10 +248,27 @@ def _set_contents(self):
     if self.item is None:
       return
 
+    self._cancel_refine()
+
     self._update_duration_seconds = 0.0
 
-    with pg.pdbutils.redirect_messages():
-      self._preview_pixbuf, error, display_error_message_as_label = self._get_in_memory_preview()
+    preview_cache_key = self._get_preview_cache_key()
+    cached_preview_pixbuf = self._get_cached_preview(preview_cache_key)
+
+    if cached_preview_pixbuf is not None:
+      self._preview_pixbuf = cached_preview_pixbuf
+      error = None
+      display_error_message_as_label = False
+    elif self._should_use_proxy():
+      self._preview_pixbuf, error, display_error_message_as_label = (
+        self._get_proxy_preview(preview_cache_key))
+    else:
+      with pg.pdbutils.redirect_messages():
+        self._preview_pixbuf, error, display_error_message_as_label = (
+          self._get_in_memory_preview())
+
+      if self._preview_pixbuf is not None and error is None:
+        self._add_to_preview_cache(preview_cache_key, self._preview_pixbuf)
     
     if self._preview_pixbuf is not None:
       self._preview_pixbuf_to_draw = self._preview_pixbuf
@@ -200,6 +283,123 @@ def _set_contents(self):
 
     self.emit('preview-updated', error, self._update_duration_seconds)
   
+  def _should_use_proxy(self):
+    return isinstance(self._batcher, core.ImageBatcher)
+
+  def _get_proxy_preview(self, preview_cache_key):
+    if preview_cache_key is not None:
+      proxy_preview_cache_key = (*preview_cache_key, self._PROXY_PREVIEW_CACHE_KEY)
+    else:
+      proxy_preview_cache_key = None
+
+    cached_proxy_preview_pixbuf = self._get_cached_preview(proxy_preview_cache_key)
+    if cached_proxy_preview_pixbuf is not None:
+      self._schedule_refine(preview_cache_key)
+      return cached_proxy_preview_pixbuf, None, False
+
+    preview_widget_allocation = self._preview_image.get_allocation()
+
+    with pg.pdbutils.redirect_messages():
+      preview_pixbuf, error, display_error_message_as_label = self._get_in_memory_preview(
+        proxy_size=(preview_widget_allocation.width, preview_widget_allocation.height))
+
+    if preview_pixbuf is not None and error is None:
+      if self._batcher.proxy_scale < 1.0:
+        self._add_to_preview_cache(proxy_preview_cache_key, preview_pixbuf)
+        self._schedule_refine(preview_cache_key)
+      else:
+        # The image is not larger than the preview, hence the proxy is identical
+        # to the full-resolution image.
+        self._add_to_preview_cache(preview_cache_key, preview_pixbuf)
+
+    return preview_pixbuf, error, display_error_message_as_label
+
+  def _schedule_refine(self, preview_cache_key):
+    pg.invocation.timeout_add_strict(
+      self._REFINE_DELAY_MILLISECONDS, self._start_refine, preview_cache_key)
+
+  def _cancel_refine(self):
+    pg.invocation.timeout_remove(self._start_refine)
+    pg.invocation.idle_remove_sliced(self._refine_contents)
+
+  def _start_refine(self, preview_cache_key):
+    if (self.item is None
+        or self._is_updating
+        or not self._is_refine_allowed()
+        or preview_cache_key != self._get_preview_cache_key()):
+      return False
+
+    pg.invocation.idle_add_sliced(
+      self._refine_contents,
+      self._refine_contents(preview_cache_key),
+      self._REFINE_TIME_BUDGET_MILLISECONDS)
+
+    return False
+
+  def _refine_contents(self, preview_cache_key):
+    # The full-resolution image is processed one procedure at a time so that
+    # the GUI remains responsive and the refinement can be canceled between
+    # procedures.
+    image_preview_steps = self._get_image_preview_in_steps(yield_after_procedures=True)
+
+    try:
+      while True:
+        with pg.pdbutils.redirect_messages():
+          try:
+            next(image_preview_steps)
+          except StopIteration as e:
+            image_copies, error, _display_error_message_as_label = e.value
+            break
+
+        yield
+    except GeneratorExit:
+      image_preview_steps.close()
+      raise
+
+    try:
+      # Rendering the preview of a large image takes time. This allows
+      # canceling the refinement if the preview is updated in the meantime.
+      yield
+    except GeneratorExit:
+      self._delete_image_copies(image_copies)
+      raise
+
+    if self.item is None or preview_cache_key != self._get_preview_cache_key():
+      # The item or its settings changed while processing procedures.
+      self._delete_image_copies(image_copies)
+      return
+
+    preview_pixbuf = self._render_preview(image_copies)
+
+    if preview_pixbuf is not None and error is None:
+      self._add_to_preview_cache(preview_cache_key, preview_pixbuf)
+
+      self._preview_pixbuf = preview_pixbuf
+      self._preview_pixbuf_to_draw = preview_pixbuf
+      self._previous_preview_pixbuf_width = None
+      self._previous_preview_pixbuf_height = None
+      self._preview_image.queue_draw()
+
+  def lock_update(self, lock: bool, key: Optional[str] = None):
+    super().lock_update(lock, key=key)
+
+    if not self._is_refine_allowed():
+      self._cancel_refine()
+
+  def _is_refine_allowed(self):
+    # Refining is still allowed if the preview was updated manually.
+    return not self._update_locked or self._lock_keys == {self._MANUAL_UPDATE_LOCK}
+
+  def _get_cached_preview(self, preview_cache_key):
+    if preview_cache_key is not None:
+      return self._preview_cache.get(preview_cache_key)
+    else:
+      return None
+
+  def _add_to_preview_cache(self, preview_cache_key, preview_pixbuf):
+    if preview_cache_key is not None:
+      self._preview_cache.add(preview_cache_key, preview_pixbuf, preview_pixbuf.get_byte_length())
+
   def _init_gui(self):
     self.set_orientation(Gtk.Orientation.VERTICAL)
 
@@ -263,7 +463,7 @@ def _init_gui(self):
     self._set_pixbuf(self._no_selection_icon)
     self._set_no_selection_label()
   
-  def _get_in_memory_preview(self):
+  def _get_in_memory_preview(self, proxy_size=None):
     start_update_time = time.time()
 
     self._batcher.remove_action(
@@ -271,36 +471,75 @@ def _get_in_memory_preview(self):
     self._set_update_duration_action_id = self._batcher.add_procedure(
       self._set_update_duration, ['cleanup_contents'], [start_update_time], ignore_if_exists=True)
 
-    image_copies, error, display_error_message_as_label = self._get_image_preview()
+    image_copies, error, display_error_message_as_label = self._get_image_preview(proxy_size)
+
+    return self._render_preview(image_copies), error, display_error_message_as_label
 
+  def _render_preview(self, image_copies):
     if not image_copies:
-      return None, error, display_error_message_as_label
+      return None
 
     image_preview = image_copies[0]
 
     if image_preview is None or not image_preview.is_valid():
-      return None, error, display_error_message_as_label
+      return None
 
     image_layers = image_preview.get_layers()
 
     if not image_layers:
       pg.pdbutils.try_delete_image(image_preview)
-      return None, error, display_error_message_as_label
+      return None
 
     preview_width, preview_height = self._get_preview_size(
       image_preview.get_width(), image_preview.get_height())
 
     preview_pixbuf = self._get_preview_pixbuf(image_preview, preview_width, preview_height)
 
+    self._delete_image_copies(image_copies)
+    
+    return preview_pixbuf
+
+  @staticmethod
+  def _delete_image_copies(image_copies):
     for image in image_copies:
       pg.pdbutils.try_delete_image(image)
-    
-    return preview_pixbuf, error, display_error_message_as_label
+
+  def _get_preview_cache_key(self):
+    if isinstance(self.item, pg.itemtree.ImageFileItem):
+      try:
+        modification_time = os.path.getmtime(self.item.id)
+      except OSError:
+        return None
+    else:
+      modification_time = None
+
+    if self._preview_settings_hash is None:
+      self._preview_settings_hash = utils_.get_preview_settings_hash(self._settings['main'])
+
+    preview_widget_allocation = self._preview_image.get_allocation()
+
+    return (
+      self.item.key,
+      modification_time,
+      self._batcher.edit_mode,
+      self._preview_settings_hash,
+      preview_widget_allocation.width,
+      preview_widget_allocation.height,
+    )
 
   def _set_update_duration(self, _batcher, start_update_time):
     self._update_duration_seconds = time.time() - start_update_time
 
-  def _get_image_preview(self):
+  def _get_image_preview(self, proxy_size=None):
+    image_preview_steps = self._get_image_preview_in_steps(proxy_size=proxy_size)
+
+    while True:
+      try:
+        next(image_preview_steps)
+      except StopIteration as e:
+        return e.value
+
+  def _get_image_preview_in_steps(self, proxy_size=None, yield_after_procedures=False):
     # We use a separate `pygimplib.ItemTree` with just the item to be previewed.
     # A new item wrapping the original object is created to avoid introducing
     # any changes to the item from other sources (e.g. the item could be
@@ -311,16 +550,25 @@ def _get_image_preview(self):
     error = None
     display_error_message_as_label = False
 
+    batcher_kwargs = utils_.get_settings_for_batcher(self._settings['main'])
+    if self._should_use_proxy():
+      batcher_kwargs['proxy_size'] = proxy_size
+
+    batcher_steps = self._batcher.run_in_steps(
+      yield_after_procedures=yield_after_procedures,
+      item_tree=tree_for_preview,
+      refresh_item_tree=False,
+      keep_image_copies=True,
+      preview_snapshots=self._preview_snapshots,
+      is_preview=True,
+      process_contents=True,
+      process_names=False,
+      process_export=False,
+      **batcher_kwargs)
+
     try:
-      self._batcher.run(
-        item_tree=tree_for_preview,
-        refresh_item_tree=False,
-        keep_image_copies=True,
-        is_preview=True,
-        process_contents=True,
-        process_names=False,
-        process_export=False,
-        **utils_.get_settings_for_batcher(self._settings['main']))
+      for _unused in batcher_steps:
+        yield
     except exceptions.BatcherCancelError:
       pass
     except exceptions.BatcherFileLoadError as e:
@@ -342,6 +590,9 @@ def _get_image_preview(self):
         parent=pg.gui.get_toplevel_window(self))
       
       error = e
+    finally:
+      # This stops the processing if this generator is closed prematurely.
+      batcher_steps.close()
 
     return self._batcher.image_copies, error, display_error_message_as_label
 
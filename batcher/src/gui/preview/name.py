@@ -1,7 +1,7 @@
 """Preview widget displaying the names of items to be batch-processed."""
 
 from collections.abc import Iterable
-from typing import Set
+from typing import Optional, Set
 
 import collections
 import traceback
@@ -27,6 +27,18 @@
 class NamePreview(preview_base_.Preview):
   """A widget displaying a preview of batch-processed items - names and their
   folder structure.
+
+  Items are processed again only if settings affecting item names or the
+  items matching constraints changed (see
+  `utils.get_name_preview_settings_hash()`), or if items were added or
+  removed. Results of constraints are reused across updates (see
+  `core.Batcher.reuse_constraint_results`). Only rows of items that were
+  added, removed, moved or renamed are updated in the tree view.
+
+  Items are processed in time-limited slices whenever the GTK main loop is
+  idle so that the GUI remains responsive for a large number of items.
+  Displayed names are updated as items are processed. An update in progress
+  is canceled if `update()` is called again.
   
   Signals:
   
@@ -64,6 +76,10 @@ class NamePreview(preview_base_.Preview):
     [4, GObject.TYPE_STRING],
     [5, GObject.TYPE_PYOBJECT])
 
+  _ITEM_CHANGES = _ITEM_INSERTED, _ITEM_REINSERTED, _ITEM_MOVED, _ITEM_RENAMED = (0, 1, 2, 3)
+
+  _UPDATE_TIME_BUDGET_MILLISECONDS = 25
+
   _ICON_XPAD = 2
   _COLOR_TAG_BORDER_WIDTH = 1
   _COLOR_TAG_BORDER_COLOR = 0xdcdcdcff
@@ -92,6 +108,13 @@ def __init__(
     # key: `Item.key`
     # value: `Gtk.TreeIter` instance
     self._tree_iters = collections.defaultdict(pg.utils.return_none_func)
+
+    self._processed_settings_hash = None
+    self._processed_item_tree_version = None
+
+    # Items, previous items and parents displayed in the tree view, as returned
+    # by `_get_items()`.
+    self._displayed_items_parents_and_previous = ({}, {}, {})
     
     self._row_expand_collapse_interactive = True
     self._clearing_preview = False
@@ -119,7 +142,12 @@ def update(self, full_update=False):
     """Updates the preview (add/remove item, move item to a different parent
     group, etc.).
 
-    If an exception was captured during the update, the method is terminated
+    The first slice of the update is performed before this method returns (see
+    the class description). If the preview contains no items, the update is
+    performed completely so that the selection can be restored. The
+    ``'preview-updated'`` signal is emitted once the update finishes.
+
+    If an exception was captured during the update, the update is terminated
     prematurely. It is the responsibility of the caller to handle the error
     (e.g. lock or clear the preview).
 
@@ -130,29 +158,48 @@ def update(self, full_update=False):
     if update_locked:
       return
 
-    existing_items_parents_and_previous = self._get_items()
+    pg.invocation.idle_remove_sliced(self._update)
 
-    error = self._process_items(full_update)
+    update_job = self._update(full_update)
 
-    if error:
-      self.emit('preview-updated', error)
-      return
-
-    self._sync_new_items_with_tree_view(existing_items_parents_and_previous)
+    if self._tree_iters:
+      pg.invocation.idle_add_sliced(
+        self._update,
+        update_job,
+        self._UPDATE_TIME_BUDGET_MILLISECONDS,
+        first_slice_immediately=True)
+    else:
+      for _unused in update_job:
+        pass
 
-    self._set_expanded_items()
+  def cancel_update(self):
+    """Cancels an update started by `update()` if it did not finish yet.
 
-    self._set_selection()
+    Items will be processed again on the next `update()`.
+    """
+    pg.invocation.idle_remove_sliced(self._update)
 
-    self._tree_view.columns_autosize()
+  def lock_update(self, lock: bool, key: Optional[str] = None):
+    super().lock_update(lock, key=key)
 
-    self.emit('preview-updated', None)
+    if self._update_locked:
+      self.cancel_update()
   
+  def invalidate_processed_items(self):
+    """Indicates that items must be processed again on the next `update()` even
+    if no settings changed, e.g. after the items were modified by processing.
+    """
+    self._processed_settings_hash = None
+    self._batcher.clear_constraint_results()
+
   def clear(self):
     """Clears the entire preview."""
+    self.cancel_update()
+
     self._clearing_preview = True
     self._tree_model.clear()
     self._tree_iters.clear()
+    self._displayed_items_parents_and_previous = ({}, {}, {})
     self._clearing_preview = False
 
   def set_sensitive(self, sensitive):
@@ -359,6 +406,40 @@ def _get_keys_from_current_selection(self):
   def _get_key_from_tree_iter(self, tree_iter):
     return self._tree_model.get_value(tree_iter, column=self._COLUMN_ITEM_KEY[0])
   
+  def _update(self, full_update):
+    settings_hash = utils_.get_name_preview_settings_hash(self._settings['main'])
+
+    if (full_update
+        or settings_hash != self._processed_settings_hash
+        or self._batcher.item_tree.version != self._processed_item_tree_version):
+      self._processed_settings_hash = None
+
+      error = yield from self._process_items(full_update)
+
+      if error:
+        self.emit('preview-updated', error)
+        return
+
+      self._processed_settings_hash = settings_hash
+      self._processed_item_tree_version = self._batcher.item_tree.version
+
+    new_items_parents_and_previous = self._get_items()
+
+    items_diff = self._get_items_diff(
+      self._displayed_items_parents_and_previous, new_items_parents_and_previous)
+
+    self._sync_new_items_with_tree_view(items_diff)
+
+    self._displayed_items_parents_and_previous = new_items_parents_and_previous
+
+    self._set_expanded_items()
+
+    self._set_selection()
+
+    self._tree_view.columns_autosize()
+
+    self.emit('preview-updated', None)
+
   def _process_items(self, full_update=False):
     # We need to reset item attributes explicitly before processing as some
     # items will not be refreshed (removed and re-added) by the tree.
@@ -369,14 +450,24 @@ def _process_items(self, full_update=False):
 
     error = None
 
+    batcher_steps = self._batcher.run_in_steps(
+      refresh_item_tree=full_update,
+      is_preview=True,
+      process_contents=False,
+      process_names=True,
+      process_export=False,
+      reuse_constraint_results=True,
+      **utils_.get_settings_for_batcher(self._settings['main']))
+
     try:
-      self._batcher.run(
-        refresh_item_tree=full_update,
-        is_preview=True,
-        process_contents=False,
-        process_names=True,
-        process_export=False,
-        **utils_.get_settings_for_batcher(self._settings['main']))
+      for item in batcher_steps:
+        # Items are inserted, moved or removed only after all items are
+        # processed. Until then, we only update names of displayed items.
+        if (self._tree_iters.get(item.key) is not None
+            and self._get_item_name(item) != self._get_displayed_item_name(item.key)):
+          self._update_item(item)
+
+        yield
     except exceptions.BatcherCancelError:
       pass
     except exceptions.ActionError as e:
@@ -395,6 +486,8 @@ def _process_items(self, full_update=False):
         parent=pg.gui.get_toplevel_window(self))
       
       error = e
+    finally:
+      batcher_steps.close()
     
     return error
 
@@ -431,11 +524,21 @@ def _get_items(self):
 
     return items, previous_items, parents
 
-  def _sync_new_items_with_tree_view(self, existing_items_parents_and_previous):
+  def _get_items_diff(self, existing_items_parents_and_previous, new_items_parents_and_previous):
+    """Returns changes to apply to the tree view to display new items in place
+    of existing items.
+
+    The changes are returned as a tuple of:
+    * a list of (item, previous item, change) tuples in the order of new items,
+      where change is one of the ``_ITEM_*`` constants. Items whose position and
+      name did not change are omitted.
+    * a list of keys of existing items to remove, children before parents.
+    """
     existing_items, previous_existing_items, existing_parents = existing_items_parents_and_previous
-    new_items, previous_new_items, new_parents = self._get_items()
+    new_items, previous_new_items, new_parents = new_items_parents_and_previous
 
-    parents_to_remove = {}
+    item_changes = []
+    reinserted_folder_keys = set()
 
     for new_item_key, new_item in new_items.items():
       previous_new_item = previous_new_items[new_item_key]
@@ -450,25 +553,14 @@ def _sync_new_items_with_tree_view(self, existing_items_parents_and_previous):
           or (
             new_parent is not None
             and existing_parent is not None
-            and new_parent.key not in parents_to_remove
+            and new_parent.key not in reinserted_folder_keys
             and new_parent.key == existing_parent.key))
 
         if not parents_are_equal:
-          # We cannot use `Gtk.TreeStore.move_after()` here as that method only
-          # works within the same parent. Hence, we remove and insert the
-          # item under a new parent.
-
-          if new_item.type != pg.itemtree.TYPE_FOLDER:
-            self._remove_item_by_key(new_item_key)
-          else:
-            # We cannot remove a parent from the `Gtk.TreeStore` at this
-            # point as all child `Gtk.TreeIter`s would be removed as well. We
-            # remove all obsoleted parents at tne end.
-            parent_iter = self._tree_iters.pop(new_item_key, None)
-            if parent_iter is not None:
-              parents_to_remove[new_item_key] = parent_iter
-
-          self._insert_item(new_item, previous_new_item)
+          if new_item.type == pg.itemtree.TYPE_FOLDER:
+            reinserted_folder_keys.add(new_item_key)
+
+          item_changes.append((new_item, previous_new_item, self._ITEM_REINSERTED))
         else:
           previous_items_are_equal = (
             (previous_new_item is None and previous_existing_item is None)
@@ -478,22 +570,51 @@ def _sync_new_items_with_tree_view(self, existing_items_parents_and_previous):
               and previous_new_item.key == previous_existing_item.key))
 
           if not previous_items_are_equal:
-            self._move_item(new_item, previous_new_item)
-            self._update_item(new_item)
-          else:
-            self._update_item(new_item)
-
-        del existing_items[new_item_key]
+            item_changes.append((new_item, previous_new_item, self._ITEM_MOVED))
+          elif self._get_item_name(new_item) != self._get_displayed_item_name(new_item_key):
+            item_changes.append((new_item, previous_new_item, self._ITEM_RENAMED))
       else:
-        self._insert_item(new_item, previous_new_item)
+        item_changes.append((new_item, previous_new_item, self._ITEM_INSERTED))
+
+    # Children must be removed before their parents to avoid crashes (accessing
+    # child `Gtk.TreeIter`s that no longer exist), hence the reversed order.
+    item_keys_to_remove = [
+      item_key for item_key in reversed(existing_items) if item_key not in new_items]
+
+    return item_changes, item_keys_to_remove
+
+  def _sync_new_items_with_tree_view(self, items_diff):
+    item_changes, item_keys_to_remove = items_diff
 
-        if new_item_key in existing_items:
-          del existing_items[new_item_key]
+    parents_to_remove = {}
+
+    for item, previous_item, change in item_changes:
+      if change == self._ITEM_REINSERTED:
+        # We cannot use `Gtk.TreeStore.move_after()` here as that method only
+        # works within the same parent. Hence, we remove and insert the
+        # item under a new parent.
+
+        if item.type != pg.itemtree.TYPE_FOLDER:
+          self._remove_item_by_key(item.key)
+        else:
+          # We cannot remove a parent from the `Gtk.TreeStore` at this
+          # point as all child `Gtk.TreeIter`s would be removed as well. We
+          # remove all obsoleted parents at tne end.
+          parent_iter = self._tree_iters.pop(item.key, None)
+          if parent_iter is not None:
+            parents_to_remove[item.key] = parent_iter
+
+        self._insert_item(item, previous_item)
+      elif change == self._ITEM_MOVED:
+        self._move_item(item, previous_item)
+        self._update_item(item)
+      elif change == self._ITEM_RENAMED:
+        self._update_item(item)
+      else:
+        self._insert_item(item, previous_item)
 
-    # We need to delete children first to avoid crashes (accessing child
-    # `Gtk.TreeIter`s that no longer exist), hence the reversed iteration.
-    for no_longer_existing_item_key in reversed(existing_items):
-      self._remove_item_by_key(no_longer_existing_item_key)
+    for item_key in item_keys_to_remove:
+      self._remove_item_by_key(item_key)
 
     for tree_iter in reversed(parents_to_remove.values()):
       self._remove_item_by_iter(tree_iter)
@@ -595,6 +716,9 @@ def _get_item_name(self, item):
     else:
       return item.orig_name
 
+  def _get_displayed_item_name(self, item_key):
+    return self._tree_model.get_value(self._tree_iters[item_key], self._COLUMN_ITEM_NAME[0])
+
   def _update_item(self, item):
     self._tree_model.set_value(
       self._tree_iters[item.key],
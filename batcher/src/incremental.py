@@ -0,0 +1,204 @@
+"""Skipping conversion of input files unchanged since the last run.
+
+A manifest stored in the output folder records, for each converted input file,
+its size, modification time, an optional hash of its contents, a hash of the
+settings used for the conversion and the path of the produced output file. On
+subsequent runs, input files whose manifest entry still matches can be skipped
+without being loaded.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+
+MANIFEST_FILENAME = '.batcher_manifest.json'
+
+MANIFEST_TYPE = 'batcher_conversion_manifest'
+
+_ENCODING = 'utf-8'
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def get_settings_hash(settings: Any) -> str:
+  """Returns a hash of ``settings`` as a hexadecimal string.
+
+  ``settings`` can be any object composed of values serializable to JSON.
+  Values of other types are converted to strings.
+  """
+  settings_str = json.dumps(settings, sort_keys=True, default=str)
+
+  return hashlib.sha256(settings_str.encode(_ENCODING)).hexdigest()
+
+
+def get_file_hash(filepath: str) -> str:
+  """Returns a hash of the contents of the file at ``filepath`` as a
+  hexadecimal string.
+  """
+  file_hash = hashlib.sha256()
+
+  with open(filepath, 'rb') as file_:
+    while True:
+      chunk = file_.read(_HASH_CHUNK_SIZE)
+      if not chunk:
+        break
+
+      file_hash.update(chunk)
+
+  return file_hash.hexdigest()
+
+
+class ConversionManifest:
+  """Class storing information about input files converted to an output folder.
+
+  The manifest is stored as a JSON file named `MANIFEST_FILENAME` in
+  ``output_dirpath``. Each entry is keyed by the input file path and contains:
+  * ``size`` - file size in bytes,
+  * ``mtime_ns`` - modification time in nanoseconds,
+  * ``hash`` - hash of the file contents if ``use_content_hash`` is ``True``,
+    ``None`` otherwise,
+  * ``settings_hash`` - hash of the settings used for the conversion (see
+    `get_settings_hash()`),
+  * ``output_path`` - path of the output file relative to ``output_dirpath``.
+
+  If ``use_content_hash`` is ``True``, an input file is considered unchanged if
+  its contents did not change, even if its modification time did (e.g. when
+  the file was copied). This requires reading each input file in full.
+  """
+
+  def __init__(self, output_dirpath: str, use_content_hash: bool = False):
+    self._output_dirpath = output_dirpath
+    self._use_content_hash = use_content_hash
+
+    self._entries = {}
+
+  @property
+  def output_dirpath(self) -> str:
+    """Folder containing output files and the manifest file."""
+    return self._output_dirpath
+
+  @property
+  def filepath(self) -> str:
+    """Path to the manifest file."""
+    return os.path.join(self._output_dirpath, MANIFEST_FILENAME)
+
+  @property
+  def use_content_hash(self) -> bool:
+    """If ``True``, hashes of file contents are used to detect changed files."""
+    return self._use_content_hash
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def get_entry(self, input_filepath: str) -> Optional[Dict[str, Any]]:
+    """Returns the entry for ``input_filepath``, or ``None`` if there is no such
+    entry.
+    """
+    return self._entries.get(input_filepath)
+
+  def load(self) -> bool:
+    """Loads entries from the manifest file.
+
+    If the file does not exist or is not a valid manifest, the manifest is
+    left empty.
+
+    Returns:
+      ``True`` if the manifest file was loaded successfully, ``False``
+      otherwise.
+    """
+    self._entries = {}
+
+    try:
+      with open(self.filepath, 'r', encoding=_ENCODING) as file_:
+        contents = json.load(file_)
+    except (OSError, ValueError):
+      return False
+
+    if (not isinstance(contents, dict)
+        or contents.get('type') != MANIFEST_TYPE
+        or not isinstance(contents.get('entries'), dict)):
+      return False
+
+    self._entries = contents['entries']
+
+    return True
+
+  def save(self):
+    """Saves entries to the manifest file.
+
+    The file is first written to a temporary file and then renamed, so that an
+    interrupted save does not leave a corrupt manifest behind.
+    """
+    os.makedirs(self._output_dirpath, exist_ok=True)
+
+    contents = json.dumps({'type': MANIFEST_TYPE, 'entries': self._entries}, indent=1)
+
+    temp_filepath = f'{self.filepath}.tmp'
+
+    with open(temp_filepath, 'w', encoding=_ENCODING) as file_:
+      file_.write(contents)
+
+    os.replace(temp_filepath, self.filepath)
+
+  def clear(self):
+    """Removes all entries, forcing all input files to be converted again."""
+    self._entries = {}
+
+  def is_unchanged(self, input_filepath: str, settings_hash: str) -> bool:
+    """Returns ``True`` if ``input_filepath`` was converted with the same
+    settings before, the file did not change since then and the output file
+    still exists.
+    """
+    entry = self._entries.get(input_filepath)
+    if entry is None or entry.get('settings_hash') != settings_hash:
+      return False
+
+    output_path = entry.get('output_path')
+    if not output_path or not os.path.isfile(os.path.join(self._output_dirpath, output_path)):
+      return False
+
+    try:
+      file_stat = os.stat(input_filepath)
+    except OSError:
+      return False
+
+    if file_stat.st_size != entry.get('size'):
+      return False
+
+    if file_stat.st_mtime_ns == entry.get('mtime_ns'):
+      return True
+
+    if self._use_content_hash and entry.get('hash') is not None:
+      try:
+        return get_file_hash(input_filepath) == entry['hash']
+      except OSError:
+        return False
+
+    return False
+
+  def update(self, input_filepath: str, settings_hash: str, output_filepath: str):
+    """Adds or replaces the entry for ``input_filepath``.
+
+    ``output_filepath`` is the path of the produced output file, either
+    absolute or relative to `output_dirpath`.
+
+    If ``input_filepath`` cannot be accessed, the entry is removed instead.
+    """
+    try:
+      file_stat = os.stat(input_filepath)
+      file_hash = get_file_hash(input_filepath) if self._use_content_hash else None
+    except OSError:
+      self._entries.pop(input_filepath, None)
+      return
+
+    if os.path.isabs(output_filepath):
+      output_filepath = os.path.relpath(output_filepath, self._output_dirpath)
+
+    self._entries[input_filepath] = {
+      'size': file_stat.st_size,
+      'mtime_ns': file_stat.st_mtime_ns,
+      'hash': file_hash,
+      'settings_hash': settings_hash,
+      'output_path': output_filepath,
+    }
@@ -6,7 +6,7 @@
 from collections.abc import Iterable
 import inspect
 import itertools
-from typing import Callable, Dict, List, Optional, Union
+from typing import Callable, Dict, Generator, List, Optional, Union
 
 
 class Invoker:
@@ -45,6 +45,9 @@ def __init__(self):
     
     # key: action ID; value: `_ActionItem` instance
     self._action_items = {}
+    
+    # key: action group; value: `_InvocationPlan` instance
+    self._invocation_plans = {}
   
   def add(
         self,
@@ -214,13 +217,30 @@ def invoke(
     position of ``additional_args``. ``additional_args_position`` also
     applies to nested `Invoker` instances.
     """
+    for _unused in self.invoke_in_steps(
+          groups, additional_args, additional_kwargs, additional_args_position):
+      pass
+  
+  def invoke_in_steps(
+        self,
+        groups: Union[None, str, List[str]] = None,
+        additional_args: Optional[Iterable] = None,
+        additional_kwargs: Optional[Dict] = None,
+        additional_args_position: Optional[int] = None,
+  ) -> Generator[None, None, None]:
+    """Same as `invoke()`, but returns a generator invoking one action at a
+    time.
     
-    def _invoke_action(item_, group_):
-      action, action_args, action_kwargs = item_.action
-      args = _get_args(action_args)
-      kwargs = dict(action_kwargs, **additional_kwargs)
-      
-      result = action(*args, **kwargs)
+    ``None`` is yielded after each invoked action, including actions of nested
+    `Invoker` instances. For-each actions are invoked along with the action
+    they apply to.
+    
+    This allows interleaving the invocation with other work. Closing the
+    generator prematurely skips the remaining actions.
+    """
+    
+    def _invoke_action(item_, action_, args_, kwargs_, group_):
+      result = action_(*args_, **kwargs_)
       
       if inspect.isgenerator(result):
         item_.is_generator = True
@@ -233,39 +253,49 @@ def _invoke_action(item_, group_):
           return next(item_.generators_per_group[group_])
         else:
           try:
-            return item_.generators_per_group[group_].send([args, kwargs])
+            return item_.generators_per_group[group_].send([args_, dict(kwargs_)])
           except StopIteration:
             item_.should_be_removed_from_group = True
     
-    def _prepare_foreach_action(action, action_args, action_kwargs):
-      args = _get_args(action_args)
-      kwargs = dict(action_kwargs, **additional_kwargs)
-      return action(*args, **kwargs)
-    
     def _get_args(action_args):
-      if additional_args_position is None:
-        return tuple(action_args) + tuple(additional_args)
+      if not additional_args:
+        return action_args
+      elif additional_args_position is None:
+        return action_args + additional_args
       else:
-        args = list(action_args)
-        args[additional_args_position:additional_args_position] = additional_args
-        return tuple(args)
+        return (
+          action_args[:additional_args_position]
+          + additional_args
+          + action_args[additional_args_position:])
+    
+    def _get_kwargs(action_kwargs):
+      if not additional_kwargs:
+        return action_kwargs
+      else:
+        return dict(action_kwargs, **additional_kwargs)
     
-    def _invoke_action_with_foreach_actions(item_, group_):
+    def _invoke_action_with_foreach_actions(
+          item_, action_, args_, kwargs_, group_, foreach_actions_):
       action_generators = [
-        _prepare_foreach_action(*foreach_item.action)
-        for foreach_item in self._foreach_actions[group_]]
+        foreach_action_(*_get_args(foreach_args_), **_get_kwargs(foreach_kwargs_))
+        for _foreach_item, foreach_action_, foreach_args_, foreach_kwargs_ in foreach_actions_]
       
       _invoke_foreach_actions_once(action_generators)
       
       while action_generators:
-        result_from_action = _invoke_action(item_, group_)
+        result_from_action = _invoke_action(item_, action_, args_, kwargs_, group_)
         _invoke_foreach_actions_once(action_generators, result_from_action)
         
         if item_.should_be_removed_from_group:
-          self.remove(item_.action_id, [group_])
-          item_.should_be_removed_from_group = False
           return
     
+    def _invoke_action_with_plain_foreach_actions(
+          item_, action_, args_, kwargs_, group_, foreach_actions_):
+      _invoke_action(item_, action_, args_, kwargs_, group_)
+      
+      for _foreach_item, foreach_action_, foreach_args_, foreach_kwargs_ in foreach_actions_:
+        foreach_action_(*_get_args(foreach_args_), **_get_kwargs(foreach_kwargs_))
+    
     def _invoke_foreach_actions_once(action_generators, result_from_action=None):
       action_generators_to_remove = []
       
@@ -277,36 +307,46 @@ def _invoke_foreach_actions_once(action_generators, result_from_action=None):
       
       for action_generator_to_remove in action_generators_to_remove:
         action_generators.remove(action_generator_to_remove)
-
-    def _invoke_invoker(invoker, group_):
-      invoker.invoke([group_], additional_args, additional_kwargs, additional_args_position)
     
-    additional_args = additional_args if additional_args is not None else ()
+    additional_args = tuple(additional_args) if additional_args is not None else ()
     additional_kwargs = additional_kwargs if additional_kwargs is not None else {}
     
     for group in self._process_groups_arg(groups):
       if group not in self._actions:
         self._init_group(group)
       
-      # An action could be removed during invocation, hence create a list and
-      # later check for validity.
-      items = list(self._actions[group])
-      
-      for item in items:
-        if item not in self._actions[group]:
+      # The plan is a snapshot of actions in the group. An action could be
+      # removed during invocation, hence check for validity before invoking.
+      for item, action, action_args, action_kwargs in self._get_invocation_plan(group).actions:
+        if group not in item.groups:
           continue
         
-        if item.action_type != self._TYPE_INVOKER:
-          if self._foreach_actions[group]:
-            _invoke_action_with_foreach_actions(item, group)
-          else:
-            _invoke_action(item, group)
-            
-            if item.should_be_removed_from_group:
-              self.remove(item.action_id, [group])
-              item.should_be_removed_from_group = False
+        if item.action_type == self._TYPE_INVOKER:
+          yield from action.invoke_in_steps(
+            [group], additional_args, additional_kwargs, additional_args_position)
+          continue
+        
+        args = _get_args(action_args)
+        kwargs = _get_kwargs(action_kwargs)
+        
+        # For-each actions could be added during invocation, hence the current
+        # plan is obtained again.
+        plan = self._get_invocation_plan(group)
+        
+        if not plan.foreach_actions:
+          _invoke_action(item, action, args, kwargs, group)
+        elif plan.plain_foreach_actions is not None:
+          _invoke_action_with_plain_foreach_actions(
+            item, action, args, kwargs, group, plan.plain_foreach_actions)
         else:
-          _invoke_invoker(item.action, group)
+          _invoke_action_with_foreach_actions(
+            item, action, args, kwargs, group, plan.foreach_actions)
+        
+        if item.should_be_removed_from_group:
+          self.remove(item.action_id, [group])
+          item.should_be_removed_from_group = False
+        
+        yield
   
   def add_to_groups(
         self,
@@ -507,6 +547,8 @@ def reorder(self, action_id: int, position: int, group: Optional[str] = None):
       position = max(len(action_lists[group]) + position + 1, 0)
     
     action_lists[group].insert(position, action_item)
+    
+    self._invocation_plans.pop(group, None)
   
   def remove(
         self,
@@ -568,6 +610,8 @@ def remove_groups(self, groups: Union[None, str, List[str]] = None):
       
       del self._actions[group]
       del self._foreach_actions[group]
+      
+      self._invocation_plans.pop(group, None)
   
   def _init_group(self, group):
     if group not in self._actions:
@@ -614,6 +658,8 @@ def _add_action(
       self._actions[group].insert(position, action_item)
     
     self._action_functions[group][action] += 1
+    
+    self._invocation_plans.pop(group, None)
   
   def _add_foreach_action(
         self,
@@ -651,6 +697,8 @@ def invoke_foreach_action_after_action(*args, **kwargs):
       self._foreach_actions[group].insert(position, action_item)
     
     self._foreach_action_functions[group][foreach_action] += 1
+    
+    self._invocation_plans.pop(group, None)
   
   def _add_invoker(self, action_id, invoker, group, position):
     self._init_group(group)
@@ -664,6 +712,23 @@ def _add_invoker(self, action_id, invoker, group, position):
       self._actions[group].insert(position, action_item)
     
     self._invokers[group][invoker] += 1
+    
+    self._invocation_plans.pop(group, None)
+  
+  def _get_invocation_plan(self, group):
+    """Returns actions and for-each actions in ``group`` along with their
+    arguments in a form suitable for repeated invocation.
+
+    The plan is created once and reused until actions in ``group`` are added,
+    removed or reordered.
+    """
+    plan = self._invocation_plans.get(group)
+    
+    if plan is None:
+      plan = _InvocationPlan(self._actions[group], self._foreach_actions[group])
+      self._invocation_plans[group] = plan
+    
+    return plan
   
   def _get_action_id(self):
     return next(self._action_id_counter)
@@ -693,6 +758,8 @@ def _remove_action(self, action_id, group, action_lists, action_functions):
       del action_functions[group][action_item.action_function]
     
     self._remove_action_item(action_id, group)
+    
+    self._invocation_plans.pop(group, None)
   
   def _remove_action_item(self, action_id, group):
     self._action_items[action_id].groups.remove(group)
@@ -758,3 +825,37 @@ def __init__(self, action, action_id, groups, action_type, action_function, run_
     self.is_generator = False
     self.generators_per_group = {}
     self.should_be_removed_from_group = False
+
+
+class _InvocationPlan:
+  """Snapshot of actions in an `Invoker` group.
+
+  Each action is stored as a tuple of (`_ActionItem` instance, function or
+  `Invoker` instance, arguments as a tuple, keyword arguments).
+
+  If no for-each action is a generator function, ``plain_foreach_actions``
+  contains for-each actions with their original functions which can be called
+  directly after each action without creating generators. Otherwise,
+  ``plain_foreach_actions`` is ``None``.
+  """
+  
+  def __init__(self, action_items, foreach_action_items):
+    self.actions = tuple(_get_plan_entry(item) for item in action_items)
+    self.foreach_actions = tuple(_get_plan_entry(item) for item in foreach_action_items)
+    
+    if all(not inspect.isgeneratorfunction(item.action_function)
+           for item in foreach_action_items):
+      self.plain_foreach_actions = tuple(
+        (item, item.action_function, args, kwargs)
+        for item, _action, args, kwargs in self.foreach_actions)
+    else:
+      self.plain_foreach_actions = None
+
+
+def _get_plan_entry(action_item):
+  # noinspection PyProtectedMember
+  if action_item.action_type == Invoker._TYPE_INVOKER:
+    return action_item, action_item.action, (), {}
+  else:
+    action, action_args, action_kwargs = action_item.action
+    return action_item, action, tuple(action_args), action_kwargs
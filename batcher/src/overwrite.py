@@ -4,6 +4,7 @@
 import os
 from typing import Dict, Optional, Tuple
 
+from src.path import dirindex
 from src.path import uniquify
 
 
@@ -115,7 +116,10 @@ def _choose(self, filepath: str):
 
 
 def handle_overwrite(
-      filepath: str, overwrite_chooser: OverwriteChooser, position: Optional[int] = None
+      filepath: str,
+      overwrite_chooser: OverwriteChooser,
+      position: Optional[int] = None,
+      directory_index: Optional[dirindex.DirectoryIndex] = None,
 ) -> Tuple[str, str]:
   """Resolves how to handle an existing file path.
 
@@ -133,6 +137,10 @@ def handle_overwrite(
   name. The position of the substring can be customized via ``position`` (for
   example, to place the substring before the file extension).
 
+  If ``directory_index`` is specified, it is used to determine whether file
+  paths exist instead of querying the file system for each file path. Renaming
+  an existing file is recorded in ``directory_index``.
+
   Returns:
     A tuple of (chosen overwrite mode, file path).
 
@@ -144,17 +152,26 @@ def handle_overwrite(
     unless the `OverwriteModes.RENAME_NEW` mode is chosen, in which case a
     modified file path is returned.
   """
-  if os.path.exists(filepath):
+  if directory_index is not None:
+    exists = directory_index.exists(filepath)
+  else:
+    exists = os.path.exists(filepath)
+
+  if exists:
     overwrite_chooser.choose(filepath=os.path.abspath(filepath))
 
     if overwrite_chooser.overwrite_mode in (
          OverwriteModes.RENAME_NEW, OverwriteModes.RENAME_EXISTING):
-      processed_filepath = uniquify.uniquify_filepath(filepath, position)
+      processed_filepath = uniquify.uniquify_filepath(
+        filepath, position, directory_index=directory_index)
       if overwrite_chooser.overwrite_mode == OverwriteModes.RENAME_NEW:
         filepath = processed_filepath
       else:
         os.rename(filepath, processed_filepath)
 
+        if directory_index is not None:
+          directory_index.rename(filepath, processed_filepath)
+
     return overwrite_chooser.overwrite_mode, filepath
   else:
     return OverwriteModes.DO_NOTHING, filepath
@@ -0,0 +1,195 @@
+"""In-memory index of names of files and folders within directories.
+
+The index allows checking whether file paths exist without querying the file
+system for each file path, which is slow on network drives.
+"""
+
+import os
+import sys
+from typing import Optional
+
+
+class DirectoryIndex:
+  """Class keeping track of files and folders existing in directories.
+
+  Each directory is scanned once when any path within the directory is queried
+  for the first time. Afterwards, queries are answered from memory. Files and
+  folders created, removed or renamed after the scan must be recorded via
+  `add()`, `remove()` or `rename()`, respectively.
+
+  If ``revalidate`` is ``True``, the modification time of a directory is
+  checked on each query and the directory is scanned again if it changed
+  since the last scan. This allows handling directories modified by other
+  processes at the cost of one file system query per query to the index.
+
+  Directories that cannot be scanned (e.g. due to insufficient permissions)
+  are not indexed and paths within them are always checked directly in the
+  file system.
+  """
+
+  _NOT_INDEXED = object()
+
+  def __init__(self, revalidate: bool = False):
+    self.revalidate = revalidate
+
+    # key: absolute directory path
+    # value: dictionary of (normalized name, is directory) pairs, ``None`` if
+    #   the directory does not exist or `_NOT_INDEXED`
+    self._entries = {}
+
+    # key: absolute directory path
+    # value: modification time of the directory in nanoseconds at the last scan
+    self._modification_times = {}
+
+  def exists(self, path: str) -> bool:
+    """Returns ``True`` if a file or folder exists at ``path``, ``False``
+    otherwise.
+    """
+    dirpath, name = _split(path)
+
+    if not name:
+      return os.path.exists(path)
+
+    entries = self._get_entries(dirpath)
+
+    if entries is self._NOT_INDEXED:
+      return os.path.exists(path)
+
+    return entries is not None and _normalize_name(name) in entries
+
+  def is_dir(self, path: str) -> bool:
+    """Returns ``True`` if ``path`` is an existing folder, ``False``
+    otherwise.
+    """
+    dirpath, name = _split(path)
+
+    if not name:
+      return os.path.isdir(path)
+
+    entries = self._get_entries(dirpath)
+
+    if entries is self._NOT_INDEXED:
+      return os.path.isdir(path)
+
+    return entries is not None and entries.get(_normalize_name(name), False)
+
+  def add(self, path: str, is_dir: bool = False):
+    """Records that a file (or a folder if ``is_dir`` is ``True``) was created
+    at ``path``.
+
+    Parent folders of ``path`` are recorded as existing as well.
+    """
+    dirpath, name = _split(path)
+
+    if not name:
+      return
+
+    entries = self._entries.get(dirpath)
+
+    if entries is None:
+      self.add(dirpath, is_dir=True)
+
+    if dirpath not in self._entries:
+      # The directory will be scanned on the next query.
+      return
+
+    if entries is self._NOT_INDEXED:
+      return
+
+    if entries is None:
+      entries = {}
+      self._entries[dirpath] = entries
+
+    entries[_normalize_name(name)] = is_dir
+
+  def remove(self, path: str):
+    """Records that a file or folder at ``path`` was removed."""
+    dirpath, name = _split(path)
+
+    entries = self._entries.get(dirpath)
+
+    if name and isinstance(entries, dict):
+      entries.pop(_normalize_name(name), None)
+
+    self.invalidate(os.path.join(dirpath, name))
+
+  def rename(self, path: str, new_path: str):
+    """Records that a file or folder at ``path`` was renamed to ``new_path``."""
+    is_dir = self.is_dir(path)
+
+    self.remove(path)
+    self.add(new_path, is_dir=is_dir)
+
+  def invalidate(self, dirpath: Optional[str] = None):
+    """Removes ``dirpath`` and all its subdirectories from the index, or the
+    entire index if ``dirpath`` is ``None``, forcing a new scan on the next
+    query.
+    """
+    if dirpath is None:
+      self._entries = {}
+      self._modification_times = {}
+      return
+
+    dirpath = os.path.abspath(dirpath)
+    dirpath_prefix = os.path.join(dirpath, '')
+
+    for indexed_dirpath in list(self._entries):
+      if indexed_dirpath == dirpath or indexed_dirpath.startswith(dirpath_prefix):
+        del self._entries[indexed_dirpath]
+        self._modification_times.pop(indexed_dirpath, None)
+
+  def _get_entries(self, dirpath):
+    if dirpath in self._entries:
+      if not self.revalidate or not self._is_modified(dirpath):
+        return self._entries[dirpath]
+
+    entries = self._scan(dirpath)
+    self._entries[dirpath] = entries
+
+    return entries
+
+  def _scan(self, dirpath):
+    try:
+      modification_time = os.stat(dirpath).st_mtime_ns
+      with os.scandir(dirpath) as dir_entries:
+        entries = {
+          _normalize_name(dir_entry.name): _is_dir_entry_dir(dir_entry)
+          for dir_entry in dir_entries}
+    except (FileNotFoundError, NotADirectoryError):
+      self._modification_times.pop(dirpath, None)
+      return None
+    except OSError:
+      self._modification_times.pop(dirpath, None)
+      return self._NOT_INDEXED
+
+    self._modification_times[dirpath] = modification_time
+
+    return entries
+
+  def _is_modified(self, dirpath):
+    try:
+      modification_time = os.stat(dirpath).st_mtime_ns
+    except OSError:
+      modification_time = None
+
+    return modification_time != self._modification_times.get(dirpath)
+
+
+def _split(path):
+  return os.path.split(os.path.abspath(path))
+
+
+def _is_dir_entry_dir(dir_entry):
+  try:
+    return dir_entry.is_dir()
+  except OSError:
+    return False
+
+
+if sys.platform in ('win32', 'darwin'):
+  # File systems on these platforms are case-insensitive by default.
+  def _normalize_name(name: str) -> str:
+    return name.casefold()
+else:
+  def _normalize_name(name: str) -> str:
+    return name
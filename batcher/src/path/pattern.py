@@ -61,6 +61,8 @@ def __init__(
     
     self._pattern_parts, _unused, self._parsed_fields_and_matching_regexes = (
       self.parse_pattern(self._pattern, self._fields))
+
+    self._compiled_parts = self._compile()
   
   @property
   def pattern(self) -> str:
@@ -93,14 +95,9 @@ def substitute(self, *additional_args) -> str:
     more arguments outside the parsed arguments. These arguments are prepended
     to each function.
     """
-    pattern_parts = []
-    for part in self._pattern_parts:
-      if not self._is_field(part):
-        pattern_parts.append(part)
-      else:
-        pattern_parts.append(self._process_field(part, additional_args))
-    
-    return ''.join(pattern_parts)
+    return ''.join([
+      part if isinstance(part, str) else part(additional_args)
+      for part in self._compiled_parts])
   
   @classmethod
   def get_field_at_position(cls, pattern: str, position: int) -> Optional[str]:
@@ -362,14 +359,38 @@ def _is_field_symbol_escaped(pattern, index, symbol):
   def _is_field(pattern_part):
     return not isinstance(pattern_part, str)
   
-  def _process_field(self, field, additional_args):
+  def _compile(self):
+    """Turns the parsed pattern parts into a list of strings and functions
+    substituting fields, so that `substitute()` does not have to look up field
+    functions and build their arguments on each call.
+
+    Adjacent strings are merged into one.
+    """
+    compiled_parts = []
+
+    for part in self._pattern_parts:
+      if not self._is_field(part):
+        if compiled_parts and isinstance(compiled_parts[-1], str):
+          compiled_parts[-1] += part
+        else:
+          compiled_parts.append(part)
+      else:
+        compiled_parts.append(self._compile_field(part))
+
+    return compiled_parts
+
+  def _compile_field(self, field):
     field_func = self._fields[self._parsed_fields_and_matching_regexes[field[0]]]
-    field_func_args = list(additional_args) + [field[0]] + list(field[1])
+    field_func_args = (field[0], *field[1])
+    unsubstituted_field_str = '[{}]'.format(field[2])
+
+    def _substitute_field(additional_args):
+      # noinspection PyBroadException
+      try:
+        return_value = field_func(*additional_args, *field_func_args)
+      except Exception:
+        return unsubstituted_field_str
+      else:
+        return str(return_value)
 
-    # noinspection PyBroadException
-    try:
-      return_value = field_func(*field_func_args)
-    except Exception:
-      return '[{}]'.format(field[2])
-    else:
-      return str(return_value)
+    return _substitute_field
@@ -4,6 +4,8 @@
 import os
 from typing import Callable, Generator, Optional
 
+from src.path import dirindex
+
 
 def uniquify_string(
       str_: str,
@@ -23,20 +25,36 @@ def uniquify_string(
     generator)
 
 
+def get_unique_substring(number: int) -> str:
+  """Returns the default substring inserted by `uniquify_string_generic()`
+  to make a string unique, e.g. ``' (1)'`` for ``number`` equal to 1.
+  """
+  return f' ({number})'
+
+
 def uniquify_filepath(
       filepath: str,
       position: Optional[int] = None,
       generator: Optional[Generator[str, None, None]] = None,
+      directory_index: Optional[dirindex.DirectoryIndex] = None,
 ) -> str:
   """Modifies the specified file path to be unique if a file with the same path
   already exists.
 
+  If ``directory_index`` is specified, it is used to determine whether file
+  paths exist instead of querying the file system for each file path.
+
   For more information on the ``position`` and ``generator`` parameters, see
   `uniquify_string_generic()`.
   """
+  if directory_index is not None:
+    exists_func = directory_index.exists
+  else:
+    exists_func = os.path.exists
+
   return uniquify_string_generic(
     filepath,
-    lambda filepath_param: not os.path.exists(filepath_param),
+    lambda filepath_param: not exists_func(filepath_param),
     position,
     generator)
 
@@ -94,7 +112,7 @@ def _get_uniquified_string(gen):
   def _generate_unique_number():
     i = 1
     while True:
-      yield f' ({i})'
+      yield get_unique_substring(i)
       i += 1
   
   if is_unique_func(str_):
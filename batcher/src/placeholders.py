@@ -5,7 +5,7 @@
 """
 
 import inspect
-from typing import Callable, List, Optional, Union, Type
+from typing import Any, Callable, List, Optional, Union, Type
 
 from gi.repository import GObject
 
@@ -405,6 +405,29 @@ def get_replaced_value(setting: PlaceholderSetting, batcher: 'src.core.Batcher')
     return placeholder.replace_args(setting, batcher)
 
 
+def get_replacement_func(
+      setting: PlaceholderSetting,
+) -> Callable[['src.core.Batcher'], Any]:
+  """Returns a function accepting a `core.Batcher` instance and returning a
+  valid value replacing the placeholder value of ``setting``.
+
+  Unlike `get_replaced_value()`, the placeholder is looked up only once, which
+  is useful if the value is replaced for many items.
+
+  `ValueError` is raised if the placeholder value is not one of the keys in
+  `PLACEHOLDERS`.
+  """
+  try:
+    placeholder = PLACEHOLDERS[setting.value]
+  except KeyError:
+    raise ValueError(f'invalid placeholder value "{setting.value}"')
+
+  def _get_replaced_value(batcher):
+    return placeholder.replace_args(setting, batcher)
+
+  return _get_replaced_value
+
+
 def get_placeholder_type_name_from_pdb_type(
       pdb_type: Union[GObject.GType, Type[GObject.GObject]],
       pdb_param_info: Optional[GObject.ParamSpec] = None,
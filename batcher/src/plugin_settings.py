@@ -103,6 +103,62 @@ def create_settings_for_convert():
       'gui_type': None,
       'tags': ['ignore_reset', 'ignore_load', 'ignore_save'],
     },
+    {
+      'type': 'int',
+      'name': 'num_workers',
+      'default_value': 1,
+      'min_value': 1,
+      'display_name': _(
+        'Number of GIMP processes to split the inputs between'
+        ' (requires gimp-console; non-interactive run mode only)'),
+      'gui_type': None,
+      'tags': ['ignore_reset', 'ignore_load', 'ignore_save'],
+    },
+    {
+      'type': 'bool',
+      'name': 'stream_inputs',
+      'default_value': False,
+      'display_name': _(
+        'Process input files as they are read instead of reading all inputs first'
+        ' (reduces memory usage for a large number of inputs; non-interactive run mode only)'),
+      'gui_type': None,
+      'tags': ['ignore_reset', 'ignore_load', 'ignore_save'],
+    },
+    {
+      'type': 'bool',
+      'name': 'write_in_background',
+      'default_value': False,
+      'display_name': _(
+        'Export to a temporary local folder and move files to the output folder'
+        ' in the background (non-interactive run mode only)'),
+      'gui_type': None,
+      'tags': ['ignore_reset', 'ignore_load', 'ignore_save'],
+    },
+    {
+      'type': 'bool',
+      'name': 'skip_unchanged',
+      'default_value': False,
+      'display_name': _('Skip input files unchanged since the last conversion'),
+      'description': _(
+        'Skip input files converted to the output folder before if neither the files'
+        ' nor the settings changed since then'),
+    },
+    {
+      'type': 'bool',
+      'name': 'compare_file_contents',
+      'default_value': False,
+      'display_name': _('Compare file contents to detect unchanged input files'),
+      'description': _(
+        'Compare contents of input files in addition to their modification dates'
+        ' to detect unchanged input files (slower)'),
+    },
+    {
+      'type': 'bool',
+      'name': 'rebuild_manifest',
+      'default_value': False,
+      'display_name': _('Convert all input files again and rebuild the list of converted files'),
+      'tags': ['ignore_load', 'ignore_save'],
+    },
     {
       'type': 'string',
       'name': 'plugin_version',
@@ -401,6 +457,16 @@ def create_settings_for_export_layers():
       'gui_type': None,
       'tags': ['ignore_reset', 'ignore_load', 'ignore_save'],
     },
+    {
+      'type': 'bool',
+      'name': 'reuse_image_copies',
+      'default_value': False,
+      'display_name': _(
+        'Reuse a single copy of the image to process layers instead of a new copy for each layer'
+        ' (non-interactive run mode only)'),
+      'gui_type': None,
+      'tags': ['ignore_reset', 'ignore_load', 'ignore_save'],
+    },
     {
       'type': 'tagged_items',
       'name': 'tagged_items',
@@ -0,0 +1,228 @@
+"""Reading files ahead of processing in a background thread."""
+
+import collections
+import os
+import threading
+from typing import Iterable
+
+
+class PrefetchStats:
+  """Statistics of a `FilePrefetcher` instance."""
+
+  def __init__(self):
+    self.num_hits = 0
+    """Number of files that were completely read ahead before being requested."""
+
+    self.num_misses = 0
+    """Number of files that were not read ahead completely before being
+    requested (e.g. due to slow storage or exceeding the byte budget).
+    """
+
+    self.num_bytes_read = 0
+    """Number of bytes read ahead in total."""
+
+  @property
+  def hit_rate(self) -> float:
+    """Fraction of requested files that were read ahead completely."""
+    num_requests = self.num_hits + self.num_misses
+    return self.num_hits / num_requests if num_requests > 0 else 0.0
+
+
+class FilePrefetcher:
+  """Class reading the contents of files ahead of time in a background thread
+  so that subsequent reads (e.g. loading an image in GIMP) are served from the
+  operating system's page cache rather than from slow storage.
+
+  The file contents themselves are discarded. The amount of data read ahead
+  and not yet requested via `consume()` is capped by ``max_bytes``. A file
+  larger than ``max_bytes`` is never read ahead.
+
+  Use this class as follows:
+
+    prefetcher.start()
+    prefetcher.schedule([filepath_1, filepath_2])
+    ...
+    prefetcher.consume(filepath_1)
+    # load `filepath_1`
+    ...
+    prefetcher.stop()
+  """
+
+  def __init__(self, max_bytes: int, chunk_size: int = 1024 * 1024):
+    self.max_bytes = max_bytes
+    self.chunk_size = chunk_size
+
+    self._stats = PrefetchStats()
+
+    self._condition = threading.Condition()
+    self._thread = None
+    self._should_stop = False
+
+    self._pending_filepaths = collections.deque()
+    # key: file path
+    # value: number of bytes read ahead, or ``None`` if reading is in progress
+    self._prefetched_filepaths = {}
+    # Scheduled files not consumed yet
+    self._scheduled_filepaths = set()
+    self._current_filepath = None
+    self._num_unconsumed_bytes = 0
+
+  @property
+  def stats(self) -> PrefetchStats:
+    """`PrefetchStats` instance."""
+    return self._stats
+
+  def start(self):
+    """Starts the background thread reading scheduled files.
+
+    Calling this method if the thread is already running has no effect.
+    """
+    if self._thread is not None:
+      return
+
+    self._should_stop = False
+    self._thread = threading.Thread(target=self._prefetch_files, daemon=True)
+    self._thread.start()
+
+  def stop(self):
+    """Stops the background thread and clears all scheduled files.
+
+    Statistics are preserved.
+    """
+    with self._condition:
+      self._should_stop = True
+      self._pending_filepaths.clear()
+      self._condition.notify_all()
+
+    if self._thread is not None:
+      self._thread.join()
+      self._thread = None
+
+    self._prefetched_filepaths = {}
+    self._scheduled_filepaths = set()
+    self._num_unconsumed_bytes = 0
+
+  def schedule(self, filepaths: Iterable[str]):
+    """Schedules reading the specified files in the given order.
+
+    Files already scheduled and not consumed yet are ignored. A consumed file
+    may be scheduled again, e.g. if it is loaded multiple times.
+    """
+    with self._condition:
+      for filepath in filepaths:
+        if filepath not in self._scheduled_filepaths:
+          self._scheduled_filepaths.add(filepath)
+          self._pending_filepaths.append(filepath)
+
+      self._condition.notify_all()
+
+  def consume(self, filepath: str) -> bool:
+    """Marks the specified file as requested for loading.
+
+    If the file was not read ahead yet, it will no longer be read ahead. The
+    bytes read ahead for the file are released from the byte budget.
+
+    Returns:
+      ``True`` if the file was completely read ahead (a hit), ``False``
+      otherwise (a miss).
+    """
+    with self._condition:
+      self._scheduled_filepaths.discard(filepath)
+
+      try:
+        self._pending_filepaths.remove(filepath)
+      except ValueError:
+        pass
+
+      num_bytes = self._prefetched_filepaths.pop(filepath, None)
+      is_hit = num_bytes is not None and filepath != self._current_filepath
+
+      if is_hit:
+        self._num_unconsumed_bytes -= num_bytes
+        self._stats.num_hits += 1
+      else:
+        self._stats.num_misses += 1
+
+      if filepath == self._current_filepath:
+        self._current_filepath = None
+
+      self._condition.notify_all()
+
+    return is_hit
+
+  def _prefetch_files(self):
+    while True:
+      filepath = self._wait_for_next_file()
+
+      if filepath is None:
+        return
+
+      num_bytes_read = self._read_file(filepath)
+
+      with self._condition:
+        if self._current_filepath == filepath:
+          self._current_filepath = None
+          self._prefetched_filepaths[filepath] = num_bytes_read
+          self._num_unconsumed_bytes += num_bytes_read
+
+        self._stats.num_bytes_read += num_bytes_read
+
+  def _wait_for_next_file(self):
+    filepath = None
+    file_size = None
+
+    while True:
+      with self._condition:
+        while not self._should_stop and not self._pending_filepaths:
+          self._condition.wait()
+
+        if self._should_stop:
+          return None
+
+        if filepath is not None and self._pending_filepaths[0] == filepath:
+          if file_size is None or file_size > self.max_bytes:
+            self._pending_filepaths.popleft()
+            filepath = None
+            continue
+
+          if self._num_unconsumed_bytes + file_size > self.max_bytes:
+            self._condition.wait()
+            continue
+
+          self._pending_filepaths.popleft()
+
+          self._current_filepath = filepath
+          self._prefetched_filepaths[filepath] = None
+
+          return filepath
+
+        filepath = self._pending_filepaths[0]
+
+      # Obtaining the file size may be slow (e.g. on a network drive), hence
+      # this is done without holding the lock so that `consume()` is not
+      # blocked in the meantime. If the file is consumed before the lock is
+      # acquired again, the file size is discarded.
+      try:
+        file_size = os.path.getsize(filepath)
+      except OSError:
+        file_size = None
+
+  def _read_file(self, filepath):
+    num_bytes_read = 0
+
+    try:
+      with open(filepath, 'rb') as file_:
+        while True:
+          # Reading of a file consumed in the meantime is interrupted.
+          if self._should_stop or self._current_filepath != filepath:
+            break
+
+          chunk = file_.read(self.chunk_size)
+          if not chunk:
+            break
+
+          num_bytes_read += len(chunk)
+    except OSError:
+      pass
+
+    return num_bytes_read
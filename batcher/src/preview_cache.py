@@ -0,0 +1,134 @@
+"""Caching previews and intermediate results of processing items for previews."""
+
+import collections
+from typing import Any, Callable, Hashable, Optional
+
+
+class PreviewCacheStats:
+  """Statistics of a `PreviewCache` instance."""
+
+  def __init__(self):
+    self.num_hits = 0
+    """Number of previews found in the cache."""
+
+    self.num_misses = 0
+    """Number of previews not found in the cache."""
+
+    self.num_evictions = 0
+    """Number of previews removed from the cache to stay within the size
+    limit.
+    """
+
+
+class PreviewCache:
+  """Least-recently-used (LRU) cache of rendered previews whose total size is
+  bounded by ``max_bytes``.
+
+  Each preview is stored under a key that should uniquely identify the
+  rendered result, e.g. the previewed item, settings affecting the contents
+  of the preview and the preview size. If adding a preview exceeds
+  ``max_bytes``, least recently used previews are removed. A preview larger
+  than ``max_bytes`` is not cached at all.
+
+  If ``remove_func`` is not ``None``, it is called with a preview as its only
+  argument whenever the preview is removed from the cache or is not cached
+  due to its size. This allows releasing resources held by previews, e.g.
+  deleting GIMP images.
+  """
+
+  def __init__(self, max_bytes: int, remove_func: Optional[Callable[[Any], None]] = None):
+    self._max_bytes = max_bytes
+    self._remove_func = remove_func
+
+    # key: key identifying the preview
+    # value: (preview, size of the preview in bytes)
+    self._previews = collections.OrderedDict()
+
+    self._num_bytes = 0
+
+    self._stats = PreviewCacheStats()
+
+  @property
+  def max_bytes(self) -> int:
+    """Maximum total size of cached previews in bytes."""
+    return self._max_bytes
+
+  @property
+  def num_bytes(self) -> int:
+    """Total size of cached previews in bytes."""
+    return self._num_bytes
+
+  @property
+  def stats(self) -> PreviewCacheStats:
+    """`PreviewCacheStats` instance."""
+    return self._stats
+
+  def __len__(self) -> int:
+    return len(self._previews)
+
+  def __contains__(self, key: Hashable) -> bool:
+    return key in self._previews
+
+  def get(self, key: Hashable) -> Optional[Any]:
+    """Returns the preview stored under ``key``, or ``None`` if there is no
+    such preview.
+
+    The returned preview is marked as the most recently used.
+    """
+    preview_and_size = self._previews.get(key)
+
+    if preview_and_size is None:
+      self._stats.num_misses += 1
+      return None
+
+    self._previews.move_to_end(key)
+    self._stats.num_hits += 1
+
+    return preview_and_size[0]
+
+  def add(self, key: Hashable, preview: Any, size: int):
+    """Stores ``preview`` of the given ``size`` in bytes under ``key``.
+
+    A preview already stored under ``key`` is replaced.
+    """
+    self.remove(key)
+
+    if size > self._max_bytes:
+      self._call_remove_func(preview)
+      return
+
+    self._previews[key] = (preview, size)
+    self._num_bytes += size
+
+    while self._num_bytes > self._max_bytes:
+      _key, (evicted_preview, evicted_size) = self._previews.popitem(last=False)
+      self._num_bytes -= evicted_size
+      self._stats.num_evictions += 1
+
+      self._call_remove_func(evicted_preview)
+
+  def remove(self, key: Hashable):
+    """Removes the preview stored under ``key``.
+
+    Nothing happens if there is no such preview.
+    """
+    preview_and_size = self._previews.pop(key, None)
+
+    if preview_and_size is not None:
+      self._num_bytes -= preview_and_size[1]
+
+      self._call_remove_func(preview_and_size[0])
+
+  def clear(self):
+    """Removes all cached previews."""
+    previews_and_sizes = list(self._previews.values())
+
+    self._previews.clear()
+    self._num_bytes = 0
+
+    for preview, _size in previews_and_sizes:
+      self._call_remove_func(preview)
+
+  def _call_remove_func(self, preview):
+    if self._remove_func is not None:
+      self._remove_func(preview)
@@ -39,6 +39,10 @@ def __init__(
     self._rename_items = rename_items
     self._rename_folders = rename_folders
 
+    # key: field name and field arguments
+    # value: values computed from field arguments (e.g. compiled regular expressions)
+    self._field_cache = {}
+
     self._name_pattern = pattern_.StringPattern(
       pattern=pattern,
       fields=_get_fields_and_substitute_funcs(_init_fields(self._fields_raw)))
@@ -47,6 +51,13 @@ def __init__(
   def fields_raw(self):
     return self._fields_raw
 
+  @property
+  def field_cache(self) -> Dict[Any, Any]:
+    """Dictionary that field functions may use to store values computed from
+    field arguments once per renamer rather than once per item.
+    """
+    return self._field_cache
+
   @property
   def rename_items(self):
     return self._rename_items
@@ -530,15 +541,32 @@ def _replace(
       pattern,
       replacement,
       *count_and_flags):
-  field_name, field_args = pattern_.StringPattern.parse_field(field_to_replace_str)
+  cache_key = ('replace', field_to_replace_str, pattern, count_and_flags)
 
   try:
-    field_func = renamer.fields_raw[field_name]['substitute_func']
+    parsed_args = renamer.field_cache[cache_key]
   except KeyError:
+    parsed_args = _parse_replace_args(renamer, field_to_replace_str, pattern, count_and_flags)
+    renamer.field_cache[cache_key] = parsed_args
+
+  field_func, field_name, field_args, regex, count = parsed_args
+
+  if field_func is None:
     return ''
   
   str_to_process = field_func(renamer, batcher, item, field_name, *field_args)
   
+  return regex.sub(replacement, str_to_process, count=count)
+
+
+def _parse_replace_args(renamer, field_to_replace_str, pattern, count_and_flags):
+  field_name, field_args = pattern_.StringPattern.parse_field(field_to_replace_str)
+
+  try:
+    field_func = renamer.fields_raw[field_name]['substitute_func']
+  except KeyError:
+    return None, field_name, field_args, None, 0
+  
   count = 0
   flags = 0
   
@@ -553,7 +581,7 @@ def _replace(
     if processed_flag_name in re.RegexFlag.__members__:
       flags |= getattr(re, flag_name.upper())
   
-  return re.sub(pattern, replacement, str_to_process, count=count, flags=flags)
+  return field_func, field_name, field_args, re.compile(pattern, flags=flags), count
 
 
 _examples_lines_for_output_folder_field_for_windows = [
@@ -822,3 +850,22 @@ def get_fields(tags=None):
     for field in _FIELDS_LIST
     if any(tag in field['procedure_groups'] for tag in tags)
   }
+
+
+def uses_number_of_items(pattern: str) -> bool:
+  """Returns ``True`` if ``pattern`` contains a number field with descending
+  numbers starting from the number of items (e.g. ``[000, %d]``), ``False``
+  otherwise.
+
+  Substituting such a field requires knowing all items to be renamed in
+  advance.
+  """
+  number_fields = _init_fields(
+    {field['regex']: field for field in _FIELDS_LIST if field['type'] == NumberField})
+
+  _pattern_parts, parsed_fields, _unused = pattern_.StringPattern.parse_pattern(
+    pattern, _get_fields_and_substitute_funcs(number_fields))
+
+  return any(
+    int(field_value) == 0 and any(arg.startswith('%d') for arg in field_args)
+    for field_value, field_args, *_rest in parsed_fields)
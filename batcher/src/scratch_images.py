@@ -0,0 +1,150 @@
+"""Reusing empty image copies for processing multiple items from the same
+image.
+"""
+
+import gi
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+
+import pygimplib as pg
+
+from src import utils
+
+
+class ScratchImageStats:
+  """Statistics of a `ScratchImagePool` instance."""
+
+  def __init__(self):
+    self.num_images_created = 0
+    """Number of image copies created."""
+
+    self.num_copies_avoided = 0
+    """Number of times an existing image copy was reused instead of creating a
+    new one.
+    """
+
+    self.num_images_discarded = 0
+    """Number of image copies deleted instead of being reused as procedures
+    changed their image-level attributes (e.g. size or color mode).
+    """
+
+
+class ScratchImagePool:
+  """Class providing empty copies of images ("scratch images") that are reused
+  across processed items instead of creating and deleting an image copy for
+  each item.
+
+  A scratch image obtained via `acquire()` has the same attributes as the
+  original image (see `utils.create_empty_image_copy()`). Once the processing
+  of an item is done, the scratch image should be returned via `release()`,
+  which removes its contents so that the image can be used for the next item.
+
+  If image-level attributes of a scratch image (size, base type, precision,
+  resolution, unit or parasites) changed during processing, the scratch image
+  is deleted instead and a new copy is created on the next `acquire()`.
+  Changes to other attributes (e.g. guides or the color profile) are not
+  detected, hence this class should only be used if procedures applied to
+  scratch images are not expected to modify such attributes.
+  """
+
+  def __init__(self):
+    # key: scratch image
+    # value: (original image, image-level attributes of the scratch image when
+    #   created)
+    self._scratch_images = {}
+
+    # key: original image
+    # value: scratch image not currently in use
+    self._available_scratch_images = {}
+
+    self._stats = ScratchImageStats()
+
+  @property
+  def stats(self) -> ScratchImageStats:
+    """`ScratchImageStats` instance."""
+    return self._stats
+
+  def acquire(self, image: Gimp.Image) -> Gimp.Image:
+    """Returns an empty copy of ``image``, reusing a previously released copy
+    if possible.
+    """
+    scratch_image = self._available_scratch_images.pop(image, None)
+
+    if scratch_image is not None:
+      if scratch_image.is_valid():
+        self._stats.num_copies_avoided += 1
+        return scratch_image
+      else:
+        del self._scratch_images[scratch_image]
+
+    scratch_image = utils.create_empty_image_copy(image)
+
+    self._scratch_images[scratch_image] = (image, _get_image_attributes(scratch_image))
+    self._stats.num_images_created += 1
+
+    return scratch_image
+
+  def release(self, scratch_image: Gimp.Image):
+    """Removes the contents of ``scratch_image`` so that it can be reused by
+    `acquire()`.
+
+    If the image-level attributes of ``scratch_image`` changed since its
+    creation, the image is deleted instead.
+
+    ``scratch_image`` must have been returned by `acquire()`.
+    """
+    image, attributes = self._scratch_images[scratch_image]
+
+    if not scratch_image.is_valid():
+      del self._scratch_images[scratch_image]
+      return
+
+    if _get_image_attributes(scratch_image) != attributes:
+      del self._scratch_images[scratch_image]
+      scratch_image.delete()
+      self._stats.num_images_discarded += 1
+      return
+
+    _remove_image_contents(scratch_image)
+
+    if image in self._available_scratch_images:
+      # Only one scratch image is kept per image.
+      del self._scratch_images[scratch_image]
+      scratch_image.delete()
+    else:
+      self._available_scratch_images[image] = scratch_image
+
+  def clear(self):
+    """Deletes all scratch images created by this instance, including those
+    not released yet.
+    """
+    for scratch_image in self._scratch_images:
+      pg.pdbutils.try_delete_image(scratch_image)
+
+    self._scratch_images = {}
+    self._available_scratch_images = {}
+
+
+def _get_image_attributes(image):
+  return (
+    image.get_width(),
+    image.get_height(),
+    image.get_base_type(),
+    image.get_precision(),
+    tuple(image.get_resolution()[1:]),
+    image.get_unit(),
+    tuple(image.get_parasite_list()),
+  )
+
+
+def _remove_image_contents(image):
+  for layer in image.get_layers():
+    image.remove_layer(layer)
+
+  for channel in image.get_channels():
+    image.remove_channel(channel)
+
+  for path in image.get_paths():
+    image.remove_path(path)
+
+  Gimp.Selection.none(image)
@@ -0,0 +1,414 @@
+"""Splitting batch conversion into shards processed by separate GIMP processes.
+
+The process running the plug-in (the coordinator) computes output file paths
+for all matching items up front, splits the items into contiguous shards and
+launches a worker process per shard. Each worker receives a shard manifest
+containing input files and their precomputed output file paths relative to the
+output folder. Since output names are computed in a single pass over all items,
+uniquified names and number fields remain consistent as if the items were
+processed in one process.
+
+Workers report progress and results via files whose paths are stored in the
+shard manifest. The coordinator sums up the progress of all workers while they
+run and merges the results into a single `ShardedRunResult` instance.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from src import progress as progress_
+
+
+SHARD_MANIFEST_TYPE = 'batcher_shard'
+
+GIMP_CONSOLE_ENV_VARIABLE = 'BATCHER_GIMP_CONSOLE'
+GIMP_CONSOLE_EXECUTABLE_NAMES = ['gimp-console-3.0', 'gimp-console-3', 'gimp-console']
+
+_ENCODING = 'utf-8'
+
+_NUM_LOG_LINES_IN_ERROR_MESSAGE = 10
+
+_WORKER_SCRIPT = """
+procedure = Gimp.get_pdb().lookup_procedure({procedure_name!r})
+config = procedure.create_config()
+config.set_property('run-mode', Gimp.RunMode.NONINTERACTIVE)
+config.set_property('inputs', Gio.file_new_for_path({manifest_filepath!r}))
+config.set_property('max-num-inputs', 0)
+config.set_property('settings-file', Gio.file_new_for_path({settings_filepath!r}))
+procedure.run(config)
+"""
+
+
+class ShardedRunResult:
+  """Merged results of all shards.
+
+  The attributes have the same format as the corresponding properties in
+  `src.core.Batcher`.
+  """
+
+  def __init__(self):
+    self.exported_items = []
+    self.skipped_procedures = {}
+    self.skipped_constraints = {}
+    self.failed_procedures = {}
+    self.failed_constraints = {}
+
+    self.failed_shards = {}
+    """Dictionary of (shard index, error message) pairs for shards that did not
+    finish successfully.
+    """
+
+
+class ShardProgressUpdater(progress_.ProgressUpdater):
+  """Progress updater writing the number of finished tasks to a file so that
+  the coordinator can track the progress of a worker process.
+
+  The file is replaced atomically so that the coordinator never reads a
+  partially written number.
+  """
+
+  def __init__(self, progress_bar, filepath: str, num_total_tasks: int = 0):
+    super().__init__(progress_bar, num_total_tasks=num_total_tasks)
+
+    self._filepath = filepath
+
+  def _fill_progress_bar(self):
+    _write_file_atomically(self._filepath, str(self._num_finished_tasks))
+
+
+def partition(items: Sequence, num_shards: int) -> List[List]:
+  """Splits ``items`` into at most ``num_shards`` contiguous parts of nearly
+  equal size.
+
+  Empty parts are omitted, i.e. if there are fewer items than shards, each
+  part contains exactly one item.
+
+  Raises:
+    ValueError: ``num_shards`` is less than 1.
+  """
+  if num_shards < 1:
+    raise ValueError('number of shards must be at least 1')
+
+  items = list(items)
+  num_shards = min(num_shards, len(items))
+
+  shards = []
+  start = 0
+
+  for index in range(num_shards):
+    shard_size = len(items) // num_shards + (1 if index < len(items) % num_shards else 0)
+    shards.append(items[start:start + shard_size])
+    start += shard_size
+
+  return shards
+
+
+def get_relative_export_filepath(item, state_name: str) -> str:
+  """Returns the output file path of ``item`` relative to the output folder.
+
+  The path is assembled from names stored in the named state ``state_name``
+  of the item and its parents. If an item has no such state, its current name
+  is used.
+  """
+  path_components = [_get_name_from_state(parent, state_name) for parent in item.parents]
+  path_components.append(_get_name_from_state(item, state_name))
+
+  return os.path.join(*path_components)
+
+
+def _get_name_from_state(item, state_name):
+  item_state = item.get_named_state(state_name)
+  return item_state['name'] if item_state is not None else item.name
+
+
+def write_shard_manifest(
+      filepath: str,
+      export_filepaths: Dict[str, str],
+      results_filepath: str,
+      progress_filepath: str,
+):
+  """Writes a shard manifest to ``filepath``.
+
+  ``export_filepaths`` is a dictionary of (input file path, output file path
+  relative to the output folder) pairs. The order of the dictionary determines
+  the order of processing.
+  """
+  manifest = {
+    'type': SHARD_MANIFEST_TYPE,
+    'inputs': [[input_filepath, export_filepath]
+               for input_filepath, export_filepath in export_filepaths.items()],
+    'results_file': results_filepath,
+    'progress_file': progress_filepath,
+  }
+
+  with open(filepath, 'w', encoding=_ENCODING) as manifest_file:
+    json.dump(manifest, manifest_file)
+
+
+def load_shard_manifest(filepath: str) -> Optional[Dict[str, Any]]:
+  """Returns the contents of a shard manifest, or ``None`` if ``filepath`` is
+  not a shard manifest (e.g. a plain text file with one input per line).
+
+  The returned dictionary contains the following keys:
+  * ``'export_filepaths'`` - see `write_shard_manifest()`,
+  * ``'results_file'`` - file path to write results to,
+  * ``'progress_file'`` - file path to write progress to.
+  """
+  try:
+    with open(filepath, 'r', encoding=_ENCODING) as manifest_file:
+      manifest = json.load(manifest_file)
+  except (OSError, ValueError):
+    return None
+
+  if not isinstance(manifest, dict) or manifest.get('type') != SHARD_MANIFEST_TYPE:
+    return None
+
+  return {
+    'export_filepaths': {input_filepath: export_filepath
+                         for input_filepath, export_filepath in manifest['inputs']},
+    'results_file': manifest['results_file'],
+    'progress_file': manifest['progress_file'],
+  }
+
+
+def write_shard_results(filepath: str, batcher: 'src.core.Batcher'):
+  """Writes exported items, skipped and failed actions of a worker to
+  ``filepath``.
+
+  Items are stored as their IDs (input file paths).
+  """
+  results = {
+    'exported_items': [item.id for item in batcher.exported_items],
+    'skipped_procedures': _action_results_to_json(batcher.skipped_procedures),
+    'skipped_constraints': _action_results_to_json(batcher.skipped_constraints),
+    'failed_procedures': _action_results_to_json(batcher.failed_procedures),
+    'failed_constraints': _action_results_to_json(batcher.failed_constraints),
+  }
+
+  _write_file_atomically(filepath, json.dumps(results))
+
+
+def _action_results_to_json(action_results):
+  return {
+    action_name: [
+      [item.id if item is not None else None, *other_values]
+      for item, *other_values in entries]
+    for action_name, entries in action_results.items()
+  }
+
+
+def merge_shard_results(
+      results_per_shard: Iterable[Dict[str, Any]],
+      items_per_id: Dict[str, Any],
+) -> ShardedRunResult:
+  """Merges results of multiple shards, as written by `write_shard_results()`,
+  into a single `ShardedRunResult` instance.
+
+  Item IDs are converted back to items via ``items_per_id``. Results of shards
+  are expected to be ordered by shard index.
+  """
+  merged_result = ShardedRunResult()
+
+  for results in results_per_shard:
+    merged_result.exported_items.extend(
+      items_per_id[item_id] for item_id in results['exported_items'])
+
+    for attribute_name in [
+          'skipped_procedures', 'skipped_constraints', 'failed_procedures', 'failed_constraints']:
+      merged_action_results = getattr(merged_result, attribute_name)
+
+      for action_name, entries in results[attribute_name].items():
+        merged_action_results.setdefault(action_name, []).extend(
+          (items_per_id.get(item_id) if item_id is not None else None, *other_values)
+          for item_id, *other_values in entries)
+
+  return merged_result
+
+
+def get_gimp_console_command() -> Optional[str]:
+  """Returns the path to the ``gimp-console`` executable used to run workers.
+
+  The executable can be specified via the ``BATCHER_GIMP_CONSOLE``
+  environment variable. Otherwise, the executable is looked up in ``PATH``.
+  ``None`` is returned if no executable was found.
+  """
+  command = os.environ.get(GIMP_CONSOLE_ENV_VARIABLE)
+  if command:
+    return command
+
+  for executable_name in GIMP_CONSOLE_EXECUTABLE_NAMES:
+    command = shutil.which(executable_name)
+    if command is not None:
+      return command
+
+  return None
+
+
+def get_worker_command(
+      gimp_console_command: str,
+      procedure_name: str,
+      manifest_filepath: str,
+      settings_filepath: str,
+) -> List[str]:
+  """Returns the command line running ``procedure_name`` non-interactively in a
+  new GIMP process for the specified shard manifest and settings file.
+  """
+  script = _WORKER_SCRIPT.format(
+    procedure_name=procedure_name,
+    manifest_filepath=manifest_filepath,
+    settings_filepath=settings_filepath,
+  )
+
+  return [
+    gimp_console_command,
+    '-nidfs',
+    '--quit',
+    '--batch-interpreter', 'python-fu-eval',
+    '-b', script,
+  ]
+
+
+def run_shards(
+      export_filepaths: Dict[str, str],
+      num_shards: int,
+      dirpath: str,
+      get_command_func: Callable[[str], List[str]],
+      items_per_id: Dict[str, Any],
+      progress_updater: Optional[progress_.ProgressUpdater] = None,
+      poll_interval: float = 0.5,
+      should_stop_func: Optional[Callable[[], bool]] = None,
+) -> ShardedRunResult:
+  """Splits items into shards, runs a worker process per shard and merges the
+  results once all workers finish.
+
+  Args:
+    export_filepaths:
+      Dictionary of (input file path, output file path relative to the output
+      folder) pairs for all items to process, in the order of processing.
+    num_shards:
+      Maximum number of shards (worker processes).
+    dirpath:
+      Directory to store shard manifests, progress, results and log files in.
+    get_command_func:
+      Function accepting a shard manifest file path and returning the command
+      line to start the worker process with.
+    items_per_id:
+      Dictionary of (input file path, item) pairs used to convert results
+      back to items.
+    progress_updater:
+      `src.progress.ProgressUpdater` instance advanced by the sum of items
+      finished by all workers each time the workers are checked.
+    poll_interval:
+      Time in seconds between checks of the worker processes.
+    should_stop_func:
+      Function returning ``True`` if the workers should be terminated
+      prematurely, e.g. if the user cancels processing.
+  """
+  if progress_updater is None:
+    progress_updater = progress_.ProgressUpdater(None)
+
+  progress_updater.num_total_tasks = len(export_filepaths)
+
+  processes = []
+  shard_filepaths = []
+
+  for index, shard in enumerate(partition(list(export_filepaths), num_shards)):
+    manifest_filepath = os.path.join(dirpath, f'shard_{index}.json')
+    results_filepath = os.path.join(dirpath, f'shard_{index}_results.json')
+    progress_filepath = os.path.join(dirpath, f'shard_{index}_progress.txt')
+    log_filepath = os.path.join(dirpath, f'shard_{index}_log.txt')
+
+    write_shard_manifest(
+      manifest_filepath,
+      {input_filepath: export_filepaths[input_filepath] for input_filepath in shard},
+      results_filepath,
+      progress_filepath)
+
+    with open(log_filepath, 'wb') as log_file:
+      processes.append(
+        subprocess.Popen(
+          get_command_func(manifest_filepath), stdout=log_file, stderr=subprocess.STDOUT))
+
+    shard_filepaths.append((results_filepath, progress_filepath, log_filepath))
+
+  num_finished_tasks_per_shard = [0] * len(processes)
+
+  try:
+    while any(process.poll() is None for process in processes):
+      if should_stop_func is not None and should_stop_func():
+        for process in processes:
+          process.terminate()
+
+      _update_progress(progress_updater, shard_filepaths, num_finished_tasks_per_shard)
+
+      time.sleep(poll_interval)
+  finally:
+    for process in processes:
+      if process.poll() is None:
+        process.kill()
+        process.wait()
+
+  _update_progress(progress_updater, shard_filepaths, num_finished_tasks_per_shard)
+
+  results_per_shard = []
+  failed_shards = {}
+
+  for index, (process, (results_filepath, _progress_filepath, log_filepath)) in enumerate(
+        zip(processes, shard_filepaths)):
+    try:
+      with open(results_filepath, 'r', encoding=_ENCODING) as results_file:
+        results_per_shard.append(json.load(results_file))
+    except (OSError, ValueError):
+      failed_shards[index] = (
+        f'worker exited with code {process.returncode} without reporting results'
+        f'{_get_log_tail(log_filepath)}')
+
+  merged_result = merge_shard_results(results_per_shard, items_per_id)
+  merged_result.failed_shards = failed_shards
+
+  return merged_result
+
+
+def _update_progress(progress_updater, shard_filepaths, num_finished_tasks_per_shard):
+  for index, (_results_filepath, progress_filepath, _log_filepath) in enumerate(shard_filepaths):
+    try:
+      with open(progress_filepath, 'r', encoding=_ENCODING) as progress_file:
+        num_finished_tasks = int(progress_file.read().strip() or 0)
+    except (OSError, ValueError):
+      continue
+
+    num_new_finished_tasks = min(
+      num_finished_tasks - num_finished_tasks_per_shard[index],
+      progress_updater.num_total_tasks - progress_updater.num_finished_tasks)
+
+    if num_new_finished_tasks > 0:
+      progress_updater.update_tasks(num_new_finished_tasks)
+      num_finished_tasks_per_shard[index] += num_new_finished_tasks
+
+
+def _get_log_tail(log_filepath):
+  # The log file is included in the error message as `dirpath` is usually
+  # removed after the workers finish.
+  try:
+    with open(log_filepath, 'r', encoding=_ENCODING, errors='replace') as log_file:
+      log_lines = log_file.read().splitlines()
+  except OSError:
+    return ''
+
+  if not log_lines:
+    return ''
+
+  return ':\n' + '\n'.join(log_lines[-_NUM_LOG_LINES_IN_ERROR_MESSAGE:])
+
+
+def _write_file_atomically(filepath, contents):
+  temp_filepath = f'{filepath}.tmp'
+
+  with open(temp_filepath, 'w', encoding=_ENCODING) as file_:
+    file_.write(contents)
+
+  os.replace(temp_filepath, filepath)
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+import unittest.mock as mock
+
+from src.path import dirindex
+
+
+class TestDirectoryIndex(unittest.TestCase):
+
+  def setUp(self):
+    self.temp_dir = tempfile.TemporaryDirectory()
+    self.dirpath = self.temp_dir.name
+
+    os.makedirs(os.path.join(self.dirpath, 'folder'))
+    self._create_file(os.path.join(self.dirpath, 'image.png'))
+
+    self.directory_index = dirindex.DirectoryIndex()
+
+  def tearDown(self):
+    self.temp_dir.cleanup()
+
+  @staticmethod
+  def _create_file(filepath):
+    with open(filepath, 'w'):
+      pass
+
+  def test_exists(self):
+    self.assertTrue(self.directory_index.exists(os.path.join(self.dirpath, 'image.png')))
+    self.assertTrue(self.directory_index.exists(os.path.join(self.dirpath, 'folder')))
+    self.assertFalse(self.directory_index.exists(os.path.join(self.dirpath, 'other.png')))
+    self.assertFalse(
+      self.directory_index.exists(os.path.join(self.dirpath, 'nonexistent', 'image.png')))
+
+  def test_is_dir(self):
+    self.assertTrue(self.directory_index.is_dir(os.path.join(self.dirpath, 'folder')))
+    self.assertFalse(self.directory_index.is_dir(os.path.join(self.dirpath, 'image.png')))
+    self.assertFalse(self.directory_index.is_dir(os.path.join(self.dirpath, 'nonexistent')))
+
+  def test_directory_is_scanned_once(self):
+    with mock.patch('src.path.dirindex.os.scandir', wraps=os.scandir) as scandir_mock:
+      for name in ['image.png', 'image (1).png', 'image (2).png', 'folder']:
+        self.directory_index.exists(os.path.join(self.dirpath, name))
+
+    self.assertEqual(scandir_mock.call_count, 1)
+
+  def test_changes_are_not_detected_without_revalidation(self):
+    filepath = os.path.join(self.dirpath, 'other.png')
+
+    self.assertFalse(self.directory_index.exists(filepath))
+
+    self._create_file(filepath)
+
+    self.assertFalse(self.directory_index.exists(filepath))
+
+    self.directory_index.invalidate(self.dirpath)
+
+    self.assertTrue(self.directory_index.exists(filepath))
+
+  def test_changes_are_detected_with_revalidation(self):
+    self.directory_index.revalidate = True
+    filepath = os.path.join(self.dirpath, 'other.png')
+
+    self.assertFalse(self.directory_index.exists(filepath))
+
+    self._create_file(filepath)
+    os.utime(self.dirpath, ns=(0, 0))
+
+    self.assertTrue(self.directory_index.exists(filepath))
+
+  def test_add_records_parent_folders(self):
+    self.assertFalse(self.directory_index.exists(os.path.join(self.dirpath, 'new')))
+
+    filepath = os.path.join(self.dirpath, 'new', 'subfolder', 'image.png')
+    os.makedirs(os.path.dirname(filepath))
+    self._create_file(filepath)
+
+    self.directory_index.add(filepath)
+
+    self.assertTrue(self.directory_index.exists(filepath))
+    self.assertTrue(self.directory_index.is_dir(os.path.join(self.dirpath, 'new')))
+    self.assertTrue(self.directory_index.is_dir(os.path.join(self.dirpath, 'new', 'subfolder')))
+
+  def test_remove_and_rename(self):
+    filepath = os.path.join(self.dirpath, 'image.png')
+    new_filepath = os.path.join(self.dirpath, 'image (1).png')
+
+    self.directory_index.rename(filepath, new_filepath)
+
+    self.assertFalse(self.directory_index.exists(filepath))
+    self.assertTrue(self.directory_index.exists(new_filepath))
+
+    self.directory_index.remove(new_filepath)
+
+    self.assertFalse(self.directory_index.exists(new_filepath))
@@ -277,6 +277,21 @@ def get_field_value(_field, arg1=1, arg2=2):
     string_pattern = pattern_.StringPattern(pattern, [('field', _Field().get_field_value)])
     self.assertEqual(string_pattern.substitute(), expected_output)
   
+  def test_generate_with_additional_args(self):
+    string_pattern = pattern_.StringPattern(
+      'img_[field, 3]_[field]', [('field', lambda prefix, _field, arg=2: f'{prefix}{arg}')])
+
+    self.assertEqual(string_pattern.substitute('a'), 'img_a3_a2')
+    self.assertEqual(string_pattern.substitute('b'), 'img_b3_b2')
+
+  def test_generate_with_field_raising_exception_leaves_field_unchanged(self):
+    def _raise_error(_field, *_args):
+      raise ValueError
+
+    string_pattern = pattern_.StringPattern('img_[field, 3]_[[x]]', [('field', _raise_error)])
+
+    self.assertEqual(string_pattern.substitute(), 'img_[field, 3]_[x]')
+
   def test_generate_field_function_with_kwargs_raises_error(self):
     with self.assertRaises(ValueError):
       pattern_.StringPattern('[field, 3, 4]', [('field', _get_field_value_with_kwargs)])
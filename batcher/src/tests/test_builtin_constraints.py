@@ -0,0 +1,67 @@
+import unittest
+import unittest.mock as mock
+
+import parameterized
+
+from src import builtin_constraints
+
+
+class _ItemStub:
+
+  def __init__(self, name):
+    self.name = name
+
+
+class TestCompileConstraint(unittest.TestCase):
+
+  @parameterized.parameterized.expand([
+    ('starts_with', builtin_constraints.MatchModes.STARTS_WITH, 'Fore', False, True),
+    ('starts_with_case_sensitive', builtin_constraints.MatchModes.STARTS_WITH, 'fore', False, False),
+    ('starts_with_ignore_case', builtin_constraints.MatchModes.STARTS_WITH, 'fore', True, True),
+    ('contains', builtin_constraints.MatchModes.CONTAINS, 'GROUND', True, True),
+    ('ends_with', builtin_constraints.MatchModes.ENDS_WITH, '.png', False, True),
+    ('regex', builtin_constraints.MatchModes.REGEX, r'^F\w+d\.', False, True),
+    ('invalid_regex', builtin_constraints.MatchModes.REGEX, '[', False, False),
+    ('empty_text', builtin_constraints.MatchModes.ENDS_WITH, '', False, True),
+  ])
+  def test_is_matching_text(
+        self, _test_case_suffix, match_mode, text, ignore_case_sensitivity, expected_result):
+    item = _ItemStub('Foreground.png')
+    kwargs = dict(
+      match_mode=match_mode, text=text, ignore_case_sensitivity=ignore_case_sensitivity)
+
+    compiled_function = builtin_constraints.compile_constraint(
+      builtin_constraints.is_matching_text, [None], kwargs)
+
+    self.assertEqual(compiled_function(item), expected_result)
+    self.assertEqual(
+      bool(builtin_constraints.is_matching_text(item, None, **kwargs)), expected_result)
+
+  def test_is_matching_text_with_invalid_match_mode_raises_error(self):
+    with self.assertRaises(ValueError):
+      builtin_constraints.compile_constraint(
+        builtin_constraints.is_matching_text,
+        [None],
+        dict(match_mode='invalid', text='a', ignore_case_sensitivity=False))
+
+  def test_has_matching_file_extension(self):
+    batcher = mock.Mock(file_extension='PNG')
+
+    compiled_function = builtin_constraints.compile_constraint(
+      builtin_constraints.has_matching_file_extension, [batcher], {})
+
+    self.assertTrue(compiled_function(_ItemStub('image.png')))
+    self.assertFalse(compiled_function(_ItemStub('image.jpg')))
+
+  def test_constraint_without_compiler(self):
+    function = mock.Mock(return_value=True)
+    item = _ItemStub('image.png')
+
+    compiled_function = builtin_constraints.compile_constraint(function, [1], {'a': 2})
+
+    self.assertTrue(compiled_function(item))
+    function.assert_called_once_with(item, 1, a=2)
+
+  def test_is_cheap_constraint(self):
+    self.assertTrue(builtin_constraints.is_cheap_constraint(builtin_constraints.is_matching_text))
+    self.assertFalse(builtin_constraints.is_cheap_constraint(builtin_constraints.is_visible))
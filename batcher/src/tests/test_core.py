@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 import unittest.mock as mock
 
@@ -12,9 +14,11 @@
 from src import actions as actions_
 from src import core
 from src import builtin_procedures
+from src import incremental
 from src import invoker as invoker_
 from src import plugin_settings
 from src import utils as utils_
+from src.procedure_groups import CONVERT_GROUP
 
 
 class TestBatcherInitialActions(unittest.TestCase):
@@ -226,3 +230,87 @@ def test_get_replaced_args(self):
         'offset_y': 50,
         'same_value_as_placeholder_value': 'current_image',
       })
+
+
+@mock.patch('src.core.Gimp')
+@mock.patch('src.core.Gio')
+@mock.patch('src.core.pdb')
+class TestImageBatcherWithSkipUnchanged(unittest.TestCase):
+
+  def setUp(self):
+    pg.config.PROCEDURE_GROUP = CONVERT_GROUP
+
+    self.temp_dir = tempfile.TemporaryDirectory()
+
+    self.input_dirpath = os.path.join(self.temp_dir.name, 'input')
+    self.output_dirpath = os.path.join(self.temp_dir.name, 'output')
+    os.makedirs(self.input_dirpath)
+    os.makedirs(self.output_dirpath)
+
+    self.input_filepaths = []
+    for index in range(4):
+      input_filepath = os.path.join(self.input_dirpath, f'input{index}.png')
+      with open(input_filepath, 'w') as file_:
+        file_.write(str(index))
+      self.input_filepaths.append(input_filepath)
+
+    self.exported_names = []
+
+  def tearDown(self):
+    self.temp_dir.cleanup()
+
+    pg.config.PROCEDURE_GROUP = pg.config.PLUGIN_NAME
+
+  def _export_item(self, _batcher, item, *_args, **_kwargs):
+    self.exported_names.append(item.name)
+    return 'replace', 'success'
+
+  def test_unchanged_items_are_numbered_but_not_exported(self, mock_pdb, *_mocks):
+    mock_pdb.gimp_file_load.return_value.get_layers.return_value = [mock.Mock()]
+
+    manifest = incremental.ConversionManifest(self.output_dirpath)
+    for index, output_filename in [(0, 'image001.png'), (2, 'image003.png')]:
+      output_filepath = os.path.join(self.output_dirpath, output_filename)
+      with open(output_filepath, 'w'):
+        pass
+      manifest.update(self.input_filepaths[index], 'hash', output_filepath)
+    manifest.save()
+
+    item_tree = pg.itemtree.ImageFileTree()
+    item_tree.add(self.input_filepaths)
+
+    batcher = core.ImageBatcher(
+      item_tree,
+      actions_.create('procedures'),
+      actions_.create('constraints'),
+      name_pattern='image[001]',
+      output_directory=mock.Mock(**{'get_path.return_value': self.output_dirpath}),
+      skip_unchanged=True,
+      settings_hash='hash',
+      num_images_to_prefetch=0,
+    )
+
+    with mock.patch(
+          'src.builtin_procedures._export._export_item', side_effect=self._export_item):
+      batcher.run()
+
+    self.assertListEqual(self.exported_names, ['image002', 'image004'])
+    self.assertListEqual(
+      [item.id for item in batcher.unchanged_items],
+      [self.input_filepaths[0], self.input_filepaths[2]])
+    self.assertEqual(mock_pdb.gimp_file_load.call_count, 2)
+
+  def test_processing_unchanged_item_names_preserves_process_export(self, *_mocks):
+    batcher = core.ImageBatcher(
+      pg.itemtree.ImageFileTree(),
+      actions_.create('procedures'),
+      actions_.create('constraints'),
+    )
+    batcher._invoker = mock.Mock()
+
+    for process_export in [False, True]:
+      batcher._process_export = process_export
+
+      batcher._process_unchanged_item_names()
+
+      self.assertEqual(batcher.process_export, process_export)
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from src import export_writer
+
+
+class TestBackgroundFileWriter(unittest.TestCase):
+
+  def setUp(self):
+    self.temp_dir = tempfile.TemporaryDirectory()
+    self.output_dirpath = self.temp_dir.name
+
+    self.file_writer = export_writer.BackgroundFileWriter(
+      max_pending_files=2, fsync_batch_size=2)
+    self.file_writer.start()
+
+  def tearDown(self):
+    self.file_writer.finish()
+    self.temp_dir.cleanup()
+
+  def _write_temp_file(self, output_filepath, contents):
+    temp_filepath = self.file_writer.get_temp_filepath(output_filepath)
+    with open(temp_filepath, 'w') as file_:
+      file_.write(contents)
+
+    return temp_filepath
+
+  def test_get_temp_filepath_preserves_file_extension_and_is_unique(self):
+    output_filepath = os.path.join(self.output_dirpath, 'image.png')
+
+    temp_filepath_1 = self.file_writer.get_temp_filepath(output_filepath)
+    temp_filepath_2 = self.file_writer.get_temp_filepath(output_filepath)
+
+    self.assertTrue(temp_filepath_1.endswith('image.png'))
+    self.assertNotEqual(temp_filepath_1, temp_filepath_2)
+    self.assertNotEqual(os.path.dirname(temp_filepath_1), self.output_dirpath)
+
+  def test_submit_moves_files(self):
+    output_filepaths = [
+      os.path.join(self.output_dirpath, f'image_{index}.png') for index in range(5)]
+
+    for index, output_filepath in enumerate(output_filepaths):
+      temp_filepath = self._write_temp_file(output_filepath, str(index))
+      self.file_writer.submit(temp_filepath, output_filepath, (f'image_{index}', 'png'))
+
+    self.assertEqual(self.file_writer.finish(), [])
+
+    for index, output_filepath in enumerate(output_filepaths):
+      with open(output_filepath, 'r') as file_:
+        self.assertEqual(file_.read(), str(index))
+
+  def test_errors_are_reported_with_context(self):
+    output_filepath = os.path.join(self.output_dirpath, 'nonexistent_folder', 'image.png')
+    temp_filepath = self._write_temp_file(output_filepath, 'data')
+
+    self.file_writer.submit(temp_filepath, output_filepath, ('image', 'png'))
+
+    errors = self.file_writer.finish()
+
+    self.assertEqual(len(errors), 1)
+    self.assertEqual(errors[0][0], ('image', 'png'))
+    self.assertIsInstance(errors[0][1], OSError)
+
+  def test_finish_removes_temporary_folder(self):
+    temp_dirpath = os.path.dirname(
+      self.file_writer.get_temp_filepath(os.path.join(self.output_dirpath, 'image.png')))
+
+    self.file_writer.finish()
+
+    self.assertFalse(os.path.exists(temp_dirpath))
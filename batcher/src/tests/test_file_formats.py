@@ -111,3 +111,17 @@ def test_fill_file_format_options_unrecognized_format(
 
     mock_get_setting_data_from_pdb_procedure.assert_not_called()
     self.assertFalse(file_format_options)
+
+
+class TestFileFormat(unittest.TestCase):
+
+  def test_get_thumbnail_import_procedure_name(self):
+    self.assertEqual(
+      file_formats_.FILE_FORMATS_DICT['jpg'].get_thumbnail_import_procedure_name(),
+      'file-jpeg-load-thumb')
+
+  def test_get_thumbnail_import_procedure_name_without_import_procedure(self):
+    file_format = file_formats_._FileFormat(['abc'])
+
+    self.assertIsNone(file_format.get_thumbnail_import_procedure_name())
+    self.assertFalse(file_format.has_thumbnail_import_proc())
@@ -0,0 +1,132 @@
+import os
+import tempfile
+import unittest
+
+from src import incremental
+
+
+class TestGetSettingsHash(unittest.TestCase):
+
+  def test_same_settings_produce_same_hash(self):
+    self.assertEqual(
+      incremental.get_settings_hash({'a': 1, 'b': [1, 2]}),
+      incremental.get_settings_hash({'b': [1, 2], 'a': 1}))
+
+  def test_different_settings_produce_different_hash(self):
+    self.assertNotEqual(
+      incremental.get_settings_hash({'a': 1}),
+      incremental.get_settings_hash({'a': 2}))
+
+
+class TestConversionManifest(unittest.TestCase):
+
+  def setUp(self):
+    self.temp_dir = tempfile.TemporaryDirectory()
+
+    self.input_dirpath = os.path.join(self.temp_dir.name, 'input')
+    self.output_dirpath = os.path.join(self.temp_dir.name, 'output')
+    os.makedirs(self.input_dirpath)
+    os.makedirs(self.output_dirpath)
+
+    self.input_filepath = os.path.join(self.input_dirpath, 'image.jpg')
+    self.output_filepath = os.path.join(self.output_dirpath, 'image.png')
+
+    self._write_file(self.input_filepath, 'input')
+    self._write_file(self.output_filepath, 'output')
+
+    self.manifest = incremental.ConversionManifest(self.output_dirpath)
+
+  def tearDown(self):
+    self.temp_dir.cleanup()
+
+  @staticmethod
+  def _write_file(filepath, contents, mtime_ns=None):
+    with open(filepath, 'w') as file_:
+      file_.write(contents)
+
+    if mtime_ns is not None:
+      os.utime(filepath, ns=(mtime_ns, mtime_ns))
+
+  def test_file_without_entry_is_changed(self):
+    self.assertFalse(self.manifest.is_unchanged(self.input_filepath, 'hash'))
+
+  def test_file_with_matching_entry_is_unchanged(self):
+    self.manifest.update(self.input_filepath, 'hash', self.output_filepath)
+
+    self.assertTrue(self.manifest.is_unchanged(self.input_filepath, 'hash'))
+    self.assertEqual(self.manifest.get_entry(self.input_filepath)['output_path'], 'image.png')
+
+  def test_different_settings_hash(self):
+    self.manifest.update(self.input_filepath, 'hash', self.output_filepath)
+
+    self.assertFalse(self.manifest.is_unchanged(self.input_filepath, 'other_hash'))
+
+  def test_modified_file(self):
+    self.manifest.update(self.input_filepath, 'hash', self.output_filepath)
+
+    self._write_file(self.input_filepath, 'modified input')
+
+    self.assertFalse(self.manifest.is_unchanged(self.input_filepath, 'hash'))
+
+  def test_missing_output_file(self):
+    self.manifest.update(self.input_filepath, 'hash', self.output_filepath)
+
+    os.remove(self.output_filepath)
+
+    self.assertFalse(self.manifest.is_unchanged(self.input_filepath, 'hash'))
+
+  def test_changed_modification_time_with_same_contents(self):
+    self._write_file(self.input_filepath, 'input', mtime_ns=1_000_000_000)
+    self.manifest.update(self.input_filepath, 'hash', self.output_filepath)
+
+    self._write_file(self.input_filepath, 'input', mtime_ns=2_000_000_000)
+
+    self.assertFalse(self.manifest.is_unchanged(self.input_filepath, 'hash'))
+
+  def test_changed_modification_time_with_same_contents_and_content_hash(self):
+    manifest = incremental.ConversionManifest(self.output_dirpath, use_content_hash=True)
+
+    self._write_file(self.input_filepath, 'input', mtime_ns=1_000_000_000)
+    manifest.update(self.input_filepath, 'hash', self.output_filepath)
+
+    self._write_file(self.input_filepath, 'input', mtime_ns=2_000_000_000)
+    self.assertTrue(manifest.is_unchanged(self.input_filepath, 'hash'))
+
+    self._write_file(self.input_filepath, 'other', mtime_ns=3_000_000_000)
+    self.assertFalse(manifest.is_unchanged(self.input_filepath, 'hash'))
+
+  def test_save_and_load(self):
+    self.manifest.update(self.input_filepath, 'hash', self.output_filepath)
+    self.manifest.save()
+
+    loaded_manifest = incremental.ConversionManifest(self.output_dirpath)
+
+    self.assertTrue(loaded_manifest.load())
+    self.assertEqual(len(loaded_manifest), 1)
+    self.assertTrue(loaded_manifest.is_unchanged(self.input_filepath, 'hash'))
+    self.assertFalse(os.path.exists(f'{loaded_manifest.filepath}.tmp'))
+
+  def test_load_missing_or_invalid_file(self):
+    self.assertFalse(self.manifest.load())
+
+    self._write_file(self.manifest.filepath, '{"type": "something_else"}')
+    self.assertFalse(self.manifest.load())
+
+    self._write_file(self.manifest.filepath, 'not json')
+    self.assertFalse(self.manifest.load())
+
+    self.assertEqual(len(self.manifest), 0)
+
+  def test_clear(self):
+    self.manifest.update(self.input_filepath, 'hash', self.output_filepath)
+    self.manifest.clear()
+
+    self.assertFalse(self.manifest.is_unchanged(self.input_filepath, 'hash'))
+
+  def test_update_with_missing_input_file_removes_entry(self):
+    self.manifest.update(self.input_filepath, 'hash', self.output_filepath)
+
+    os.remove(self.input_filepath)
+    self.manifest.update(self.input_filepath, 'hash', self.output_filepath)
+
+    self.assertIsNone(self.manifest.get_entry(self.input_filepath))
@@ -743,6 +743,38 @@ def append_to_list_and_remove_action(list_, arg):
     
     self.assertEqual(test_list, ['one', 'two', 'four'])
   
+  def test_invoke_while_adding_action_inside_action(self):
+    def append_to_list_and_add_action(list_, arg):
+      list_.append(arg)
+      self.invoker.add(append_to_list, ['main'], args=[test_list, 'three'])
+    
+    test_list = []
+    action_id = self.invoker.add(
+      append_to_list_and_add_action, ['main'], args=[test_list, 'one'])
+    self.invoker.add(append_to_list, ['main'], args=[test_list, 'two'])
+    
+    self.invoker.invoke(['main'])
+    
+    self.assertEqual(test_list, ['one', 'two'])
+    
+    self.invoker.remove(action_id, ['main'])
+    test_list.clear()
+    
+    self.invoker.invoke(['main'])
+    
+    self.assertEqual(test_list, ['two', 'three'])
+  
+  def test_invoke_after_reorder(self):
+    test_list = []
+    self.invoker.add(append_to_list, args=[test_list, 'one'])
+    action_2_id = self.invoker.add(append_to_list, args=[test_list, 'two'])
+    
+    self.invoker.invoke()
+    self.invoker.reorder(action_2_id, 0)
+    self.invoker.invoke()
+    
+    self.assertEqual(test_list, ['one', 'two', 'two', 'one'])
+  
   def test_invoke_with_generator(self):
     test_list = []
     
@@ -800,6 +832,41 @@ def test_invoke_with_generator_finite_multiple_groups(self):
     self.invoker.invoke(['b'], additional_args=[5])
     
     self.assertEqual(test_list, [1, 2, 1, 5])
+  
+  def test_invoke_in_steps(self):
+    test_list = []
+    
+    self.invoker.add(append_to_list, args=[test_list, 1])
+    self.invoker.add(append_to_list, args=[test_list, 2])
+    
+    invoke_steps = self.invoker.invoke_in_steps()
+    
+    self.assertEqual(test_list, [])
+    
+    next(invoke_steps)
+    self.assertEqual(test_list, [1])
+    
+    next(invoke_steps)
+    self.assertEqual(test_list, [1, 2])
+    
+    with self.assertRaises(StopIteration):
+      next(invoke_steps)
+  
+  def test_invoke_in_steps_closed_prematurely(self):
+    test_list = []
+    
+    self.invoker.add(append_to_list, args=[test_list, 1])
+    self.invoker.add(append_to_list, args=[test_list, 2])
+    
+    invoke_steps = self.invoker.invoke_in_steps()
+    next(invoke_steps)
+    invoke_steps.close()
+    
+    self.assertEqual(test_list, [1])
+    
+    self.invoker.invoke()
+    
+    self.assertEqual(test_list, [1, 1, 2])
 
 
 class TestInvokerInvokeForeachActions(InvokerTestCase):
@@ -881,6 +948,23 @@ def test_invoke_multiple_foreachs(
     
     self.assertListEqual(test_list, expected_result)
   
+  def test_invoke_foreach_added_and_removed_between_invocations(self):
+    test_list = []
+    self.invoker.add(append_to_list, args=[test_list, 1])
+    
+    self.invoker.invoke()
+    
+    foreach_action_id = self.invoker.add(
+      append_to_list, args=[test_list, 2], foreach=True)
+    
+    self.invoker.invoke()
+    
+    self.invoker.remove(foreach_action_id)
+    
+    self.invoker.invoke()
+    
+    self.assertListEqual(test_list, [1, 1, 2, 1])
+  
   def test_invoke_foreach_use_return_value_from_action(self):
     test_list = []
     self.invoker.add(append_to_list, args=[test_list, 1])
@@ -941,6 +1025,19 @@ def test_invoke(self):
     
     self.assertListEqual(test_list, [2, 1, 'test'])
   
+  def test_invoke_in_steps_yields_after_actions_in_invoker(self):
+    test_list = []
+    another_invoker = invoker_.Invoker()
+    another_invoker.add(append_to_list, args=[test_list, 1])
+    another_invoker.add(append_test, args=[test_list])
+    
+    self.invoker.add(append_to_list, args=[test_list, 2])
+    self.invoker.add(another_invoker)
+    
+    lists_after_steps = [list(test_list) for _unused in self.invoker.invoke_in_steps()]
+    
+    self.assertListEqual(lists_after_steps, [[2], [2, 1], [2, 1, 'test']])
+  
   def test_invoke_after_adding_actions_to_invoker(self):
     test_list = []
     another_invoker = invoker_.Invoker()
@@ -1,7 +1,10 @@
+import os
+import tempfile
 import unittest
 import unittest.mock as mock
 
 from src import overwrite
+from src.path import dirindex
 
 
 class InteractiveOverwriteChooserStub(overwrite.InteractiveOverwriteChooser):
@@ -72,3 +75,50 @@ def test_handle_overwrite_file_does_not_exist(self, mock_os_path_exists):
     self.assertEqual(
       overwrite.handle_overwrite(self.filepath, self.overwrite_chooser),
       (overwrite.OverwriteModes.DO_NOTHING, self.filepath))
+
+
+class TestHandleOverwriteWithDirectoryIndex(unittest.TestCase):
+
+  def setUp(self):
+    self.temp_dir = tempfile.TemporaryDirectory()
+
+    self.filepath = os.path.join(self.temp_dir.name, 'image.png')
+    with open(self.filepath, 'w'):
+      pass
+
+    self.directory_index = dirindex.DirectoryIndex()
+
+  def tearDown(self):
+    self.temp_dir.cleanup()
+
+  def test_rename_new(self):
+    with open(os.path.join(self.temp_dir.name, 'image (1).png'), 'w'):
+      pass
+
+    overwrite_chooser = overwrite.NoninteractiveOverwriteChooser(
+      overwrite.OverwriteModes.RENAME_NEW)
+
+    with mock.patch('src.overwrite.os.path.exists') as mock_os_path_exists:
+      self.assertEqual(
+        overwrite.handle_overwrite(
+          self.filepath,
+          overwrite_chooser,
+          len(self.filepath) - len('.png'),
+          directory_index=self.directory_index),
+        (overwrite.OverwriteModes.RENAME_NEW,
+         os.path.join(self.temp_dir.name, 'image (2).png')))
+
+    mock_os_path_exists.assert_not_called()
+
+  def test_rename_existing(self):
+    overwrite_chooser = overwrite.NoninteractiveOverwriteChooser(
+      overwrite.OverwriteModes.RENAME_EXISTING)
+
+    overwrite.handle_overwrite(
+      self.filepath, overwrite_chooser, directory_index=self.directory_index)
+
+    renamed_filepath = os.path.join(self.temp_dir.name, 'image.png (1)')
+
+    self.assertTrue(os.path.isfile(renamed_filepath))
+    self.assertTrue(self.directory_index.exists(renamed_filepath))
+    self.assertFalse(self.directory_index.exists(self.filepath))
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+import unittest.mock as mock
+
+from src import prefetch
+
+
+class TestFilePrefetcher(unittest.TestCase):
+
+  def setUp(self):
+    self.temp_dir = tempfile.TemporaryDirectory()
+
+    self.filepaths = []
+    for index in range(4):
+      filepath = os.path.join(self.temp_dir.name, f'image_{index}.png')
+      with open(filepath, 'wb') as file_:
+        file_.write(b'x' * 100)
+      self.filepaths.append(filepath)
+
+  def tearDown(self):
+    self.temp_dir.cleanup()
+
+  def _wait_until(self, condition_func, timeout=5.0):
+    start_time = time.time()
+    while not condition_func():
+      if time.time() - start_time > timeout:
+        self.fail('timed out waiting for the prefetcher')
+      time.sleep(0.001)
+
+  def test_consume_prefetched_files_counts_hits(self):
+    prefetcher = prefetch.FilePrefetcher(1000, chunk_size=10)
+    prefetcher.start()
+
+    prefetcher.schedule(self.filepaths[:2])
+    self._wait_until(lambda: prefetcher.stats.num_bytes_read == 200)
+
+    self.assertTrue(prefetcher.consume(self.filepaths[0]))
+    self.assertTrue(prefetcher.consume(self.filepaths[1]))
+
+    prefetcher.stop()
+
+    self.assertEqual(prefetcher.stats.num_hits, 2)
+    self.assertEqual(prefetcher.stats.num_misses, 0)
+    self.assertEqual(prefetcher.stats.hit_rate, 1.0)
+
+  def test_consume_unscheduled_file_counts_miss(self):
+    prefetcher = prefetch.FilePrefetcher(1000)
+    prefetcher.start()
+
+    self.assertFalse(prefetcher.consume(self.filepaths[0]))
+
+    prefetcher.stop()
+
+    self.assertEqual(prefetcher.stats.num_misses, 1)
+    self.assertEqual(prefetcher.stats.num_bytes_read, 0)
+
+  def test_byte_budget_limits_files_read_ahead(self):
+    prefetcher = prefetch.FilePrefetcher(250)
+    prefetcher.start()
+
+    prefetcher.schedule(self.filepaths)
+    self._wait_until(lambda: prefetcher.stats.num_bytes_read == 200)
+    time.sleep(0.05)
+
+    self.assertEqual(prefetcher.stats.num_bytes_read, 200)
+
+    prefetcher.consume(self.filepaths[0])
+    self._wait_until(lambda: prefetcher.stats.num_bytes_read == 300)
+
+    prefetcher.stop()
+
+  def test_files_larger_than_byte_budget_are_skipped(self):
+    prefetcher = prefetch.FilePrefetcher(50)
+    prefetcher.start()
+
+    prefetcher.schedule(self.filepaths[:1])
+    time.sleep(0.05)
+
+    self.assertFalse(prefetcher.consume(self.filepaths[0]))
+
+    prefetcher.stop()
+
+    self.assertEqual(prefetcher.stats.num_bytes_read, 0)
+
+  def test_consumed_file_can_be_scheduled_again(self):
+    prefetcher = prefetch.FilePrefetcher(1000)
+    prefetcher.start()
+
+    prefetcher.schedule(self.filepaths[:1])
+    self._wait_until(lambda: prefetcher.stats.num_bytes_read == 100)
+
+    prefetcher.schedule(self.filepaths[:1])
+    time.sleep(0.05)
+
+    self.assertEqual(prefetcher.stats.num_bytes_read, 100)
+
+    self.assertTrue(prefetcher.consume(self.filepaths[0]))
+
+    prefetcher.schedule(self.filepaths[:1])
+    self._wait_until(lambda: prefetcher.stats.num_bytes_read == 200)
+
+    prefetcher.stop()
+
+  def test_consume_is_not_blocked_while_obtaining_file_size(self):
+    getsize_started = threading.Event()
+    getsize_can_finish = threading.Event()
+
+    def _getsize(filepath):
+      getsize_started.set()
+      getsize_can_finish.wait(5.0)
+      return os.stat(filepath).st_size
+
+    prefetcher = prefetch.FilePrefetcher(1000)
+
+    with mock.patch('src.prefetch.os.path.getsize', side_effect=_getsize):
+      prefetcher.start()
+      prefetcher.schedule(self.filepaths[:1])
+
+      self.assertTrue(getsize_started.wait(5.0))
+
+      consume_thread = threading.Thread(target=prefetcher.consume, args=[self.filepaths[0]])
+      consume_thread.start()
+      consume_thread.join(1.0)
+
+      self.assertFalse(consume_thread.is_alive())
+
+      getsize_can_finish.set()
+      prefetcher.stop()
+
+    self.assertEqual(prefetcher.stats.num_misses, 1)
+    self.assertEqual(prefetcher.stats.num_bytes_read, 0)
+
+  def test_stop_without_start(self):
+    prefetcher = prefetch.FilePrefetcher(1000)
+    prefetcher.schedule(self.filepaths)
+    prefetcher.stop()
+
+    self.assertEqual(prefetcher.stats.num_bytes_read, 0)
@@ -0,0 +1,77 @@
+import unittest
+
+from src import preview_cache
+
+
+class TestPreviewCache(unittest.TestCase):
+
+  def setUp(self):
+    self.cache = preview_cache.PreviewCache(max_bytes=100)
+
+  def test_get(self):
+    self.cache.add('item', 'preview', 10)
+
+    self.assertEqual(self.cache.get('item'), 'preview')
+    self.assertIsNone(self.cache.get('another_item'))
+    self.assertEqual(self.cache.stats.num_hits, 1)
+    self.assertEqual(self.cache.stats.num_misses, 1)
+
+  def test_add_replaces_preview_with_the_same_key(self):
+    self.cache.add('item', 'preview', 10)
+    self.cache.add('item', 'new_preview', 20)
+
+    self.assertEqual(self.cache.get('item'), 'new_preview')
+    self.assertEqual(len(self.cache), 1)
+    self.assertEqual(self.cache.num_bytes, 20)
+
+  def test_add_evicts_least_recently_used_previews(self):
+    self.cache.add('item1', 'preview1', 40)
+    self.cache.add('item2', 'preview2', 40)
+    self.cache.get('item1')
+
+    self.cache.add('item3', 'preview3', 40)
+
+    self.assertIn('item1', self.cache)
+    self.assertNotIn('item2', self.cache)
+    self.assertIn('item3', self.cache)
+    self.assertEqual(self.cache.num_bytes, 80)
+    self.assertEqual(self.cache.stats.num_evictions, 1)
+
+  def test_add_preview_larger_than_max_bytes_is_not_cached(self):
+    self.cache.add('item1', 'preview1', 40)
+    self.cache.add('item2', 'preview2', 101)
+
+    self.assertIn('item1', self.cache)
+    self.assertNotIn('item2', self.cache)
+    self.assertEqual(self.cache.num_bytes, 40)
+
+  def test_remove_and_clear(self):
+    self.cache.add('item1', 'preview1', 40)
+    self.cache.add('item2', 'preview2', 40)
+
+    self.cache.remove('item1')
+    self.cache.remove('nonexistent_item')
+
+    self.assertNotIn('item1', self.cache)
+    self.assertEqual(self.cache.num_bytes, 40)
+
+    self.cache.clear()
+
+    self.assertEqual(len(self.cache), 0)
+    self.assertEqual(self.cache.num_bytes, 0)
+
+  def test_remove_func_is_called_for_removed_previews(self):
+    removed_previews = []
+    cache = preview_cache.PreviewCache(max_bytes=100, remove_func=removed_previews.append)
+
+    cache.add('item1', 'preview1', 40)
+    cache.add('item2', 'preview2', 40)
+    cache.add('item3', 'preview3', 40)
+    cache.add('item4', 'preview4', 101)
+    cache.add('item2', 'new_preview2', 40)
+    cache.remove('item3')
+    cache.clear()
+
+    self.assertListEqual(
+      removed_previews,
+      ['preview1', 'preview4', 'preview2', 'preview3', 'new_preview2'])
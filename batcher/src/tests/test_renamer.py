@@ -191,3 +191,59 @@ def test_rename(self, test_case_suffix, pattern, expected_layer_names_str):
     self.assertListEqual(
       [renamed_item.name for renamed_item in layer_tree.iter(with_folders=False, filtered=False)],
       [expected_item.name for expected_item in expected_layer_tree])
+
+
+class TestReplaceField(unittest.TestCase):
+
+  def setUp(self):
+    self.fields_raw = renamer_.get_fields([EXPORT_LAYERS_GROUP])
+
+    self.batcher_mock = mock.Mock()
+    self.batcher_mock.current_item = mock.Mock()
+    self.batcher_mock.current_item.name = 'Animal copy #1'
+
+  @parameterized.parameterized.expand([
+    ('simple',
+     '[replace, [layer name], [a], [b] ]', 'Animbl copy #1'),
+    ('regex',
+     '[replace, [layer name], [ copy(?: #[[0-9]]+)*$], [] ]', 'Animal'),
+    ('count_and_flags',
+     '[replace, [layer name], [a], [b], 1, ignorecase]', 'bnimal copy #1'),
+    ('unknown_field_to_replace',
+     'img_[replace, [unknown], [a], [b] ]', 'img_'),
+    ('invalid_regex_leaves_field_unchanged',
+     'img_[replace, [layer name], [(], [b] ]', 'img_[replace, [layer name], [(], [b] ]'),
+  ])
+  def test_replace(self, test_case_suffix, pattern, expected_name):
+    renamer = renamer_.ItemRenamer(pattern, fields_raw=self.fields_raw)
+
+    self.assertEqual(renamer.rename(self.batcher_mock), expected_name)
+
+  def test_replace_arguments_are_parsed_once_per_renamer(self):
+    renamer = renamer_.ItemRenamer(
+      '[replace, [layer name], [a], [b] ]', fields_raw=self.fields_raw)
+
+    with mock.patch.object(
+          renamer_.pattern_.StringPattern, 'parse_field',
+          wraps=renamer_.pattern_.StringPattern.parse_field) as parse_field_mock:
+      for name in ['Animal', 'Cat', 'Dog']:
+        self.batcher_mock.current_item.name = name
+        renamer.rename(self.batcher_mock)
+
+    self.assertEqual(parse_field_mock.call_count, 1)
+    self.assertEqual(renamer.rename(self.batcher_mock), 'Dog')
+
+
+class TestUsesNumberOfItems(unittest.TestCase):
+
+  @parameterized.parameterized.expand([
+    ('descending_from_number_of_items', 'image[000, %d]', True),
+    ('descending_from_number_of_items_with_padding', 'image[00, %d3]', True),
+    ('descending_from_number_of_items_without_resetting', 'image[000, %n, %d]', True),
+    ('descending_from_specific_number', 'image[010, %d]', False),
+    ('ascending', 'image[000]', False),
+    ('escaped_field', 'image[[000, %d]]', False),
+    ('no_number_field', '[image name]', False),
+  ])
+  def test_uses_number_of_items(self, test_case_suffix, pattern, expected_result):
+    self.assertEqual(renamer_.uses_number_of_items(pattern), expected_result)
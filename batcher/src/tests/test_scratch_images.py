@@ -0,0 +1,175 @@
+import unittest
+import unittest.mock as mock
+
+from src import actions as actions_
+from src import core
+from src import scratch_images
+
+
+class _ImageStub:
+
+  def __init__(self, width=100, height=100):
+    self.width = width
+    self.height = height
+
+    self.layers = []
+    self.valid = True
+
+  def get_width(self):
+    return self.width
+
+  def get_height(self):
+    return self.height
+
+  @staticmethod
+  def get_base_type():
+    return 0
+
+  @staticmethod
+  def get_precision():
+    return 0
+
+  @staticmethod
+  def get_resolution():
+    return True, 72.0, 72.0
+
+  @staticmethod
+  def get_unit():
+    return None
+
+  @staticmethod
+  def get_parasite_list():
+    return []
+
+  def get_layers(self):
+    return list(self.layers)
+
+  @staticmethod
+  def get_channels():
+    return []
+
+  @staticmethod
+  def get_paths():
+    return []
+
+  def remove_layer(self, layer):
+    self.layers.remove(layer)
+
+  def is_valid(self):
+    return self.valid
+
+  def delete(self):
+    self.valid = False
+
+
+def _create_empty_image_copy(image):
+  return _ImageStub(image.get_width(), image.get_height())
+
+
+@mock.patch('src.scratch_images.Gimp.Selection.none')
+@mock.patch('src.scratch_images.utils.create_empty_image_copy', new=_create_empty_image_copy)
+class TestScratchImagePool(unittest.TestCase):
+
+  def setUp(self):
+    self.pool = scratch_images.ScratchImagePool()
+    self.image = _ImageStub()
+
+  def test_acquire_reuses_released_image(self, *_mocks):
+    scratch_image = self.pool.acquire(self.image)
+    scratch_image.layers.append('layer')
+    self.pool.release(scratch_image)
+
+    reused_scratch_image = self.pool.acquire(self.image)
+
+    self.assertIs(reused_scratch_image, scratch_image)
+    self.assertFalse(reused_scratch_image.layers)
+    self.assertEqual(self.pool.stats.num_images_created, 1)
+    self.assertEqual(self.pool.stats.num_copies_avoided, 1)
+
+  def test_acquire_without_release_creates_new_image(self, *_mocks):
+    scratch_image = self.pool.acquire(self.image)
+    another_scratch_image = self.pool.acquire(self.image)
+
+    self.assertIsNot(another_scratch_image, scratch_image)
+    self.assertEqual(self.pool.stats.num_images_created, 2)
+    self.assertEqual(self.pool.stats.num_copies_avoided, 0)
+
+  def test_release_discards_image_with_changed_attributes(self, *_mocks):
+    scratch_image = self.pool.acquire(self.image)
+    scratch_image.width = 50
+    self.pool.release(scratch_image)
+
+    new_scratch_image = self.pool.acquire(self.image)
+
+    self.assertIsNot(new_scratch_image, scratch_image)
+    self.assertFalse(scratch_image.is_valid())
+    self.assertEqual(self.pool.stats.num_images_discarded, 1)
+    self.assertEqual(self.pool.stats.num_copies_avoided, 0)
+
+  def test_clear_deletes_all_images(self, *_mocks):
+    released_scratch_image = self.pool.acquire(self.image)
+    acquired_scratch_image = self.pool.acquire(self.image)
+    self.pool.release(released_scratch_image)
+
+    self.pool.clear()
+
+    self.assertFalse(released_scratch_image.is_valid())
+    self.assertFalse(acquired_scratch_image.is_valid())
+
+
+@mock.patch('src.scratch_images.Gimp.Selection.none')
+@mock.patch('src.scratch_images.utils.create_empty_image_copy', new=_create_empty_image_copy)
+@mock.patch('src.core._copy_layer_to_image')
+class TestLayerBatcherWithScratchImages(unittest.TestCase):
+
+  def setUp(self):
+    self.batcher = core.LayerBatcher(
+      mock.Mock(),
+      actions_.create('procedures'),
+      actions_.create('constraints'),
+      reuse_image_copies=True,
+    )
+
+    self.pool = scratch_images.ScratchImagePool()
+    self.batcher._scratch_image_pool = self.pool
+
+    self.image = _ImageStub()
+
+  def _process_item_with_actions(self):
+    self.batcher._current_image = self.image
+    self.batcher._current_layer = mock.Mock()
+
+    return self.batcher._process_item_with_actions()
+
+  def test_scratch_image_is_reused_after_procedure_raises_exception(self, *_mocks):
+    def _process_item_with_actions_raising_exception(_batcher):
+      raise ValueError('error')
+      # noinspection PyUnreachableCode
+      yield
+
+    with mock.patch(
+          'src.core.Batcher._process_item_with_actions',
+          new=_process_item_with_actions_raising_exception):
+      with self.assertRaises(ValueError):
+        list(self._process_item_with_actions())
+
+    self.pool.acquire(self.image)
+
+    self.assertEqual(self.pool.stats.num_images_created, 1)
+    self.assertEqual(self.pool.stats.num_copies_avoided, 1)
+
+  def test_scratch_image_is_reused_after_processing_is_closed_early(self, *_mocks):
+    def _process_item_with_actions_in_steps(_batcher):
+      yield
+      yield
+
+    with mock.patch(
+          'src.core.Batcher._process_item_with_actions', new=_process_item_with_actions_in_steps):
+      steps = self._process_item_with_actions()
+      next(steps)
+      steps.close()
+
+    self.pool.acquire(self.image)
+
+    self.assertEqual(self.pool.stats.num_images_created, 1)
+    self.assertEqual(self.pool.stats.num_copies_avoided, 1)
@@ -0,0 +1,247 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import parameterized
+
+from src import progress as progress_
+from src import sharding
+
+
+class ItemStub:
+
+  def __init__(self, id_):
+    self.id = id_
+
+
+class BatcherStub:
+
+  def __init__(
+        self,
+        exported_items=None,
+        skipped_procedures=None,
+        skipped_constraints=None,
+        failed_procedures=None,
+        failed_constraints=None,
+  ):
+    self.exported_items = exported_items if exported_items is not None else []
+    self.skipped_procedures = skipped_procedures if skipped_procedures is not None else {}
+    self.skipped_constraints = skipped_constraints if skipped_constraints is not None else {}
+    self.failed_procedures = failed_procedures if failed_procedures is not None else {}
+    self.failed_constraints = failed_constraints if failed_constraints is not None else {}
+
+
+class TestPartition(unittest.TestCase):
+
+  @parameterized.parameterized.expand([
+    ('even', list(range(6)), 3, [[0, 1], [2, 3], [4, 5]]),
+    ('uneven', list(range(7)), 3, [[0, 1, 2], [3, 4], [5, 6]]),
+    ('fewer_items_than_shards', list(range(2)), 4, [[0], [1]]),
+    ('single_shard', list(range(3)), 1, [[0, 1, 2]]),
+    ('no_items', [], 3, []),
+  ])
+  def test_partition(self, _test_case_suffix, items, num_shards, expected_shards):
+    self.assertEqual(sharding.partition(items, num_shards), expected_shards)
+
+  def test_partition_invalid_number_of_shards(self):
+    with self.assertRaises(ValueError):
+      sharding.partition([1, 2], 0)
+
+
+class TestShardManifestAndResults(unittest.TestCase):
+
+  def setUp(self):
+    self.temp_dir = tempfile.TemporaryDirectory()
+    self.dirpath = self.temp_dir.name
+
+  def tearDown(self):
+    self.temp_dir.cleanup()
+
+  def test_write_and_load_shard_manifest(self):
+    manifest_filepath = os.path.join(self.dirpath, 'shard.json')
+    export_filepaths = {
+      '/inputs/b.jpg': os.path.join('Folder', 'b.png'),
+      '/inputs/a.jpg': 'a (1).png',
+    }
+
+    sharding.write_shard_manifest(manifest_filepath, export_filepaths, 'results', 'progress')
+
+    manifest = sharding.load_shard_manifest(manifest_filepath)
+
+    self.assertEqual(manifest['export_filepaths'], export_filepaths)
+    self.assertEqual(list(manifest['export_filepaths']), list(export_filepaths))
+    self.assertEqual(manifest['results_file'], 'results')
+    self.assertEqual(manifest['progress_file'], 'progress')
+
+  def test_load_shard_manifest_plain_text_inputs_file(self):
+    inputs_filepath = os.path.join(self.dirpath, 'inputs.txt')
+    with open(inputs_filepath, 'w') as inputs_file:
+      inputs_file.write('/inputs/a.jpg\n/inputs/b.jpg\n')
+
+    self.assertIsNone(sharding.load_shard_manifest(inputs_filepath))
+
+  def test_write_and_merge_shard_results(self):
+    items = {id_: ItemStub(id_) for id_ in ['a', 'b', 'c', 'd']}
+
+    batchers = [
+      BatcherStub(
+        exported_items=[items['a']],
+        failed_procedures={'scale': [(items['b'], 'error', 'trace')]},
+        skipped_constraints={'visible': [(items['b'], 'skipped')]},
+      ),
+      BatcherStub(
+        exported_items=[items['c'], items['d']],
+        failed_procedures={'scale': [(None, 'error', None)]},
+      ),
+    ]
+
+    results_per_shard = []
+
+    for index, batcher in enumerate(batchers):
+      results_filepath = os.path.join(self.dirpath, f'results_{index}.json')
+      sharding.write_shard_results(results_filepath, batcher)
+
+      with open(results_filepath, 'r') as results_file:
+        results_per_shard.append(json.load(results_file))
+
+    merged_result = sharding.merge_shard_results(results_per_shard, items)
+
+    self.assertEqual(merged_result.exported_items, [items['a'], items['c'], items['d']])
+    self.assertEqual(
+      merged_result.failed_procedures,
+      {'scale': [(items['b'], 'error', 'trace'), (None, 'error', None)]})
+    self.assertEqual(merged_result.skipped_constraints, {'visible': [(items['b'], 'skipped')]})
+    self.assertEqual(merged_result.skipped_procedures, {})
+    self.assertEqual(merged_result.failed_constraints, {})
+
+  def test_shard_progress_updater_writes_progress_to_file(self):
+    progress_filepath = os.path.join(self.dirpath, 'progress.txt')
+    progress_updater = sharding.ShardProgressUpdater(
+      None, progress_filepath, num_total_tasks=5)
+
+    progress_updater.update_tasks(2)
+
+    with open(progress_filepath, 'r') as progress_file:
+      self.assertEqual(progress_file.read(), '2')
+
+    self.assertFalse(os.path.exists(f'{progress_filepath}.tmp'))
+
+
+class TestRunShards(unittest.TestCase):
+
+  _WORKER_SCRIPT = """
+import sys
+
+sys.path.insert(0, {root_dirpath!r})
+
+from src import sharding
+
+
+class ItemStub:
+
+  def __init__(self, id_):
+    self.id = id_
+
+
+class BatcherStub:
+
+  def __init__(self, exported_items):
+    self.exported_items = exported_items
+    self.skipped_procedures = {{}}
+    self.skipped_constraints = {{}}
+    self.failed_procedures = {{}}
+    self.failed_constraints = {{}}
+
+
+manifest = sharding.load_shard_manifest(sys.argv[1])
+
+progress_updater = sharding.ShardProgressUpdater(
+  None, manifest['progress_file'], len(manifest['export_filepaths']))
+
+for _unused in manifest['export_filepaths']:
+  progress_updater.update_tasks()
+
+sharding.write_shard_results(
+  manifest['results_file'],
+  BatcherStub([ItemStub(id_) for id_ in manifest['export_filepaths']]))
+"""
+
+  def setUp(self):
+    self.temp_dir = tempfile.TemporaryDirectory()
+    self.dirpath = self.temp_dir.name
+
+    self.worker_script_filepath = os.path.join(self.dirpath, 'worker.py')
+    with open(self.worker_script_filepath, 'w') as worker_script_file:
+      worker_script_file.write(
+        self._WORKER_SCRIPT.format(root_dirpath=self._get_root_dirpath()))
+
+    self.items = {f'/inputs/{index}.jpg': ItemStub(f'/inputs/{index}.jpg') for index in range(5)}
+    self.export_filepaths = {id_: f'{index}.png' for index, id_ in enumerate(self.items)}
+
+  def tearDown(self):
+    self.temp_dir.cleanup()
+
+  @staticmethod
+  def _get_root_dirpath():
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+  def test_run_shards(self):
+    progress_updater = progress_.ProgressUpdater(None)
+
+    result = sharding.run_shards(
+      self.export_filepaths,
+      2,
+      self.dirpath,
+      lambda manifest_filepath: [sys.executable, self.worker_script_filepath, manifest_filepath],
+      self.items,
+      progress_updater=progress_updater,
+      poll_interval=0.01,
+    )
+
+    self.assertEqual(result.exported_items, list(self.items.values()))
+    self.assertFalse(result.failed_shards)
+    self.assertEqual(progress_updater.num_total_tasks, 5)
+    self.assertEqual(progress_updater.num_finished_tasks, 5)
+
+  def test_run_shards_merges_progress_of_workers(self):
+    # Each worker reports one finished item and exits without results.
+    worker_command = (
+      'import sys\n'
+      f'sys.path.insert(0, {self._get_root_dirpath()!r})\n'
+      'from src import sharding\n'
+      'manifest = sharding.load_shard_manifest(sys.argv[1])\n'
+      'sharding.ShardProgressUpdater(None, manifest["progress_file"], 1).update_tasks()\n'
+      'sys.exit(1)\n')
+
+    progress_updater = progress_.ProgressUpdater(None)
+
+    result = sharding.run_shards(
+      self.export_filepaths,
+      2,
+      self.dirpath,
+      lambda manifest_filepath: [sys.executable, '-c', worker_command, manifest_filepath],
+      self.items,
+      progress_updater=progress_updater,
+      poll_interval=0.01,
+    )
+
+    self.assertEqual(list(result.failed_shards), [0, 1])
+    self.assertEqual(progress_updater.num_total_tasks, 5)
+    self.assertEqual(progress_updater.num_finished_tasks, 2)
+
+  def test_run_shards_worker_without_results(self):
+    result = sharding.run_shards(
+      self.export_filepaths,
+      2,
+      self.dirpath,
+      lambda _manifest_filepath: [
+        sys.executable, '-c', 'import sys; print("worker error"); sys.exit(1)'],
+      self.items,
+      poll_interval=0.01,
+    )
+
+    self.assertEqual(result.exported_items, [])
+    self.assertEqual(list(result.failed_shards), [0, 1])
+    self.assertIn('worker error', result.failed_shards[0])
@@ -154,6 +154,51 @@ def test_reset(self):
     
     self._compare_uniquified_names(self.item_tree, self.path_to_id, names_to_uniquify)
   
+  def test_uniquify_many_items_with_same_name(self):
+    names = ['image', 'image (2)', 'image.png', 'image (1)'] + ['image'] * 5 + ['image (2) (1)']
+    items = [_ItemStub(name) for name in names]
+
+    uniquified_names = [self.uniquifier.uniquify(item) for item in items]
+
+    self.assertListEqual(
+      uniquified_names,
+      [
+        'image',
+        'image (2)',
+        'image.png',
+        'image (1)',
+        'image (3)',
+        'image (4)',
+        'image (5)',
+        'image (6)',
+        'image (7)',
+        'image (2) (1)',
+      ])
+
+  def test_uniquify_with_custom_generator(self):
+    def _generate_copy_string():
+      i = 1
+      while True:
+        yield f' - copy {i}'
+        i += 1
+
+    self.uniquifier = uniquifier.ItemUniquifier(generator=_generate_copy_string())
+
+    uniquified_names = [self.uniquifier.uniquify(_ItemStub('image')) for _unused in range(3)]
+
+    self.assertListEqual(uniquified_names, ['image', 'image - copy 1', 'image - copy 2'])
+
+  def test_reserve(self):
+    self.uniquifier.reserve(['image', 'image (1)'])
+    self.uniquifier.reserve(['other'], parent=_ItemStub('Frames'))
+
+    self.assertEqual(self.uniquifier.uniquify(_ItemStub('image')), 'image (2)')
+    self.assertEqual(self.uniquifier.uniquify(_ItemStub('other')), 'other')
+
+    self.uniquifier.reset()
+
+    self.assertEqual(self.uniquifier.uniquify(_ItemStub('image')), 'image')
+
   def _compare_uniquified_names(self, item_tree, path_to_id, uniquified_names):
     for path_and_folder_key, uniquified_path in uniquified_names.items():
       key = self._get_itemtree_key_from_path(path_and_folder_key, path_to_id)
@@ -182,3 +227,10 @@ def _get_itemtree_key_from_path(path_and_folder_key, path_to_id):
   @staticmethod
   def _preprocess_name(item):
     item.name = item.name.replace(':', '')
+
+
+class _ItemStub:
+
+  def __init__(self, name, parent=None):
+    self.name = name
+    self.parent = parent
@@ -3,6 +3,7 @@
 import inspect
 import os
 import shutil
+import tempfile
 import unittest
 
 import gi
@@ -214,3 +215,34 @@ def _load_image(cls, image_filepath):
   @staticmethod
   def _get_gimp_version_as_tuple():
     return Gimp.MAJOR_VERSION, Gimp.MINOR_VERSION, Gimp.MICRO_VERSION
+
+
+class TestConvertNoninteractive(unittest.TestCase):
+
+  def setUp(self):
+    self.temp_dirpath = tempfile.mkdtemp()
+
+    self.input_filepaths = [
+      os.path.join(INPUT_IMAGES_DIRPATH, 'main-background.xcf'),
+      os.path.join(INPUT_IMAGES_DIRPATH, 'overlay.xcf'),
+    ]
+
+    self.inputs_filepath = os.path.join(self.temp_dirpath, 'inputs.txt')
+    with open(self.inputs_filepath, 'w', encoding=pg.TEXT_FILE_ENCODING) as inputs_file:
+      inputs_file.write('\n'.join(self.input_filepaths))
+
+  def tearDown(self):
+    shutil.rmtree(self.temp_dirpath)
+
+  def test_streamed_inputs_exceeding_max_num_inputs_result_in_error(self):
+    with self.assertRaises(pg.PDBProcedureError) as cm:
+      pdb.plug_in_batch_convert(
+        run_mode=Gimp.RunMode.NONINTERACTIVE,
+        inputs=Gio.file_new_for_path(self.inputs_filepath),
+        max_num_inputs=len(self.input_filepaths) - 1,
+        stream_inputs=True,
+        output_directory=Gio.file_new_for_path(self.temp_dirpath),
+      )
+
+    self.assertEqual(cm.exception.status, Gimp.PDBStatusType.EXECUTION_ERROR)
+    self.assertIn('max-num-inputs', cm.exception.message)
@@ -1,6 +1,6 @@
 """Making item names in `pygimplib.itemtree.ItemTree` unique."""
 
-from typing import Generator, Optional
+from typing import Generator, Iterable, Optional
 
 import pygimplib as pg
 
@@ -22,6 +22,11 @@ def __init__(self, generator: Optional[Generator[str, None, None]] = None):
     # key: `Item` instance (parent) or `None` (item tree root)
     # value: set of `Item.name` strings
     self._uniquified_item_names = {}
+
+    # key: tuple of (`Item` instance (parent) or `None`, item name, position)
+    # value: number in the unique substring to try first when uniquifying the
+    #   item name. All lower numbers are known to produce existing names.
+    self._next_numbers = {}
   
   def uniquify(
         self,
@@ -33,7 +38,11 @@ def uniquify(
     other `Item` instances under the same parent of `Item`.
 
     To achieve uniquification, a substring in the form of ``' (<number>)'`` is
-    appended to the item name.
+    appended to the item name. The first number producing a unique name is
+    used. If no custom ``generator`` was passed to `__init__()`, the next
+    number to try is remembered for each parent, name and position, so that
+    uniquifying many items with the same name takes constant time per item on
+    average.
 
     Calling the method with the same `Item` instance will have no effect as
     that instance will be marked as visited. Call `reset()` to clear cache of
@@ -59,9 +68,7 @@ def uniquify(
     if item_name is None:
       item_name = item.name
 
-    if parent not in self._uniquified_items:
-      self._uniquified_items[parent] = set()
-      self._uniquified_item_names[parent] = set()
+    self._init_parent(parent)
 
     uniquified_item_name = None
 
@@ -71,15 +78,58 @@ def uniquify(
       
       has_same_name = item_name in self._uniquified_item_names[parent]
       if has_same_name:
-        uniquified_item_name = uniquify.uniquify_string(
-          item_name, self._uniquified_item_names[parent], position, generator=self.generator)
+        uniquified_item_name = self._uniquify_name(parent, item_name, position)
 
       self._uniquified_item_names[parent].add(
         uniquified_item_name if uniquified_item_name is not None else item_name)
 
     return uniquified_item_name if uniquified_item_name is not None else item_name
+
+  def reserve(self, item_names: Iterable[str], parent: Optional[pg.itemtree.Item] = None):
+    """Marks ``item_names`` as taken under ``parent`` so that items passed to
+    `uniquify()` afterwards will not be given any of these names.
+
+    ``parent`` is an `Item` instance or ``None`` for top-level items.
+    """
+    self._init_parent(parent)
+
+    self._uniquified_item_names[parent].update(item_names)
   
   def reset(self):
-    """Clears cache of items passed to `uniquify()`."""
+    """Clears cache of items passed to `uniquify()` and names passed to
+    `reserve()`.
+    """
     self._uniquified_items = {}
     self._uniquified_item_names = {}
+    self._next_numbers = {}
+
+  def _init_parent(self, parent):
+    if parent not in self._uniquified_items:
+      self._uniquified_items[parent] = set()
+      self._uniquified_item_names[parent] = set()
+
+  def _uniquify_name(self, parent, item_name, position):
+    item_names = self._uniquified_item_names[parent]
+
+    if self.generator is not None:
+      return uniquify.uniquify_string(item_name, item_names, position, generator=self.generator)
+
+    if position is None:
+      position = len(item_name)
+
+    key = (parent, item_name, position)
+    number = self._next_numbers.get(key, 1)
+
+    # Names are only ever added, hence numbers skipped previously for this key
+    # would still produce existing names.
+    while True:
+      uniquified_item_name = (
+        f'{item_name[:position]}{uniquify.get_unique_substring(number)}{item_name[position:]}')
+      number += 1
+
+      if uniquified_item_name not in item_names:
+        break
+
+    self._next_numbers[key] = number
+
+    return uniquified_item_name
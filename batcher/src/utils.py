@@ -1,10 +1,13 @@
 """Utility functions used in other modules."""
 
 import collections
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 
 import pygimplib as pg
 
+from src import builtin_actions_common
+from src import incremental
+
 
 def get_settings_for_batcher(main_settings: pg.setting.Group) -> Dict[str, Any]:
   setting_names = [
@@ -29,9 +32,115 @@ def get_settings_for_batcher(main_settings: pg.setting.Group) -> Dict[str, Any]:
     for setting in main_settings['export']:
       settings_for_batcher['more_export_options'][setting.name] = setting.value
 
+    if 'write_in_background' in main_settings:
+      settings_for_batcher['more_export_options']['write_in_background'] = (
+        main_settings['write_in_background'].value)
+
+  if 'reuse_image_copies' in main_settings:
+    settings_for_batcher['reuse_image_copies'] = main_settings['reuse_image_copies'].value
+
+  if 'skip_unchanged' in main_settings:
+    settings_for_batcher['skip_unchanged'] = main_settings['skip_unchanged'].value
+    settings_for_batcher['rebuild_manifest'] = main_settings['rebuild_manifest'].value
+    settings_for_batcher['compare_file_contents'] = main_settings['compare_file_contents'].value
+
+    if main_settings['skip_unchanged'].value:
+      settings_for_batcher['settings_hash'] = get_settings_hash(
+        main_settings, _SETTINGS_NOT_AFFECTING_CONVERSION_OUTPUT)
+
   return settings_for_batcher
 
 
+_SETTINGS_NOT_AFFECTING_CONVERSION_OUTPUT = [
+  'run_mode',
+  'inputs',
+  'max_num_inputs',
+  'output_directory',
+  'overwrite_mode',
+  'settings_file',
+  'num_workers',
+  'stream_inputs',
+  'write_in_background',
+  'skip_unchanged',
+  'rebuild_manifest',
+  'compare_file_contents',
+  'plugin_version',
+]
+
+
+def get_settings_hash(settings: pg.setting.Group, excluded_paths: Iterable[str] = ()) -> str:
+  """Returns a hash of the values of all settings within ``settings``.
+
+  Settings whose path relative to ``settings`` is in ``excluded_paths`` are
+  ignored.
+  """
+  excluded_paths = set(excluded_paths)
+  setting_values = {}
+
+  for setting in settings.walk():
+    setting_path = setting.get_path(settings)
+    if setting_path not in excluded_paths:
+      setting_values[setting_path] = setting.to_dict().get('value')
+
+  return incremental.get_settings_hash(setting_values)
+
+
+def get_preview_settings_hash(main_settings: pg.setting.Group) -> str:
+  """Returns a hash of procedures and constraints within ``main_settings``
+  that are enabled and applied to previews, including their order and the
+  values of their arguments.
+  """
+  setting_values = []
+
+  for actions_name in ['procedures', 'constraints']:
+    setting_values.extend(_get_setting_values_of_actions_for_previews(main_settings, actions_name))
+
+  return incremental.get_settings_hash(setting_values)
+
+
+def get_name_preview_settings_hash(main_settings: pg.setting.Group) -> str:
+  """Returns a hash of settings within ``main_settings`` that may affect the
+  names of items and the items matching constraints.
+
+  These are procedures modifying names only (tagged with
+  `builtin_actions_common.NAME_ONLY_TAG`) and constraints, both enabled and
+  applied to previews, and all settings outside procedures and constraints
+  (e.g. the name pattern or the file extension).
+  """
+  setting_values = []
+
+  for setting in main_settings.walk():
+    setting_path = setting.get_path(main_settings)
+    if setting_path.split('/', 1)[0] not in ['procedures', 'constraints']:
+      setting_values.append([setting_path, setting.to_dict().get('value')])
+
+  setting_values.extend(
+    _get_setting_values_of_actions_for_previews(
+      main_settings, 'procedures', builtin_actions_common.NAME_ONLY_TAG))
+  setting_values.extend(_get_setting_values_of_actions_for_previews(main_settings, 'constraints'))
+
+  return incremental.get_settings_hash(setting_values)
+
+
+def _get_setting_values_of_actions_for_previews(main_settings, actions_name, tag=None):
+  setting_values = []
+
+  if actions_name not in main_settings:
+    return setting_values
+
+  for action in main_settings[actions_name]:
+    if not (action['enabled'].value and action['more_options/enabled_for_previews'].value):
+      continue
+
+    if tag is not None and tag not in action.tags:
+      continue
+
+    for setting in action.walk():
+      setting_values.append([setting.get_path(main_settings), setting.to_dict().get('value')])
+
+  return setting_values
+
+
 def format_message_from_persistor_statuses(
       persistor_result: pg.setting.PersistorResult,
       separator: str = '\n',
@@ -0,0 +1,9 @@
+"""Benchmarks of the headless (non-GUI) parts of Batcher.
+
+Each module named ``bench_*`` defines functions named ``bench_*``, each
+accepting a recorder and the number of items to create. A benchmark function
+builds its synthetic workload and wraps each measured stage in
+``recorder.stage(name, num_items)``.
+
+Benchmarks are run via ``dev/run_benchmarks.py``.
+"""
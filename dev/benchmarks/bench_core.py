@@ -0,0 +1,149 @@
+"""Benchmarks of `src.core.Batcher.run()` in the name preview mode, i.e. only
+applying constraints and renaming items without processing layer contents or
+exporting.
+"""
+
+import gi
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+
+import pygimplib as pg
+
+from src import actions as actions_
+from src import builtin_constraints
+from src import builtin_procedures
+from src import core
+from src import invoker as invoker_
+from src import plugin_settings
+from src import utils as utils_
+
+from . import utils_benchmarks
+
+
+NUM_LAYERS_PER_GROUP = 100
+
+NUM_RENAME_PROCEDURES = 20
+NUM_PREVIEW_REFRESHES = 10
+NUM_INVOKER_ACTIONS = 100
+NUM_INVOKER_FOREACH_ACTIONS = 5
+
+RENAME_PATTERNS = [
+  '[layer name]',
+  '[layer name]_[001]',
+  '[image name]_[layer path, -]',
+  '[replace, [layer name], [layer], [item] ]',
+  '[layer name, %e]_[1]',
+]
+
+
+def bench_constraints(recorder, num_items):
+  settings = _create_settings()
+  _add_constraints(settings)
+
+  batcher = _create_batcher(settings, num_items)
+
+  with recorder.stage('Batcher.run (constraints)', num_items):
+    _run_batcher(batcher, settings, process_names=False)
+
+
+def bench_procedure_chain(recorder, num_items):
+  settings = _create_settings()
+  _add_rename_procedures(settings, NUM_RENAME_PROCEDURES)
+
+  batcher = _create_batcher(settings, num_items)
+
+  with recorder.stage(f'Batcher.run ({NUM_RENAME_PROCEDURES} procedures)', num_items):
+    _run_batcher(batcher, settings)
+
+
+def bench_preview_refresh(recorder, num_items):
+  settings = _create_settings()
+  _add_constraints(settings)
+  _add_rename_procedures(settings, len(RENAME_PATTERNS))
+
+  batcher = _create_batcher(settings, num_items)
+
+  with recorder.stage(
+        f'Batcher.run ({NUM_PREVIEW_REFRESHES} refreshes)', num_items * NUM_PREVIEW_REFRESHES):
+    for _unused in range(NUM_PREVIEW_REFRESHES):
+      batcher.item_tree.refresh()
+      _run_batcher(batcher, settings)
+
+
+def bench_invoker(recorder, num_items):
+  invoker = invoker_.Invoker()
+
+  for _unused in range(NUM_INVOKER_ACTIONS):
+    invoker.add(_do_nothing, groups=['process_item'])
+
+  with recorder.stage(f'Invoker.invoke ({NUM_INVOKER_ACTIONS} actions)', num_items):
+    for _unused in range(num_items):
+      invoker.invoke(['process_item'])
+
+
+def bench_invoker_with_foreach_actions(recorder, num_items):
+  invoker = invoker_.Invoker()
+
+  for _unused in range(NUM_INVOKER_ACTIONS):
+    invoker.add(_do_nothing, groups=['process_item'])
+
+  for _unused in range(NUM_INVOKER_FOREACH_ACTIONS):
+    invoker.add(_do_nothing, groups=['process_item'], foreach=True)
+
+  with recorder.stage(
+        (f'Invoker.invoke ({NUM_INVOKER_ACTIONS} actions,'
+         f' {NUM_INVOKER_FOREACH_ACTIONS} for-each actions)'),
+        num_items):
+    for _unused in range(num_items):
+      invoker.invoke(['process_item'], [None], additional_args_position=0)
+
+
+def _do_nothing(*_args, **_kwargs):
+  pass
+
+
+def _create_settings():
+  return plugin_settings.create_settings_for_export_layers()
+
+
+def _add_constraints(settings):
+  constraints = settings['main/constraints']
+
+  matching_text = actions_.add(
+    constraints, builtin_constraints.BUILTIN_CONSTRAINTS['matching_text'])
+  matching_text['arguments/text'].set_value('layer')
+
+  for name in ['layers', 'visible', 'recognized_file_format']:
+    constraint = actions_.add(constraints, builtin_constraints.BUILTIN_CONSTRAINTS[name])
+    constraint['enabled'].set_value(True)
+
+
+def _add_rename_procedures(settings, num_procedures):
+  for index in range(num_procedures):
+    procedure = actions_.add(
+      settings['main/procedures'],
+      builtin_procedures.BUILTIN_PROCEDURES['rename_for_export_layers'])
+    procedure['arguments/pattern'].set_value(RENAME_PATTERNS[index % len(RENAME_PATTERNS)])
+
+
+def _create_batcher(settings, num_items):
+  image = utils_benchmarks.create_wide_image(num_items, NUM_LAYERS_PER_GROUP)
+
+  item_tree = pg.itemtree.LayerTree()
+  item_tree.add_from_image(image)
+
+  return core.LayerBatcher(
+    item_tree=item_tree,
+    procedures=settings['main/procedures'],
+    constraints=settings['main/constraints'],
+    initial_export_run_mode=Gimp.RunMode.NONINTERACTIVE,
+  )
+
+
+def _run_batcher(batcher, settings, process_names=True):
+  batcher.run(
+    is_preview=True,
+    process_contents=False,
+    process_names=process_names,
+    process_export=False,
+    **utils_.get_settings_for_batcher(settings['main']))
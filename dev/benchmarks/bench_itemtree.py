@@ -0,0 +1,72 @@
+"""Benchmarks of adding, iterating and filtering items in
+`pygimplib.itemtree` classes.
+"""
+
+import os
+import tempfile
+
+import pygimplib as pg
+
+from . import utils_benchmarks
+
+
+NUM_LAYERS_PER_GROUP = 100
+DEPTH = 100
+
+NUM_FOLDER_SCAN_WORKERS = [1, 8]
+
+FOLDER_TREES_DIRPATH = os.path.join(tempfile.gettempdir(), 'batcher_benchmarks', 'folder_trees')
+
+
+def bench_layer_tree_wide(recorder, num_items):
+  image = utils_benchmarks.create_wide_image(num_items, NUM_LAYERS_PER_GROUP)
+
+  _bench_layer_tree(recorder, image, num_items)
+
+
+def bench_layer_tree_deep(recorder, num_items):
+  image = utils_benchmarks.create_deep_image(num_items, DEPTH)
+
+  _bench_layer_tree(recorder, image, num_items)
+
+
+def _bench_layer_tree(recorder, image, num_items):
+  item_tree = pg.itemtree.LayerTree()
+
+  with recorder.stage('ItemTree.add', num_items):
+    item_tree.add_from_image(image)
+
+  with recorder.stage('ItemTree.iter_all', num_items):
+    for _item in item_tree.iter_all():
+      pass
+
+  item_tree.filter.add(lambda item: item.raw.visible)
+
+  with recorder.stage('ItemTree.iter (filtered)', num_items):
+    for _item in item_tree.iter():
+      pass
+
+  with recorder.stage('ItemTree.__len__ (filtered)', num_items):
+    len(item_tree)
+
+  items = list(item_tree.iter_all())
+
+  with recorder.stage('ItemTree.remove', num_items):
+    item_tree.remove(items)
+
+
+def bench_image_file_tree(recorder, num_items):
+  tree_dirpath = utils_benchmarks.create_folder_tree(
+    os.path.join(FOLDER_TREES_DIRPATH, str(num_items)), num_items)
+
+  for num_workers in NUM_FOLDER_SCAN_WORKERS:
+    image_file_tree = pg.itemtree.ImageFileTree(num_folder_scan_workers=num_workers)
+
+    with recorder.stage(f'ItemTree.add ({num_workers} workers)', num_items):
+      image_file_tree.add([tree_dirpath])
+
+  image_file_tree = pg.itemtree.ImageFileTree()
+
+  with recorder.stage('ItemTree.stream', num_items):
+    for _item in image_file_tree.stream([tree_dirpath]):
+      pass
@@ -0,0 +1,46 @@
+"""Benchmarks of the per-call overhead of calling GIMP PDB procedures via
+`pygimplib.pypdb`.
+
+GIMP PDB procedures are replaced with stubs doing nothing, hence only the time
+spent in `pygimplib.pypdb` is measured.
+"""
+
+import types
+import unittest.mock as mock
+
+import pygimplib as pg
+from pygimplib.tests import stubs_gimp
+
+
+NUM_ARGUMENTS = 10
+NUM_ARGUMENTS_PER_CALL = 4
+
+
+def bench_gimp_pdb_procedure(recorder, num_items):
+  proc = stubs_gimp.Procedure(
+    'plug-in-benchmark',
+    arguments_spec=[
+      dict(value_type=types.SimpleNamespace(name='gint'), name=f'arg-{index}', default_value=0)
+      for index in range(NUM_ARGUMENTS)])
+
+  kwargs = {f'arg_{index}': index for index in range(NUM_ARGUMENTS_PER_CALL)}
+
+  with mock.patch.object(pg.pypdb.Gimp, 'get_pdb', return_value=stubs_gimp.PdbStub):
+    stubs_gimp.PdbStub.add_procedure(proc)
+
+    pdb = pg.pypdb._PyPDB()
+
+    try:
+      for reuse_configs in [False, True]:
+        pdb.reuse_configs = reuse_configs
+        procedure = pg.pypdb.GimpPDBProcedure(pdb, proc.get_name())
+
+        stage_name = 'GimpPDBProcedure.__call__'
+        if reuse_configs:
+          stage_name += ' (reused configs)'
+
+        with recorder.stage(stage_name, num_items):
+          for _unused in range(num_items):
+            procedure(**kwargs)
+    finally:
+      stubs_gimp.PdbStub.clear_procedures()
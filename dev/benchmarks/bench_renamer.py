@@ -0,0 +1,73 @@
+"""Benchmarks of parsing and substituting name patterns."""
+
+import pygimplib as pg
+
+from src import renamer as renamer_
+from src.path import pattern as pattern_
+
+from . import utils_benchmarks
+
+
+SIMPLE_FIELDS = {
+  r'^[0-9]+$': lambda _field, _item, _number: '001',
+  'name': lambda _field, item, _number: item,
+  'upper': lambda _field, item, _number: item.upper(),
+  'number': lambda _field, _item, number, width='3': str(number).zfill(int(width)),
+  'replace': lambda _field, item, _number, old, new: item.replace(old, new),
+}
+
+COMPLEX_PATTERN = (
+  'image_[name]_[number, 4]-[upper]_[[literal]]_[replace, [layer name], [layer], [L] ]_[001]')
+
+ITEM_RENAMER_PATTERNS = [
+  '[layer name]',
+  '[image name]_[layer path, -]_[001]',
+  '[layer name, %e]_[replace, [full layer name], [ ], [_] ]_[1]',
+]
+
+
+def bench_string_pattern(recorder, num_items):
+  with recorder.stage('StringPattern.__init__', num_items):
+    for _unused in range(num_items):
+      pattern_.StringPattern(COMPLEX_PATTERN, SIMPLE_FIELDS)
+
+  pattern = pattern_.StringPattern(COMPLEX_PATTERN, SIMPLE_FIELDS)
+  names = [f'layer {index}' for index in range(num_items)]
+
+  with recorder.stage('StringPattern.substitute', num_items):
+    for index, name in enumerate(names):
+      pattern.substitute(name, index)
+
+
+def bench_item_renamer(recorder, num_items):
+  image = utils_benchmarks.create_wide_image(num_items, 100)
+
+  item_tree = pg.itemtree.LayerTree()
+  item_tree.add_from_image(image)
+
+  items = list(item_tree.iter(with_folders=False))
+  batcher = _BatcherStub(item_tree, image)
+
+  for index, pattern in enumerate(ITEM_RENAMER_PATTERNS):
+    renamer = renamer_.ItemRenamer(pattern)
+
+    with recorder.stage(f'ItemRenamer.rename (pattern {index + 1})', len(items)):
+      for item in items:
+        batcher.current_item = item
+        batcher.current_layer = item.raw
+        renamer.rename(batcher)
+
+
+class _BatcherStub:
+  """Minimal stand-in for `src.core.Batcher` providing attributes accessed by
+  name pattern fields.
+  """
+
+  def __init__(self, item_tree, image):
+    self.item_tree = item_tree
+    self.matching_items = None
+    self.matching_items_and_parents = None
+    self.file_extension = 'png'
+    self.current_item = None
+    self.current_image = image
+    self.current_layer = None
@@ -0,0 +1,131 @@
+"""Utility functions creating synthetic workloads for benchmarks."""
+
+import os
+
+import pygimplib as pg
+from pygimplib.tests import stubs_gimp
+
+from src import procedure_groups
+
+
+NUM_FILES_PER_FOLDER = 1000
+NUM_FOLDERS_PER_PARENT_FOLDER = 100
+
+
+def set_up_plugin(procedure_group=procedure_groups.EXPORT_LAYERS_GROUP):
+  """Disables logging to files and sets the procedure group determining
+  available name pattern fields, actions, etc.
+  """
+  pg.config.STDOUT_LOG_HANDLES = []
+  pg.config.STDERR_LOG_HANDLES = []
+
+  pg.config.PROCEDURE_GROUP = procedure_group
+
+
+def release_stubs():
+  """Removes references to all image and item stubs created so far so that
+  memory held by a workload is not carried over to the next benchmark.
+  """
+  stubs_gimp.Image._images_and_ids.clear()
+  stubs_gimp.Item._items_and_ids.clear()
+
+
+def create_wide_image(num_layers, num_layers_per_group=0, name='image.xcf'):
+  """Creates a GIMP image stub containing ``num_layers`` layers in total.
+
+  If ``num_layers_per_group`` is 0, all layers are top-level layers. Otherwise,
+  layers are split into top-level group layers, each containing at most
+  ``num_layers_per_group`` child layers. Group layers are counted as layers.
+  """
+  image = stubs_gimp.Image(name=name)
+
+  if num_layers_per_group <= 0:
+    for index in range(num_layers):
+      image.layers.append(_create_layer(index, image))
+
+    return image
+
+  index = 0
+  group = None
+
+  while index < num_layers:
+    if group is None or len(group.children) >= num_layers_per_group:
+      group = stubs_gimp.GroupLayer(name=f'group {index}', image=image)
+      image.layers.append(group)
+    else:
+      group.children.append(_create_layer(index, image, group))
+
+    index += 1
+
+  return image
+
+
+def create_deep_image(num_layers, depth, name='image.xcf'):
+  """Creates a GIMP image stub containing ``num_layers`` layers in total,
+  distributed evenly across a chain of group layers nested ``depth`` levels
+  deep. Group layers are counted as layers.
+  """
+  image = stubs_gimp.Image(name=name)
+
+  depth = max(min(depth, num_layers), 1)
+  num_layers_per_level = num_layers // depth
+
+  parent = None
+  children = image.layers
+  index = 0
+
+  for level in range(depth):
+    if level == depth - 1:
+      num_layers_in_level = num_layers - index
+    else:
+      num_layers_in_level = num_layers_per_level - 1
+
+    for _unused in range(num_layers_in_level):
+      children.append(_create_layer(index, image, parent))
+      index += 1
+
+    if level < depth - 1:
+      group = stubs_gimp.GroupLayer(name=f'group {level}', image=image, parent=parent)
+      children.append(group)
+      index += 1
+
+      parent = group
+      children = group.children
+
+  return image
+
+
+def _create_layer(index, image, parent=None):
+  # Vary attributes so that constraints do not match all layers.
+  return stubs_gimp.Layer(
+    name=f'layer {index}.png' if index % 2 == 0 else f'layer {index}',
+    image=image,
+    parent=parent,
+    visible=index % 3 != 0)
+
+
+def create_folder_tree(dirpath, num_files):
+  """Creates a two-level folder tree containing ``num_files`` empty files in
+  ``dirpath``.
+
+  If ``dirpath`` already exists, it is assumed to contain the folder tree from
+  a previous run.
+  """
+  if os.path.isdir(dirpath):
+    return dirpath
+
+  for file_index in range(num_files):
+    folder_index = file_index // NUM_FILES_PER_FOLDER
+
+    folder_dirpath = os.path.join(
+      dirpath,
+      f'parent_{folder_index // NUM_FOLDERS_PER_PARENT_FOLDER}',
+      f'folder_{folder_index}')
+
+    if file_index % NUM_FILES_PER_FOLDER == 0:
+      os.makedirs(folder_dirpath, exist_ok=True)
+
+    with open(os.path.join(folder_dirpath, f'image_{file_index}.png'), 'wb'):
+      pass
+
+  return dirpath
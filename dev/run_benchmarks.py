@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+
+"""Running benchmarks of the headless (non-GUI) parts of Batcher on synthetic
+workloads built from GIMP object stubs.
+
+For each benchmark and each requested number of items, the throughput
+(items per second) and peak memory of each stage of the benchmark is measured.
+Peak memory is measured in a separate run so that memory tracing does not
+distort timings.
+
+Results can be saved as a JSON file and compared against results from a
+previous run (baseline). If any stage is slower or uses more memory than the
+baseline beyond the given tolerance, the script exits with a non-zero status.
+
+Benchmarks are located in the `benchmarks` package. See the package
+documentation for how to add benchmarks.
+"""
+
+import inspect
+import os
+import sys
+
+DEV_DIRPATH = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+
+ROOT_DIRPATH = os.path.dirname(DEV_DIRPATH)
+PLUGIN_DIRPATH = os.path.join(ROOT_DIRPATH, 'batcher')
+
+sys.path.append(PLUGIN_DIRPATH)
+
+import argparse
+import contextlib
+import datetime
+import gc
+import importlib
+import json
+import pkgutil
+import platform
+import time
+import tracemalloc
+
+from benchmarks import utils_benchmarks
+
+
+RESULTS_TYPE = 'batcher_benchmark_results'
+
+BENCHMARKS_PACKAGE_NAME = 'benchmarks'
+BENCHMARK_PREFIX = 'bench_'
+
+NUM_ITEMS_DEFAULT = [10000]
+NUM_REPEATS_DEFAULT = 3
+TOLERANCE_DEFAULT = 0.2
+# Stages faster than this in the baseline are too noisy to compare timings of.
+MIN_COMPARED_SECONDS = 0.005
+
+
+def main():
+  parser = argparse.ArgumentParser(
+    description='Run benchmarks of Batcher on synthetic workloads.')
+  parser.add_argument(
+    'benchmark_prefixes',
+    nargs='*',
+    default=[''],
+    help=(
+      'benchmarks to run, specified as prefixes of "<module>.<function>"'
+      ' (e.g. "bench_core" or "bench_itemtree.bench_layer_tree");'
+      ' all benchmarks are run if omitted'),
+    metavar='BENCHMARK')
+  parser.add_argument(
+    '-n',
+    '--num-items',
+    nargs='*',
+    type=int,
+    default=NUM_ITEMS_DEFAULT,
+    help='number of items in each workload (e.g. 10000 100000 1000000)',
+    dest='num_items_list')
+  parser.add_argument(
+    '-r',
+    '--repeat',
+    type=int,
+    default=NUM_REPEATS_DEFAULT,
+    help='number of timed runs per benchmark; the fastest run is reported',
+    dest='num_repeats')
+  parser.add_argument(
+    '--no-memory',
+    action='store_false',
+    help='do not measure peak memory',
+    dest='measure_memory')
+  parser.add_argument(
+    '-o',
+    '--output',
+    help='file path to save results to as JSON',
+    metavar='FILE',
+    dest='output_filepath')
+  parser.add_argument(
+    '-b',
+    '--baseline',
+    help='file path to JSON results to compare the current results against',
+    metavar='FILE',
+    dest='baseline_filepath')
+  parser.add_argument(
+    '-t',
+    '--tolerance',
+    type=float,
+    default=TOLERANCE_DEFAULT,
+    help=(
+      'relative increase in time or peak memory over the baseline'
+      ' reported as a regression (default: %(default)s)'),
+    dest='tolerance')
+
+  parsed_args = parser.parse_args(sys.argv[1:])
+  sys.exit(run_benchmarks(**dict(parsed_args.__dict__)))
+
+
+def run_benchmarks(
+      benchmark_prefixes,
+      num_items_list,
+      num_repeats=NUM_REPEATS_DEFAULT,
+      measure_memory=True,
+      output_filepath=None,
+      baseline_filepath=None,
+      tolerance=TOLERANCE_DEFAULT):
+  utils_benchmarks.set_up_plugin()
+
+  results = []
+
+  for benchmark_name, benchmark_func in _get_benchmarks(benchmark_prefixes):
+    for num_items in num_items_list:
+      results.extend(
+        _run_benchmark(benchmark_name, benchmark_func, num_items, num_repeats, measure_memory))
+
+  if output_filepath is not None:
+    save_results(results, output_filepath)
+
+  if baseline_filepath is not None:
+    regressions = compare_results(load_results(baseline_filepath), results, tolerance)
+
+    if regressions:
+      print(f'\n{len(regressions)} regression(s) found:')
+      for regression in regressions:
+        print(f'  {regression}')
+
+      return 1
+
+  return 0
+
+
+def _get_benchmarks(benchmark_prefixes):
+  benchmarks_package = importlib.import_module(BENCHMARKS_PACKAGE_NAME)
+
+  for module_info in pkgutil.iter_modules(benchmarks_package.__path__):
+    if not module_info.name.startswith(BENCHMARK_PREFIX):
+      continue
+
+    module = importlib.import_module(f'{BENCHMARKS_PACKAGE_NAME}.{module_info.name}')
+
+    for func_name, func in inspect.getmembers(module, inspect.isfunction):
+      if not func_name.startswith(BENCHMARK_PREFIX) or func.__module__ != module.__name__:
+        continue
+
+      benchmark_name = f'{module_info.name}.{func_name}'
+
+      if any(benchmark_name.startswith(prefix) for prefix in benchmark_prefixes):
+        yield benchmark_name, func
+
+
+def _run_benchmark(benchmark_name, benchmark_func, num_items, num_repeats, measure_memory):
+  stages = {}
+
+  for _unused in range(max(num_repeats, 1)):
+    recorder = _run_with_recorder(benchmark_func, num_items, measure_memory=False)
+
+    for stage_name, (seconds, stage_num_items) in recorder.stages.items():
+      if stage_name not in stages or seconds < stages[stage_name]['seconds']:
+        stages[stage_name] = {
+          'seconds': seconds,
+          'items_per_second': stage_num_items / seconds if seconds > 0 else None,
+          'num_items': stage_num_items,
+          'peak_memory_bytes': None,
+        }
+
+  if measure_memory:
+    recorder = _run_with_recorder(benchmark_func, num_items, measure_memory=True)
+
+    for stage_name, (peak_memory, _stage_num_items) in recorder.stages.items():
+      if stage_name in stages:
+        stages[stage_name]['peak_memory_bytes'] = peak_memory
+
+  results = []
+
+  for stage_name, stage_result in stages.items():
+    result = {
+      'benchmark': benchmark_name,
+      'size': num_items,
+      'stage': stage_name,
+      **stage_result,
+    }
+
+    _print_result(result)
+
+    results.append(result)
+
+  return results
+
+
+def _run_with_recorder(benchmark_func, num_items, measure_memory):
+  recorder = _StageRecorder(measure_memory)
+
+  gc.collect()
+
+  if measure_memory:
+    tracemalloc.start()
+
+  try:
+    benchmark_func(recorder, num_items)
+  finally:
+    if measure_memory:
+      tracemalloc.stop()
+
+    utils_benchmarks.release_stubs()
+
+  return recorder
+
+
+class _StageRecorder:
+  """Class measuring either the time or the peak memory of each stage of a
+  benchmark.
+  """
+
+  def __init__(self, measure_memory):
+    self.measure_memory = measure_memory
+
+    self.stages = {}
+
+  @contextlib.contextmanager
+  def stage(self, name, num_items):
+    if self.measure_memory:
+      tracemalloc.reset_peak()
+      start_memory, _unused = tracemalloc.get_traced_memory()
+
+      yield
+
+      _unused, peak_memory = tracemalloc.get_traced_memory()
+      self.stages[name] = (peak_memory - start_memory, num_items)
+    else:
+      start_time = time.perf_counter()
+
+      yield
+
+      self.stages[name] = (time.perf_counter() - start_time, num_items)
+
+
+def _print_result(result):
+  if result['items_per_second'] is not None:
+    items_per_second_str = f'{result["items_per_second"]:>12.0f}'
+  else:
+    items_per_second_str = f'{"-":>12}'
+
+  if result['peak_memory_bytes'] is not None:
+    peak_memory_str = f'{result["peak_memory_bytes"] / (1024 * 1024):>10.1f}'
+  else:
+    peak_memory_str = f'{"-":>10}'
+
+  print(
+    f'{result["benchmark"]:<40} {result["size"]:>9} {result["stage"]:<40}'
+    f' {result["seconds"]:>9.3f}s {items_per_second_str} items/s {peak_memory_str} MiB')
+
+
+def save_results(results, filepath):
+  """Saves benchmark results to ``filepath`` as JSON along with information
+  about the environment.
+  """
+  contents = {
+    'type': RESULTS_TYPE,
+    'created': datetime.datetime.now().isoformat(timespec='seconds'),
+    'python_version': platform.python_version(),
+    'platform': platform.platform(),
+    'results': results,
+  }
+
+  with open(filepath, 'w', encoding='utf-8') as file_:
+    json.dump(contents, file_, indent=2)
+
+
+def load_results(filepath):
+  """Loads benchmark results previously saved via `save_results()`.
+
+  Raises:
+    ValueError: The file does not contain benchmark results.
+  """
+  with open(filepath, 'r', encoding='utf-8') as file_:
+    contents = json.load(file_)
+
+  if not isinstance(contents, dict) or contents.get('type') != RESULTS_TYPE:
+    raise ValueError(f'"{filepath}" does not contain benchmark results')
+
+  return contents['results']
+
+
+def compare_results(baseline_results, results, tolerance):
+  """Compares ``results`` against ``baseline_results`` and returns a list of
+  descriptions of stages whose time or peak memory increased by more than
+  ``tolerance`` (a relative value, e.g. 0.2 for 20%).
+
+  Stages present only in one of the results are ignored, as are timings of
+  stages taking less than `MIN_COMPARED_SECONDS` in the baseline.
+  """
+  baseline_results_per_key = {_get_result_key(result): result for result in baseline_results}
+
+  regressions = []
+
+  for result in results:
+    baseline_result = baseline_results_per_key.get(_get_result_key(result))
+    if baseline_result is None:
+      continue
+
+    for key, description in [('seconds', 'time'), ('peak_memory_bytes', 'peak memory')]:
+      baseline_value = baseline_result.get(key)
+      value = result.get(key)
+
+      if not baseline_value or value is None:
+        continue
+
+      if key == 'seconds' and baseline_value < MIN_COMPARED_SECONDS:
+        continue
+
+      change = (value - baseline_value) / baseline_value
+
+      if change > tolerance:
+        regressions.append(
+          f'{result["benchmark"]} [{result["size"]}] {result["stage"]}:'
+          f' {description} +{change:.1%} ({baseline_value:.6g} -> {value:.6g})')
+
+  return regressions
+
+
+def _get_result_key(result):
+  return result['benchmark'], result['size'], result['stage']
+
+
+if __name__ == '__main__':
+  main()